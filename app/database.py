@@ -1,27 +1,95 @@
-from typing import Generator
+import time
+from collections import deque
+from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.settings import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
+
+def get_async_database_url(url: str) -> str:
+    """Point a plain or psycopg2 PostgreSQL URL at the asyncpg driver."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_times = deque(maxlen=1000)
+        self.checkouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_times.append(time.perf_counter() - start)
+            self.checkouts += 1
+
+
+engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
     echo=settings.DEBUG,
+    poolclass=TimedQueuePool,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps loaded attributes readable after commit without implicit async IO
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Apply additive changes to tables that already existed, which create_all leaves alone.
+    Each step checks the live schema first, so this runs safely on every startup.
+    """
+    inspector = inspect(conn)
+    if_not_exists = "IF NOT EXISTS " if conn.dialect.name == "postgresql" else ""
+
+    document_columns = {column["name"] for column in inspector.get_columns("documents")}
+    if "parse_strategy" not in document_columns:
+        conn.execute(text(f"ALTER TABLE documents ADD COLUMN {if_not_exists}parse_strategy VARCHAR(20)"))
+        print("🛠️ Added documents.parse_strategy")
+
+    chat_message_indexes = {index["name"] for index in inspector.get_indexes("chat_messages")}
+    if "ix_chat_messages_workspace_id_id" not in chat_message_indexes:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_chat_messages_workspace_id_id ON chat_messages (workspace_id, id)"))
+        print("🛠️ Added index ix_chat_messages_workspace_id_id")
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_pool_metrics() -> dict:
+    pool = engine.pool
+    wait_times = sorted(pool.wait_times)
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.checkouts,
+        "wait_ms": {
+            "samples": len(wait_times),
+            "mean": round(sum(wait_times) / len(wait_times) * 1000, 3) if wait_times else 0.0,
+            "p95": round(wait_times[int(len(wait_times) * 0.95) - 1] * 1000, 3) if len(wait_times) >= 20 else None,
+            "max": round(wait_times[-1] * 1000, 3) if wait_times else 0.0,
+        },
+    }
@@ -10,6 +10,14 @@ EVALUATE = "evaluate"
 FEEDBACK = "feedback"
 
 
+def route_entry(state: GraphState) -> str:
+    """Skip the RAG stage when a reference answer was supplied up front."""
+    if state.get("correct_answer"):
+        print("---USING PRECOMPUTED REFERENCE ANSWER---")
+        return EVALUATE
+    return RAG_ANSWER
+
+
 def decide_feedback(state: GraphState) -> str:
     """Decide if detailed feedback is needed based on score."""
     print("---DECIDE FEEDBACK---")
@@ -36,8 +44,14 @@ workflow.add_node(RAG_ANSWER, get_rag_answer)
 workflow.add_node(EVALUATE, evaluate_answer)
 workflow.add_node(FEEDBACK, generate_feedback)
 
-# Set entry point to get RAG answer first (retrieves docs + generates correct answer)
-workflow.set_entry_point(RAG_ANSWER)
+# Get RAG answer first (retrieves docs + generates correct answer) unless a reference answer was supplied
+workflow.set_conditional_entry_point(
+    route_entry,
+    {
+        RAG_ANSWER: RAG_ANSWER,
+        EVALUATE: EVALUATE,
+    }
+)
 
 # Add edges: RAG_ANSWER -> EVALUATE -> decide_feedback -> FEEDBACK -> END
 workflow.add_edge(RAG_ANSWER, EVALUATE)
@@ -2,7 +2,7 @@ from app.graph.evaluation_graph.chain import answer_evaluator
 from app.graph.evaluation_graph.state import GraphState
 
 
-def evaluate_answer(state: GraphState) -> dict:
+async def evaluate_answer(state: GraphState) -> dict:
     """Evaluate the user's answer against the correct answer using retrieved documents."""
     print("---EVALUATE ANSWER---")
     
@@ -20,7 +20,7 @@ def evaluate_answer(state: GraphState) -> dict:
         print("⚠️ No documents available for context")
     
     # Call the evaluator chain with context
-    result = answer_evaluator.invoke({
+    result = await answer_evaluator.ainvoke({
         "question": question,
         "user_answer": user_answer,
         "correct_answer": correct_answer,
@@ -2,7 +2,7 @@ from app.graph.evaluation_graph.chain import feedback_generator
 from app.graph.evaluation_graph.state import GraphState
 
 
-def generate_feedback(state: GraphState) -> dict:
+async def generate_feedback(state: GraphState) -> dict:
     """Generate personalized feedback based on the evaluation and course materials."""
     print("---GENERATE FEEDBACK---")
     
@@ -22,7 +22,7 @@ def generate_feedback(state: GraphState) -> dict:
         print("⚠️ No documents available for context")
     
     # Generate detailed feedback with context
-    feedback_result = feedback_generator.invoke({
+    feedback_result = await feedback_generator.ainvoke({
         "question": question,
         "user_answer": user_answer,
         "correct_answer": correct_answer,
@@ -4,7 +4,7 @@ from app.graph.rag_graph import rag_graph
 from app.graph.rag_graph.state import GraphState as RagState
 
 
-def get_rag_answer(state: GraphState) -> Dict[str, Any]:
+async def get_rag_answer(state: GraphState) -> Dict[str, Any]:
     """
     Use RAG graph to retrieve documents and generate the correct answer.
     This provides both the reference answer and supporting documents.
@@ -32,11 +32,15 @@ def get_rag_answer(state: GraphState) -> Dict[str, Any]:
         "documents": [],
         "answer_found": True,
         "subject": subject,
-        "workspace_id": workspace_id
+        "workspace_id": workspace_id,
+        "allow_web_search": web_search,
+        "generation_count": 0,
+        "tool_call_count": 0,
+        "budget_exhausted": False
     }
     
     # Invoke RAG graph to get answer and documents
-    result = rag_graph.invoke(rag_state)
+    result = await rag_graph.ainvoke(rag_state)
     
     # Extract results
     correct_answer = result.get("generation", "")
@@ -24,7 +24,7 @@ def get_workspace_retriever(workspace_id: str):
     )
 
 
-def retrieve_for_evaluation(state: GraphState) -> Dict[str, Any]:
+async def retrieve_for_evaluation(state: GraphState) -> Dict[str, Any]:
     """
     Retrieve relevant documents for evaluation context.
     Uses the question and correct answer to find relevant course materials.
@@ -48,7 +48,7 @@ def retrieve_for_evaluation(state: GraphState) -> Dict[str, Any]:
     query = f"{question} {correct_answer}"
     
     # Retrieve documents
-    documents = retriever.invoke(query)
+    documents = await retriever.ainvoke(query)
     
     print(f"✅ Retrieved {len(documents)} documents for evaluation context")
     
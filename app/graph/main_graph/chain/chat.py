@@ -10,7 +10,9 @@ CHAT_SYSTEM_PROMPT = """You are a helpful AI learning assistant for a workspace
 Answer questions naturally based on the conversation history.
 Be concise, friendly, and helpful.
 
-IMPORTANT: Keep all responses relevant to {subject}. If the user asks about unrelated topics, politely guide them back to the subject."""
+IMPORTANT: Keep all responses relevant to {subject}. If the user asks about unrelated topics, politely guide them back to the subject.
+
+{summary}"""
 
 chat_prompt = ChatPromptTemplate.from_messages([
     ("system", CHAT_SYSTEM_PROMPT),
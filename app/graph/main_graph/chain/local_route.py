@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import math
+import re
+from collections import Counter, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, Field
+from app.settings import settings
+
+EMBEDDING_DIMENSIONS = 4096
+
+
+class LocalRoute(BaseModel):
+    node: str = Field(description="Main graph node to route to")
+    confidence: float = Field(description="Classifier confidence between 0 and 1")
+    source: str = Field(description="Which local stage produced the decision: 'rules' or 'knn'")
+
+
+# Keyword rules mirroring ROUTER_SYSTEM_PROMPT, checked in the prompt's priority order:
+# evaluation_node > question_generation_node > rag_node > chat_node
+ROUTING_RULES: List[Tuple[str, re.Pattern, float]] = [
+    ("evaluation_node", re.compile(r"(->|→)"), 0.95),
+    ("evaluation_node", re.compile(r"\b(evaluate|grade my|check my (answer|response)|how did i do)\b"), 0.95),
+    ("evaluation_node", re.compile(r"\b(is (this|that|it|my answer) (correct|right)|am i (right|correct))\b"), 0.9),
+    ("evaluation_node", re.compile(r"^(i don'?t know|i'?m not sure|not sure|maybe it'?s|i think it'?s)\b"), 0.9),
+    ("question_generation_node", re.compile(
+        r"\b(quiz me|test me|ask me (about|\d+)|(generate|create|give me|make)( me)?( a| an)?( \d+)?"
+        r"( \w+)?( multiple[- ]choice)? (questions?|quiz(zes)?|flash ?cards?))\b"
+    ), 0.9),
+    ("rag_node", re.compile(
+        r"^(what (is|are|was|were|does)|explain|how (does|do|did|is|are)(?! you\b)|tell me about|define|describe|why (is|are|does|do))\b"
+    ), 0.85),
+    ("chat_node", re.compile(
+        r"^(hi|hello|hey|hiya|good (morning|afternoon|evening)|thanks|thank you|thx|ok(ay)?|bye|goodbye|help)"
+        r"( there| so much| a lot)?[\s!.,?]*$"
+    ), 0.95),
+]
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def classify_by_rules(question: str) -> Optional[LocalRoute]:
+    text = normalize_question(question)
+    for node, pattern, confidence in ROUTING_RULES:
+        if pattern.search(text):
+            return LocalRoute(node=node, confidence=confidence, source="rules")
+    return None
+
+
+def embed(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> Dict[int, float]:
+    """
+    Hashed bag of word unigrams/bigrams and character trigrams, L2-normalized.
+    Cheap enough to run on every message and needs no model download.
+    """
+    words = re.findall(r"[\w'→>-]+", normalize_question(text))
+    features = words + [" ".join(pair) for pair in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    vector: Dict[int, float] = {}
+    for feature in features:
+        bucket = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little") % dimensions
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0
+
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {bucket: value / norm for bucket, value in vector.items()} if norm else vector
+
+
+class NearestNeighbourRouter:
+    """
+    k-nearest-neighbour classifier over routing decisions previously made by routing_chain.
+    Example vectors are stacked into one sparse (CSR) matrix, so scoring a message against
+    every example is a few vectorised numpy operations rather than a Python loop.
+    """
+
+    def __init__(self, k: int = 5, min_similarity: float = 0.5, max_examples: int = 5000):
+        self.k = k
+        self.min_similarity = min_similarity
+        self.max_examples = max_examples
+        # (bucket indices, values, node) per example, oldest first
+        self.examples: Deque[Tuple[np.ndarray, np.ndarray, str]] = deque(maxlen=max_examples)
+        self.matrix: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def add_example(self, question: str, node: str) -> None:
+        vector = embed(question)
+        if not vector:
+            return
+        self.examples.append((
+            np.fromiter(vector.keys(), dtype=np.int64, count=len(vector)),
+            np.fromiter(vector.values(), dtype=np.float32, count=len(vector)),
+            node,
+        ))
+        # Rebuilt on the next lookup, so loading a log rebuilds once
+        self.matrix = None
+
+    def build_matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(row offsets, bucket indices, values, node labels) of all examples."""
+        if self.matrix is None:
+            lengths = np.fromiter((len(indices) for indices, _, _ in self.examples), dtype=np.int64, count=len(self.examples))
+            self.matrix = (
+                np.concatenate(([0], np.cumsum(lengths)))[:-1],
+                np.concatenate([indices for indices, _, _ in self.examples]),
+                np.concatenate([values for _, values, _ in self.examples]),
+                np.array([node for _, _, node in self.examples]),
+            )
+        return self.matrix
+
+    def load(self, path: Path) -> int:
+        """Train from a JSONL decision log, keeping the latest label for repeated questions."""
+        if not path.exists():
+            return 0
+        latest: Dict[str, str] = {}
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    latest[normalize_question(record["question"])] = record["node"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        for question, node in list(latest.items())[-self.max_examples:]:
+            self.add_example(question, node)
+        return len(self.examples)
+
+    def classify(self, question: str) -> Optional[LocalRoute]:
+        vector = embed(question)
+        if not self.examples or not vector:
+            return None
+        row_offsets, indices, values, labels = self.build_matrix()
+        query = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+        query[list(vector.keys())] = list(vector.values())
+
+        # Cosine similarity of the query with every example; rows are never empty
+        similarities = np.add.reduceat(values * query[indices], row_offsets)
+        k = min(self.k, len(similarities))
+        nearest = np.argpartition(similarities, -k)[-k:]
+        if similarities[nearest].max() < self.min_similarity:
+            return None
+
+        votes: Counter = Counter()
+        for i in nearest:
+            votes[str(labels[i])] += float(similarities[i])
+        node, weight = votes.most_common(1)[0]
+        total = sum(votes.values())
+        return LocalRoute(node=node, confidence=weight / total if total else 0.0, source="knn")
+
+
+knn_router = NearestNeighbourRouter(
+    k=settings.ROUTER_KNN_NEIGHBOURS,
+    min_similarity=settings.ROUTER_KNN_MIN_SIMILARITY,
+)
+if settings.ROUTER_DECISION_LOG:
+    loaded = knn_router.load(Path(settings.ROUTER_DECISION_LOG))
+    if loaded:
+        print(f"🧭 Local router trained on {loaded} logged routing decisions")
+
+
+def classify_locally(question: str) -> Optional[LocalRoute]:
+    """
+    First routing stage: keyword rules, then the nearest-neighbour model.
+    Returns None when neither is confident enough and routing_chain should decide.
+    """
+    for classify in (classify_by_rules, knn_router.classify):
+        route = classify(question)
+        if route and route.confidence >= settings.ROUTER_LOCAL_CONFIDENCE:
+            return route
+    return None
+
+
+def append_decision(path: Path, record: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+async def log_routing_decision(question: str, subject: str, node: str) -> None:
+    """Record a routing_chain decision so the nearest-neighbour model can learn from it."""
+    knn_router.add_example(question, node)
+    if not settings.ROUTER_DECISION_LOG:
+        return
+    try:
+        # File IO runs in a thread so the router never blocks the event loop on disk
+        await asyncio.to_thread(
+            append_decision,
+            Path(settings.ROUTER_DECISION_LOG),
+            {"question": question, "subject": subject, "node": node}
+        )
+    except OSError as e:
+        print(f"⚠️ Could not log routing decision: {e}")
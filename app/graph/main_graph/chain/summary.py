@@ -0,0 +1,29 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_google_genai import ChatGoogleGenerativeAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a study conversation in a workspace focused on: {subject}
+
+Extend the existing summary with the new messages. Keep:
+- Topics and concepts discussed and the key facts established
+- Questions, quizzes or flashcards generated and how the user answered them
+- The user's misconceptions, weak spots and stated preferences
+
+Drop greetings and small talk. Do not repeat quiz JSON verbatim, describe it briefly.
+Return only the updated summary, at most 300 words."""
+
+summary_prompt = ChatPromptTemplate.from_messages([
+    ("system", SUMMARY_SYSTEM_PROMPT),
+    ("human", "Existing summary:\n{summary}\n\nNew messages:\n{messages}\n\nUpdated summary:"),
+])
+
+llm = ChatGoogleGenerativeAI(
+    model="gemini-2.5-flash-lite",
+    temperature=0
+)
+
+summary_chain = summary_prompt | llm | StrOutputParser()
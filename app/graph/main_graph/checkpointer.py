@@ -0,0 +1,99 @@
+import base64
+import zlib
+from typing import Any
+from langgraph.checkpoint.redis import AsyncRedisSaver
+from app.settings import settings
+
+try:
+    # Standard library from Python 3.14
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+# Marker that replaces a compressed string inside a checkpoint's channel values
+COMPRESSED_KEY = "__compressed__"
+
+
+def compress_text(text: str, level: int) -> dict:
+    data = text.encode("utf-8")
+    if zstd is not None:
+        codec, compressed = "zstd", zstd.compress(data, level=level)
+    else:
+        codec, compressed = "zlib", zlib.compress(data, level)
+    return {COMPRESSED_KEY: codec, "data": base64.b64encode(compressed).decode("ascii")}
+
+
+def is_compressed(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 2 and value.get(COMPRESSED_KEY) in ("zstd", "zlib") and "data" in value
+
+
+def decompress_text(marker: dict) -> str:
+    data = base64.b64decode(marker["data"])
+    if marker[COMPRESSED_KEY] == "zstd":
+        if zstd is None:
+            raise RuntimeError("Checkpoint was written with zstd compression, which needs Python 3.14+")
+        return zstd.decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def compress_strings(value: Any, min_bytes: int, level: int) -> Any:
+    """Replace every string of at least min_bytes with a compression marker, where that is smaller."""
+    if isinstance(value, dict):
+        return {key: compress_strings(item, min_bytes, level) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compress_strings(item, min_bytes, level) for item in value]
+    if isinstance(value, str) and len(value) >= min_bytes:
+        marker = compress_text(value, level)
+        return marker if len(marker["data"]) < len(value.encode("utf-8")) else value
+    return value
+
+
+def expand_strings(value: Any) -> Any:
+    if is_compressed(value):
+        return decompress_text(value)
+    if isinstance(value, dict):
+        return {key: expand_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_strings(item) for item in value]
+    return value
+
+
+class CompressingRedisSaver(AsyncRedisSaver):
+    """
+    AsyncRedisSaver that compresses large strings in the channel values it stores.
+    The saver keeps channel values inline in each checkpoint's JSON document, so the message
+    list, with quiz and flashcard JSON and long answers, is rewritten on every step.
+    Strings of at least min_bytes are stored as zstd (zlib before Python 3.14) behind a marker;
+    checkpoints without markers, such as those written before compression, load unchanged.
+    """
+
+    def __init__(self, *args, min_bytes: int = 1024, level: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_bytes = min_bytes
+        self.level = level
+
+    def _dump_checkpoint(self, checkpoint) -> dict[str, Any]:
+        dumped = super()._dump_checkpoint(checkpoint)
+        if dumped.get("channel_values"):
+            dumped["channel_values"] = compress_strings(dumped["channel_values"], self.min_bytes, self.level)
+        return dumped
+
+    def _recursive_deserialize(self, obj: Any) -> Any:
+        if is_compressed(obj):
+            return decompress_text(obj)
+        if isinstance(obj, dict) and obj.get("lc") in (1, 2) and obj.get("type") == "constructor":
+            # The reviver does not recurse, so expand a message's compressed fields before it runs
+            obj = expand_strings(obj)
+        return super()._recursive_deserialize(obj)
+
+
+def create_async_checkpointer(**kwargs) -> AsyncRedisSaver:
+    """The Redis saver for the main graph, compressing large channel values if enabled."""
+    if not settings.CHECKPOINT_COMPRESSION:
+        return AsyncRedisSaver(redis_url=settings.REDIS_URL, **kwargs)
+    return CompressingRedisSaver(
+        redis_url=settings.REDIS_URL,
+        min_bytes=settings.CHECKPOINT_COMPRESSION_MIN_BYTES,
+        level=settings.CHECKPOINT_COMPRESSION_LEVEL,
+        **kwargs
+    )
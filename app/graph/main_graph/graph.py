@@ -1,22 +1,54 @@
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.redis import RedisSaver
 from app.graph.main_graph.state import AgentState
-from app.graph.main_graph.node import node_rag_bridge, node_conversation, node_question_generation_bridge, node_evaluation_bridge
+from app.graph.main_graph.node import node_rag_bridge, node_conversation, node_question_generation_bridge, node_evaluation_bridge, node_compact_memory
 from app.graph.main_graph.chain.route import routing_chain, Router
+from app.graph.main_graph.chain.local_route import classify_locally, log_routing_decision
+from app.graph.main_graph.checkpointer import create_async_checkpointer
 from app.settings import settings
 
-# Initialize RedisSaver with URL directly
-checkpointer_manager = RedisSaver.from_conn_string(settings.REDIS_URL)
-checkpointer = checkpointer_manager.__enter__()
+# Checkpoint keys expire after CHECKPOINT_TTL_MINUTES without being read or written
+CHECKPOINT_TTL_CONFIG = (
+    {"default_ttl": settings.CHECKPOINT_TTL_MINUTES, "refresh_on_read": True}
+    if settings.CHECKPOINT_TTL_MINUTES else None
+)
+
+# Async saver used when running the graph and by the memory helpers in redis_memory_service.
+# Its indices are created in the app lifespan via asetup(); large strings are stored compressed.
+async_checkpointer = create_async_checkpointer(ttl=CHECKPOINT_TTL_CONFIG)
+
+# Explicit request modes and the main graph node that serves them
+MODE_ROUTES = {
+    "rag": "rag_node",
+    "chat": "chat_node",
+    "quiz": "question_generation_node",
+    "flashcard": "question_generation_node",
+    "open_questions": "question_generation_node",
+    "evaluate": "evaluation_node",
+}
 
-def router(state: AgentState) -> str:
+async def router(state: AgentState) -> str:
     """
     Route to the appropriate node based on the user's query.
+    An explicit mode wins, a local classifier handles confident cases and routing_chain decides the rest.
     """
     print("---MAIN GRAPH: Routing---")
     question = state["messages"][-1].content
     subject = state.get("subject", "general learning")
-    route: Router = routing_chain.invoke({"question": question, "subject": subject})
+    
+    mode = state.get("mode")
+    if mode in MODE_ROUTES:
+        print(f"Router Decision: {MODE_ROUTES[mode]} (explicit mode '{mode}')")
+        return MODE_ROUTES[mode]
+    
+    # High-confidence cases are routed locally without a model call
+    if settings.ROUTER_LOCAL_ENABLED:
+        local_route = classify_locally(question)
+        if local_route:
+            print(f"Router Decision: {local_route.node} (local {local_route.source}, confidence {local_route.confidence:.2f})")
+            return local_route.node
+    
+    route: Router = await routing_chain.ainvoke({"question": question, "subject": subject})
+    await log_routing_decision(question, subject, route.node)
     print(f"Router Decision: {route.node}")
     print(f"Subject Context: {subject}")
     return route.node
@@ -28,15 +60,17 @@ builder = StateGraph(AgentState)
 # Add nodes
 builder.add_node("rag_node", node_rag_bridge)
 builder.add_node("chat_node", node_conversation)
+builder.add_node("compact_memory", node_compact_memory)
 builder.add_node("question_generation_node", node_question_generation_bridge)
 builder.add_node("evaluation_node", node_evaluation_bridge)
 
 # Set conditional entry point - routes directly to the appropriate node
+# Chat goes through memory compaction first since it is the node that sends the history to the model
 builder.set_conditional_entry_point(
     router,
     {
         "rag_node": "rag_node",
-        "chat_node": "chat_node",
+        "chat_node": "compact_memory",
         "question_generation_node": "question_generation_node",
         "evaluation_node": "evaluation_node"
     }
@@ -44,9 +78,10 @@ builder.set_conditional_entry_point(
 
 # All nodes go directly to END
 builder.add_edge("rag_node", END)
+builder.add_edge("compact_memory", "chat_node")
 builder.add_edge("chat_node", END)
 builder.add_edge("question_generation_node", END)
 builder.add_edge("evaluation_node", END)
 
 
-main_graph = builder.compile(checkpointer=checkpointer)
\ No newline at end of file
+main_graph = builder.compile(checkpointer=async_checkpointer)
@@ -2,5 +2,6 @@ from app.graph.main_graph.node.rag_node import node_rag_bridge
 from app.graph.main_graph.node.chat import node_conversation
 from app.graph.main_graph.node.question_generation_node import node_question_generation_bridge
 from app.graph.main_graph.node.evaluation_node import node_evaluation_bridge
+from app.graph.main_graph.node.memory import node_compact_memory
 
-__all__ = ["node_rag_bridge", "node_conversation", "node_question_generation_bridge", "node_evaluation_bridge"]
+__all__ = ["node_rag_bridge", "node_conversation", "node_question_generation_bridge", "node_evaluation_bridge", "node_compact_memory"]
@@ -1,12 +1,20 @@
 from app.graph.main_graph.state import AgentState
 from app.graph.main_graph.chain.chat import chat_chain
+from app.graph.main_graph.node.memory import get_recent_messages
 from langchain_core.messages import AIMessage
 
 
-def node_conversation(state: AgentState) -> dict:
+async def node_conversation(state: AgentState) -> dict:
     print("---MAIN GRAPH: Conversation Node---")
     subject = state.get("subject", "general learning")
     
-    response = chat_chain.invoke({"messages": state["messages"], "subject": subject})
+    summary = state.get("summary")
+    
+    # Older turns are represented by the running summary; only recent ones are sent verbatim
+    response = await chat_chain.ainvoke({
+        "messages": get_recent_messages(state),
+        "subject": subject,
+        "summary": f"Summary of the earlier conversation:\n{summary}" if summary else ""
+    })
     
     return {"messages": [AIMessage(content=response.content)]}
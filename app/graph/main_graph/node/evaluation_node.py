@@ -1,14 +1,32 @@
 from app.graph.main_graph.state import AgentState
 from app.graph.evaluation_graph import evaluation_graph, GraphState as EvaluationState
 from langchain_core.messages import AIMessage
+from app.settings import settings
+from app.services.reference_answer_service import get_reference_answers
 import json
 
 
-def node_evaluation_bridge(state: AgentState):
+def find_reference_id(messages, ai_message_content: str):
+    """
+    Find the reference answers id attached to the AI message that asked the questions.
+    Messages rebuilt from the database carry no metadata, so look for any AI message
+    with the same content that does.
+    """
+    for msg in reversed(messages):
+        if getattr(msg, "type", None) != "ai" or msg.content != ai_message_content:
+            continue
+        reference_id = getattr(msg, "additional_kwargs", {}).get("reference_id")
+        if reference_id:
+            return reference_id
+    return None
+
+
+async def node_evaluation_bridge(state: AgentState):
     """
     Bridge node that invokes the evaluation graph.
     Extracts question from last AI message and user's answer from current message.
-    Uses RAG pipeline to get correct answer and evaluate.
+    Uses reference answers precomputed at question generation time when available,
+    otherwise the RAG pipeline, to get the correct answer and evaluate.
     """
     print("---MAIN GRAPH: Evaluation Bridge Node---")
     
@@ -68,7 +86,7 @@ def node_evaluation_bridge(state: AgentState):
         }
         
         # Invoke the evaluation graph
-        result = evaluation_graph.invoke(evaluation_state)
+        result = await evaluation_graph.ainvoke(evaluation_state)
         
         # Format response as single evaluation
         response_content = json.dumps({
@@ -179,33 +197,50 @@ def node_evaluation_bridge(state: AgentState):
     print(f"💬 Found {len(user_answers)} user answers for {len(questions)} questions")
     print(f"🌐 Web search: {web_search}, CRAG: {crag}")
     
-    # Evaluate each question-answer pair
-    evaluations = []
+    # Reference answers computed when the questions were generated let evaluation skip the RAG stage
+    reference = None
+    reference_id = find_reference_id(state["messages"], ai_message_content)
+    if reference_id:
+        reference = await get_reference_answers(reference_id)
+        if reference and len(reference.get("answers", [])) != len(questions):
+            print(f"⚠️ {len(reference['answers'])} reference answers for {len(questions)} questions - falling back to RAG")
+            reference = None
+    print(f"📎 Precomputed reference answers: {'yes' if reference else 'no'}")
+    
+    # Prepare one evaluation graph state per question-answer pair
+    pairs = list(zip(questions, user_answers))
+    evaluation_states = []
     
-    for idx, (question, user_ans) in enumerate(zip(questions, user_answers), 1):
-        print(f"\n🔄 Evaluating question {idx}/{len(questions)}")
+    for idx, (question, user_ans) in enumerate(pairs, 1):
+        print(f"\n🔄 Queueing evaluation {idx}/{len(questions)}")
         print(f"   Question: {question[:80]}...")
         print(f"   Answer: {user_ans[:80]}...")
         
-        # Prepare evaluation graph state
         evaluation_state: EvaluationState = {
             "question": question,
             "user_answer": user_ans,
-            "correct_answer": "",
+            "correct_answer": reference["answers"][idx - 1] if reference else "",
             "workspace_id": workspace_id,
             "subject": subject,
             "evaluation": "",
             "score": 0.0,
             "feedback": "",
-            "documents": [],
+            "documents": reference["documents"] if reference else [],
             "web_search": web_search,
             "crag": crag
         }
-        
-        # Invoke the evaluation graph
-        result = evaluation_graph.invoke(evaluation_state)
-        
-        # Extract results
+        evaluation_states.append(evaluation_state)
+    
+    # Evaluate all pairs concurrently; abatch returns results in input order
+    results = await evaluation_graph.abatch(
+        evaluation_states,
+        config={"max_concurrency": settings.EVALUATION_MAX_CONCURRENCY}
+    )
+    
+    # Extract results
+    evaluations = []
+    
+    for idx, ((question, user_ans), result) in enumerate(zip(pairs, results), 1):
         evaluations.append({
             "question": result.get("question", question),
             "user_answer": result.get("user_answer", user_ans),
@@ -215,7 +250,7 @@ def node_evaluation_bridge(state: AgentState):
             "feedback": result.get("feedback", "")
         })
         
-        print(f"   ✅ Score: {result.get('score', 0.0)}")
+        print(f"   ✅ Question {idx} score: {result.get('score', 0.0)}")
     
     # Calculate overall score
     overall_score = sum(e["score"] for e in evaluations) / len(evaluations) if evaluations else 0.0
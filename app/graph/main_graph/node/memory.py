@@ -0,0 +1,47 @@
+from typing import List
+from langchain_core.messages import BaseMessage, get_buffer_string
+from langchain_core.messages.utils import count_tokens_approximately
+from app.graph.main_graph.state import AgentState
+from app.graph.main_graph.chain.summary import summary_chain
+from app.settings import settings
+
+
+def get_recent_messages(state: AgentState) -> List[BaseMessage]:
+    """Messages not yet folded into the running summary."""
+    messages = state.get("messages", [])
+    summarized_count = state.get("summarized_count", 0)
+    # A cleared or rebuilt checkpoint can be shorter than the stored count
+    if summarized_count >= len(messages):
+        return messages
+    return messages[summarized_count:]
+
+
+async def node_compact_memory(state: AgentState) -> dict:
+    """
+    Fold older turns into the running summary once the unsummarized history
+    exceeds MEMORY_SUMMARY_TRIGGER_TOKENS, keeping the last MEMORY_KEEP_TURNS turns verbatim.
+    Only the newly folded messages are sent to the summarizer.
+    """
+    print("---MAIN GRAPH: Compact Memory Node---")
+    messages = state.get("messages", [])
+    summarized_count = state.get("summarized_count", 0)
+    if summarized_count >= len(messages):
+        summarized_count = 0
+    
+    unsummarized_tokens = count_tokens_approximately(messages[summarized_count:])
+    if unsummarized_tokens <= settings.MEMORY_SUMMARY_TRIGGER_TOKENS:
+        return {}
+    
+    # Keep the last N turns (user + assistant) plus the current user message
+    keep_from = max(summarized_count, len(messages) - (settings.MEMORY_KEEP_TURNS * 2 + 1))
+    if keep_from <= summarized_count:
+        return {}
+    
+    print(f"🗜️ Folding {keep_from - summarized_count} messages ({unsummarized_tokens} tokens unsummarized) into summary")
+    summary = await summary_chain.ainvoke({
+        "summary": state.get("summary") or "None yet.",
+        "messages": get_buffer_string(messages[summarized_count:keep_from]),
+        "subject": state.get("subject", "general learning")
+    })
+    
+    return {"summary": summary, "summarized_count": keep_from}
@@ -3,9 +3,18 @@ from langchain_core.messages import AIMessage
 from app.graph.main_graph.state import AgentState
 from app.graph.question_generation_graph.state import QuestionGraphState
 from app.graph.question_generation_graph import question_generation_graph
+from app.graph.main_graph.node.rag_node import get_loop_budget
+from app.services.reference_answer_service import schedule_reference_answers
 
+# Explicit request modes and the question generation type they select
+MODE_GENERATION_TYPES = {
+    "quiz": "multiple_choice",
+    "flashcard": "flashcard",
+    "open_questions": "open_ended",
+}
 
-def node_question_generation_bridge(state: AgentState) -> Dict[str, Any]:
+
+async def node_question_generation_bridge(state: AgentState) -> Dict[str, Any]:
     """
     Bridge between main graph AgentState and question generation graph QuestionGraphState.
     Routes to question generation graph for generating questions/quizzes.
@@ -36,11 +45,16 @@ def node_question_generation_bridge(state: AgentState) -> Dict[str, Any]:
         documents=[],
         answer_found=True,
         subject=subject,
-        workspace_id=workspace_id
+        workspace_id=workspace_id,
+        allow_web_search=web_search,
+        generation_count=0,
+        tool_call_count=0,
+        budget_exhausted=False,
+        generation_type=MODE_GENERATION_TYPES.get(state.get("mode"))
     )
     
     # Invoke question generation graph
-    result = question_generation_graph.invoke(question_state)
+    result = await question_generation_graph.ainvoke(question_state)
     
     # Extract generated questions/quiz
     generation = result.get("generation", "")
@@ -69,10 +83,22 @@ def node_question_generation_bridge(state: AgentState) -> Dict[str, Any]:
             # Plain text questions
             response_type = "questions"
     
+    additional_kwargs = {
+        "response_type": response_type,
+        "loop_budget": get_loop_budget(result)
+    }
+    
+    # Open-ended questions are graded later; compute their reference answers in the background
+    # from the same documents so evaluation can skip the RAG stage
+    if response_type == "questions":
+        additional_kwargs["reference_id"] = schedule_reference_answers(
+            generation, result.get("documents", []), subject
+        )
+    
     # Create AI message with the generated questions and metadata
     ai_message = AIMessage(
         content=generation,
-        additional_kwargs={"response_type": response_type}
+        additional_kwargs=additional_kwargs
     )
     
     print(f"✅ Question Generation Complete (type: {response_type})")
@@ -2,9 +2,21 @@ from app.graph.main_graph.state import AgentState
 from app.graph.rag_graph import rag_graph
 from app.graph.rag_graph.state import GraphState
 from langchain_core.messages import AIMessage
+from app.settings import settings
 
 
-def node_rag_bridge(state: AgentState) -> dict:
+def get_loop_budget(final_state: dict) -> dict:
+    """Summarise how much of the per-turn loop budget a sub-graph run consumed."""
+    return {
+        "generations": final_state.get("generation_count", 0),
+        "max_regenerations": settings.MAX_REGENERATIONS,
+        "tool_calls": final_state.get("tool_call_count", 0),
+        "max_tool_calls": settings.MAX_TOOL_CALLS,
+        "exhausted": final_state.get("budget_exhausted", False),
+    }
+
+
+async def node_rag_bridge(state: AgentState) -> dict:
     print("---MAIN GRAPH: Calling RAG Sub-Graph---")
     question = state["messages"][-1].content
     workspace_id = state.get("workspace_id", "")
@@ -19,11 +31,18 @@ def node_rag_bridge(state: AgentState) -> dict:
         web_search=state["web_search"],
         crag=state["crag"],
         subject=state["subject"],
-        workspace_id=workspace_id  # Pass workspace_id to RAG graph
+        workspace_id=workspace_id,  # Pass workspace_id to RAG graph
+        allow_web_search=state["web_search"],
+        generation_count=0,
+        tool_call_count=0,
+        budget_exhausted=False
     )
     
-    final_state = rag_graph.invoke(sub_graph_input)
+    final_state = await rag_graph.ainvoke(sub_graph_input)
     
     answer = final_state["generation"]
     
-    return {"messages": [AIMessage(content=answer)]}
+    return {"messages": [AIMessage(
+        content=answer,
+        additional_kwargs={"loop_budget": get_loop_budget(final_state)}
+    )]}
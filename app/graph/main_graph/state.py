@@ -1,9 +1,11 @@
-import operator
 from typing import TypedDict, Annotated, List, Optional
 from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
 
 class AgentState(TypedDict):
-    messages: Annotated[List[BaseMessage], operator.add]
+    # add_messages appends, but replaces messages whose id is already in the checkpoint,
+    # so replaying database history onto an existing checkpoint cannot duplicate it
+    messages: Annotated[List[BaseMessage], add_messages]
 
     workspace_id: str
     
@@ -12,3 +14,9 @@ class AgentState(TypedDict):
     crag: bool
     
     subject: str
+    
+    mode: Optional[str]  # Explicit intent from the request; bypasses the router when set
+    
+    summary: Optional[str]  # Running summary of turns folded out of the chat prompt
+    
+    summarized_count: int  # Number of leading messages covered by summary
@@ -1,26 +1,35 @@
 from .answer_checker import CheckAnswer, answer_checker
-from .document_checker import CheckDocuments, document_checker
+from .document_checker import CheckDocuments, CheckDocumentsBatch, document_checker, batch_document_checker
 from .generation import generation_chain
 from .hallucination_checker import CheckHallucination, hallucination_checker
+from .generation_checker import CheckGeneration, generation_checker, parallel_generation_checker
 from .router import RouteQuery, question_router
 from .multiple_choice import MultipleChoiceQuestion, multiple_choice_chain
 from .generation_router import RouteGeneration, generation_router
 from .flashcard import Flashcard, flashcard_chain
+from .reference_answer import ReferenceAnswers, reference_answer_chain
 
 __all__ = [
     "CheckAnswer",
     "CheckDocuments",
+    "CheckDocumentsBatch",
     "CheckHallucination",
+    "CheckGeneration",
     "RouteQuery",
     "MultipleChoiceQuestion",
     "RouteGeneration",
     "Flashcard",
+    "ReferenceAnswers",
     "answer_checker",
     "document_checker",
+    "batch_document_checker",
     "generation_chain",
     "hallucination_checker",
+    "generation_checker",
+    "parallel_generation_checker",
     "question_router",
     "multiple_choice_chain",
     "generation_router",
     "flashcard_chain",
+    "reference_answer_chain",
 ]
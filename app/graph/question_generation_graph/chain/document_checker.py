@@ -1,4 +1,5 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import List
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
@@ -30,3 +31,33 @@ document_check_prompt = ChatPromptTemplate.from_messages(
 )
 
 document_checker = document_check_prompt | structured_llm_grader
+
+
+class DocumentGrade(BaseModel):
+
+    index: int = Field(description="Number of the document being graded, as shown in its header")
+    binary_score: str = Field(description="Document is relevant to the topic: 'yes' or 'no'")
+
+
+class CheckDocumentsBatch(BaseModel):
+
+    grades: List[DocumentGrade] = Field(description="One grade per retrieved document")
+
+
+structured_llm_batch_grader = llm.with_structured_output(CheckDocumentsBatch)
+
+batch_system = """Evaluate if each retrieved document can help generate questions about the topic.
+
+Grade 'yes': Document contains relevant content, concepts, or information for question generation.
+Grade 'no': Document completely off-topic or unhelpful for the topic.
+
+Be lenient - any useful information = 'yes'.
+Grade every document independently and return exactly one grade per document number."""
+batch_document_check_prompt = ChatPromptTemplate.from_messages(
+    [
+        ("system", batch_system),
+        ("human", "Retrieved documents:\n\n{documents}\n\nTopic/Subject: {question}"),
+    ]
+)
+
+batch_document_checker = batch_document_check_prompt | structured_llm_batch_grader
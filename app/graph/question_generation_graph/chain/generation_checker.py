@@ -0,0 +1,56 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableParallel
+from langchain_google_genai import ChatGoogleGenerativeAI
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from app.graph.question_generation_graph.chain.answer_checker import answer_checker
+from app.graph.question_generation_graph.chain.hallucination_checker import hallucination_checker
+load_dotenv()
+
+llm = ChatGoogleGenerativeAI(
+  model="gemini-2.5-flash",
+  temperature=0
+)
+
+class CheckGeneration(BaseModel):
+
+    grounded: bool = Field(description="Are the questions grounded in the documents? 'yes' or 'no'")
+    binary_score: str = Field(description="Are the questions relevant to the topic 'yes' or 'no'")
+
+structured_llm_grader = llm.with_structured_output(CheckGeneration)
+
+system = """Evaluate generated questions on two independent criteria.
+
+1. grounded - Are the questions grounded in the source documents?
+Grade 'yes' if: All questions can be answered using information from the documents.
+Grade 'no' if: Any question asks about information not present in the documents or contains hallucinations.
+Be strict - any unverifiable question = 'no'. Generic questions must relate to document topics.
+
+2. binary_score - Are the questions relevant to the topic?
+Grade 'yes': Questions are directly related to the topic/subject matter.
+Grade 'no': Questions are completely off-topic or unhelpful.
+Be lenient - questions that explore the topic from different angles = 'yes'."""
+
+human = """Topic: {question}
+
+Documents: {documents}
+
+Generated Questions: {generation}
+
+Are all questions fully based on the documents, and are they relevant to the topic?"""
+
+generation_checker_prompt = ChatPromptTemplate.from_messages(
+    [
+        ("system", system),
+        ("human", human),
+    ]
+)
+
+# Single call returning both verdicts
+generation_checker = generation_checker_prompt | structured_llm_grader
+
+# Both graders run concurrently on the same inputs
+parallel_generation_checker = RunnableParallel(
+    hallucination=hallucination_checker,
+    answer=answer_checker,
+)
@@ -0,0 +1,48 @@
+from typing import List
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+load_dotenv()
+
+
+class ReferenceAnswer(BaseModel):
+    question: str = Field(description="The question being answered, copied from the list")
+    answer: str = Field(description="Concise reference answer based only on the context")
+
+
+class ReferenceAnswers(BaseModel):
+    answers: List[ReferenceAnswer] = Field(description="One reference answer per question, in the same order as the list")
+
+
+llm = ChatGoogleGenerativeAI(
+    model="gemini-2.5-flash",
+    temperature=0
+)
+
+structured_llm_answerer = llm.with_structured_output(ReferenceAnswers)
+
+system = """You write reference answers for study questions that will later be used to grade students.
+
+Rules:
+1. Answer every question in the list, in the same order
+2. Use ONLY the provided context - do not add external knowledge
+3. Cover the key points a complete answer should contain (30-100 words each)
+4. If the context cannot answer a question, answer: "Information not available in source material."
+
+Context:
+{context}"""
+
+human = """Topic/Subject: {subject}
+
+Questions:
+{questions}
+
+Write the reference answers:"""
+
+reference_answer_prompt = ChatPromptTemplate.from_messages([
+    ("system", system),
+    ("human", human)
+])
+
+reference_answer_chain = reference_answer_prompt | structured_llm_answerer
@@ -1,8 +1,12 @@
 from dotenv import load_dotenv
 from langgraph.graph import END,StateGraph
+from typing import Tuple
 from app.graph.question_generation_graph.chain import (
     hallucination_checker,
     answer_checker, 
+    generation_checker,
+    parallel_generation_checker,
+    CheckGeneration,
     question_router, 
     RouteQuery,
     generation_router,
@@ -14,9 +18,11 @@ from app.graph.question_generation_graph.node import (
     web_search,
     generate_questions,
     generate_multiple_choice,
-    generate_flashcards
+    generate_flashcards,
+    best_effort_answer
 )
 from app.graph.question_generation_graph.state import QuestionGraphState
+from app.settings import settings
 load_dotenv()
 
 RETRIEVE = "retrieve"
@@ -25,44 +31,85 @@ GENERATE_MULTIPLE_CHOICE = "generate_multiple_choice"
 GENERATE_FLASHCARDS = "generate_flashcards"
 DOCUMENT_CHECK = "document_check"
 WEB_SEARCH = "web_search"
+BEST_EFFORT = "best_effort"
 
 
-def decide_web_search(state: QuestionGraphState) -> str:
+def can_regenerate(state: QuestionGraphState) -> bool:
+    """The first generation is free; retries are capped by MAX_REGENERATIONS."""
+    return state.get("generation_count", 0) <= settings.MAX_REGENERATIONS
+
+def can_search_web(state: QuestionGraphState) -> bool:
+    """Web search needs the user's opt-in and a remaining tool call budget."""
+    return state.get("allow_web_search", False) and state.get("tool_call_count", 0) < settings.MAX_TOOL_CALLS
+
+async def decide_web_search(state: QuestionGraphState) -> str:
     print("--Decide Web Search---")
-    if state["web_search"]:
+    if state["web_search"] and can_search_web(state):
         return WEB_SEARCH
     else:
         # Route to appropriate generation type
-        return route_generation_type(state)
+        return await route_generation_type(state)
 
-def route_after_retrieve(state: QuestionGraphState) -> str:
+async def route_after_retrieve(state: QuestionGraphState) -> str:
     if state.get("crag", True):
         return DOCUMENT_CHECK
     else:
         # Route to appropriate generation type
-        return route_generation_type(state)
+        return await route_generation_type(state)
 
-def route_generation_type(state: QuestionGraphState) -> str:
+async def route_generation_type(state: QuestionGraphState) -> str:
     print("--Generation Type Router---")
-    question = state["question"]
-    subject = state.get("subject", "general learning")
+    generation_type = state.get("generation_type")
     
-    route: RouteGeneration = generation_router.invoke({
-        "question": question, 
-        "subject": subject
-    })
+    # The request already said what to generate
+    if not generation_type:
+        question = state["question"]
+        subject = state.get("subject", "general learning")
+        
+        route: RouteGeneration = await generation_router.ainvoke({
+            "question": question, 
+            "subject": subject
+        })
+        generation_type = route.generation_type
     
-    if route.generation_type == "flashcard":
+    if generation_type == "flashcard":
         print("--Routing to Flashcard Generation---")
         return GENERATE_FLASHCARDS
-    elif route.generation_type == "multiple_choice":
+    elif generation_type == "multiple_choice":
         print("--Routing to Multiple Choice Generation---")
         return GENERATE_MULTIPLE_CHOICE
     else:
         print("--Routing to Open-Ended Question Generation---")
         return GENERATE_QUESTIONS
 
-def check_hallucination_and_answer(state: QuestionGraphState) -> str:
+async def grade_generation(question: str, generation: str, documents) -> Tuple[bool, bool]:
+    """
+    Grade the generated questions for groundedness and relevance using GRADING_STRATEGY:
+    'sequential' checks relevance only once grounded, 'parallel' runs both graders
+    concurrently and 'combined' asks a single grader for both verdicts.
+    Returns (grounded, relevant).
+    """
+    inputs = {"question": question, "generation": generation, "documents": documents}
+    strategy = settings.GRADING_STRATEGY
+
+    if strategy == "combined":
+        score: CheckGeneration = await generation_checker.ainvoke(inputs)
+        return score.grounded, score.binary_score.lower() == "yes"
+
+    if strategy == "parallel":
+        scores = await parallel_generation_checker.ainvoke(inputs)
+        return scores["hallucination"].binary_score, scores["answer"].binary_score.lower() == "yes"
+
+    score = await hallucination_checker.ainvoke(inputs)
+    if not score.binary_score:
+        return False, False
+    answer_score = await answer_checker.ainvoke(
+        {"question": question, "generation": generation}
+    )
+    return True, answer_score.binary_score.lower() == "yes"
+
+
+async def check_hallucination_and_answer(state: QuestionGraphState) -> str:
     print("--Check Question Quality---")
     question = state["question"]
     generation = state["generation"]
@@ -72,27 +119,27 @@ def check_hallucination_and_answer(state: QuestionGraphState) -> str:
         print("ℹ Not enough context to generate questions")
         return "not_found"
     
-    score = hallucination_checker.invoke(
-        {"question": question, "generation": generation, "documents": documents}
-    )
-    if score.binary_score:
+    grounded, relevant = await grade_generation(question, generation, documents)
+    if grounded:
         print("✓ Questions are grounded in documents")
         print("--Check Question Relevance---")
-        answer_score = answer_checker.invoke(
-            {"question": question, "generation": generation}
-        )
-        if answer_score.binary_score.lower() == "yes":
+        if relevant:
             print("✓ Questions are relevant to the topic")
             return "relevant"
-        else:
-            print("✗ Questions are not relevant to the topic")
+        print("✗ Questions are not relevant to the topic")
+        if can_regenerate(state):
             return "not_relevant"
+        print("⚠️ Regeneration budget exhausted")
+        return "budget_exhausted"
     else:
         print("✗ Questions contain hallucinations")
-        return "not_grounded"
+        if can_search_web(state):
+            return "not_grounded"
+        print("⚠️ Web search disabled or tool call budget exhausted")
+        return "budget_exhausted"
 
 
-def route_question(state: QuestionGraphState) -> str:
+async def route_question(state: QuestionGraphState) -> str:
     print("--Router---")
     
     if not state.get("crag", True):
@@ -101,8 +148,8 @@ def route_question(state: QuestionGraphState) -> str:
     
     question = state["question"]
     subject = state.get("subject", "general learning")
-    source: RouteQuery = question_router.invoke({"question": question, "subject": subject})
-    if source.datasource == "web_search":
+    source: RouteQuery = await question_router.ainvoke({"question": question, "subject": subject})
+    if source.datasource == "web_search" and can_search_web(state):
         print("--Routing to Web Search---")
         return WEB_SEARCH
     else:
@@ -117,6 +164,7 @@ workflow.add_node(GENERATE_QUESTIONS, generate_questions)
 workflow.add_node(GENERATE_MULTIPLE_CHOICE, generate_multiple_choice)
 workflow.add_node(GENERATE_FLASHCARDS, generate_flashcards)
 workflow.add_node(DOCUMENT_CHECK, document_check)
+workflow.add_node(BEST_EFFORT, best_effort_answer)
 
 workflow.set_conditional_entry_point(
   route_question,
@@ -165,6 +213,7 @@ workflow.add_conditional_edges(
       "not_relevant": GENERATE_QUESTIONS,
       "not_grounded": WEB_SEARCH,
       "not_found": END,
+      "budget_exhausted": BEST_EFFORT,
   }
 )
 
@@ -176,6 +225,7 @@ workflow.add_conditional_edges(
       "not_relevant": GENERATE_MULTIPLE_CHOICE,
       "not_grounded": WEB_SEARCH,
       "not_found": END,
+      "budget_exhausted": BEST_EFFORT,
   }
 )
 
@@ -187,7 +237,10 @@ workflow.add_conditional_edges(
       "not_relevant": GENERATE_FLASHCARDS,
       "not_grounded": WEB_SEARCH,
       "not_found": END,
+      "budget_exhausted": BEST_EFFORT,
   }
 )
 
+workflow.add_edge(BEST_EFFORT, END)
+
 question_generation_graph = workflow.compile()
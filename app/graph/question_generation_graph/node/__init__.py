@@ -1,3 +1,4 @@
+from .best_effort import best_effort_answer
 from .document_check import document_check
 from .generation import generate_questions
 from .retrieve import retrieve
@@ -6,6 +7,7 @@ from .multiple_choice import generate_multiple_choice
 from .flashcard import generate_flashcards
 
 __all__ = [
+    "best_effort_answer",
     "document_check",
     "generate_questions",
     "generate_multiple_choice",
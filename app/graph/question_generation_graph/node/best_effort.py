@@ -0,0 +1,13 @@
+from typing import Any, Dict
+from app.graph.question_generation_graph.state import QuestionGraphState
+
+
+def best_effort_answer(state: QuestionGraphState) -> Dict[str, Any]:
+    """
+    Reached when the loop budget runs out before the questions pass grading.
+    Keeps the last generation as a best-effort result and flags the exhausted budget.
+    """
+    print("--Loop Budget Exhausted---")
+    print(f"⚠️ Returning best-effort questions after {state.get('generation_count', 0)} generations "
+          f"and {state.get('tool_call_count', 0)} tool calls")
+    return {"budget_exhausted": True}
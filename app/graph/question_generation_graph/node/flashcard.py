@@ -30,7 +30,7 @@ def extract_question_count(prompt: str, default: int = 7) -> int:
     return default
 
 
-def generate_flashcards(state: QuestionGraphState) -> Dict[str, Any]:
+async def generate_flashcards(state: QuestionGraphState) -> Dict[str, Any]:
     print("--Generate Flashcards---")
     question = state["question"]  # This is the topic/subject
     documents = state["documents"]
@@ -46,7 +46,7 @@ def generate_flashcards(state: QuestionGraphState) -> Dict[str, Any]:
         parser = JsonOutputParser(pydantic_object=Flashcard)
         format_instructions = parser.get_format_instructions()
         
-        result = flashcard_chain.invoke({
+        result = await flashcard_chain.ainvoke({
             "question": question, 
             "context": documents,
             "format_instructions": format_instructions,
@@ -55,10 +55,10 @@ def generate_flashcards(state: QuestionGraphState) -> Dict[str, Any]:
         
         # Convert result to JSON string for storage
         if isinstance(result, list):
-            generation = json.dumps(result, indent=2)
+            generation = json.dumps(result, ensure_ascii=False)
             answer_found = len(result) > 0
         elif isinstance(result, dict):
-            generation = json.dumps([result], indent=2)
+            generation = json.dumps([result], ensure_ascii=False)
             answer_found = True
         else:
             generation = str(result)
@@ -75,5 +75,6 @@ def generate_flashcards(state: QuestionGraphState) -> Dict[str, Any]:
         "documents": documents, 
         "question": question, 
         "generation": generation, 
-        "answer_found": answer_found
+        "answer_found": answer_found,
+        "generation_count": state.get("generation_count", 0) + 1,
     }
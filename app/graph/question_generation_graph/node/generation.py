@@ -3,14 +3,20 @@ from app.graph.question_generation_graph.state import QuestionGraphState
 from app.graph.question_generation_graph.chain.generation import generation_chain
 
 
-def generate_questions(state: QuestionGraphState) -> Dict[str, Any]:
+async def generate_questions(state: QuestionGraphState) -> Dict[str, Any]:
     print("--Generate Questions---")
     question = state["question"]  # This is the topic/subject
     documents = state["documents"]
 
-    generation = generation_chain.invoke({"question": question, "context": documents})
+    generation = await generation_chain.ainvoke({"question": question, "context": documents})
     
     # Check if questions were successfully generated
     answer_found = "not enough context" not in generation.lower()
     
-    return {"documents": documents, "question": question, "generation": generation, "answer_found": answer_found}
+    return {
+        "documents": documents,
+        "question": question,
+        "generation": generation,
+        "answer_found": answer_found,
+        "generation_count": state.get("generation_count", 0) + 1,
+    }
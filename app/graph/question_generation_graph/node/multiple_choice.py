@@ -29,7 +29,7 @@ def extract_question_count(prompt: str, default: int = 7) -> int:
     return default
 
 
-def generate_multiple_choice(state: QuestionGraphState) -> Dict[str, Any]:
+async def generate_multiple_choice(state: QuestionGraphState) -> Dict[str, Any]:
     print("--Generate Multiple Choice Questions---")
     question = state["question"]  # This is the topic/subject
     documents = state["documents"]
@@ -45,7 +45,7 @@ def generate_multiple_choice(state: QuestionGraphState) -> Dict[str, Any]:
         parser = JsonOutputParser(pydantic_object=MultipleChoiceQuestion)
         format_instructions = parser.get_format_instructions()
         
-        result = multiple_choice_chain.invoke({
+        result = await multiple_choice_chain.ainvoke({
             "question": question, 
             "context": documents,
             "format_instructions": format_instructions,
@@ -54,10 +54,10 @@ def generate_multiple_choice(state: QuestionGraphState) -> Dict[str, Any]:
         
         # Convert result to JSON string for storage
         if isinstance(result, list):
-            generation = json.dumps(result, indent=2)
+            generation = json.dumps(result, ensure_ascii=False)
             answer_found = len(result) > 0
         elif isinstance(result, dict):
-            generation = json.dumps([result], indent=2)
+            generation = json.dumps([result], ensure_ascii=False)
             answer_found = True
         else:
             generation = str(result)
@@ -74,5 +74,6 @@ def generate_multiple_choice(state: QuestionGraphState) -> Dict[str, Any]:
         "documents": documents, 
         "question": question, 
         "generation": generation, 
-        "answer_found": answer_found
+        "answer_found": answer_found,
+        "generation_count": state.get("generation_count", 0) + 1,
     }
@@ -22,7 +22,7 @@ def get_workspace_retriever(workspace_id: str):
         search_kwargs={"k": 10}
     )
 
-def retrieve(state: QuestionGraphState) -> Dict[str, Any]:
+async def retrieve(state: QuestionGraphState) -> Dict[str, Any]:
     """
     Retrieve relevant documents from the workspace-specific vector store.
     Uses the workspace_id from state to ensure documents are fetched from the correct workspace.
@@ -41,7 +41,7 @@ def retrieve(state: QuestionGraphState) -> Dict[str, Any]:
     retriever = get_workspace_retriever(workspace_id)
     
     # Retrieve documents
-    documents = retriever.invoke(question)
+    documents = await retriever.ainvoke(question)
     
     print(f"✅ Retrieved {len(documents)} documents")
     
@@ -1,4 +1,4 @@
-from typing import List, TypedDict
+from typing import List, Optional, TypedDict
 
 
 class QuestionGraphState(TypedDict):
@@ -10,3 +10,8 @@ class QuestionGraphState(TypedDict):
     answer_found: bool
     subject: str
     workspace_id: str
+    allow_web_search: bool  # User's web search setting; web_search is narrowed by document_check
+    generation_count: int  # Generations produced this turn, including retries
+    tool_call_count: int  # Web search calls made this turn
+    budget_exhausted: bool  # Loop budget ran out and the last generation was returned as-is
+    generation_type: Optional[str]  # Known generation type (RouteGeneration values); skips generation_router when set
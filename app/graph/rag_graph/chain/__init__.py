@@ -1,17 +1,23 @@
 from .answer_checker import CheckAnswer, answer_checker
-from .document_checker import CheckDocuments, document_checker
+from .document_checker import CheckDocuments, CheckDocumentsBatch, document_checker, batch_document_checker
 from .generation import generation_chain
 from .hallucination_checker import CheckHallucination, hallucination_checker
+from .generation_checker import CheckGeneration, generation_checker, parallel_generation_checker
 from .router import RouteQuery, question_router
 
 __all__ = [
     "CheckAnswer",
     "CheckDocuments",
+    "CheckDocumentsBatch",
     "CheckHallucination",
+    "CheckGeneration",
     "RouteQuery",
     "answer_checker",
     "document_checker",
+    "batch_document_checker",
     "generation_chain",
     "hallucination_checker",
+    "generation_checker",
+    "parallel_generation_checker",
     "question_router",
 ]
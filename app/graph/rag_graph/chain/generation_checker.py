@@ -0,0 +1,56 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableParallel
+from langchain_google_genai import ChatGoogleGenerativeAI
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from app.graph.rag_graph.chain.answer_checker import answer_checker
+from app.graph.rag_graph.chain.hallucination_checker import hallucination_checker
+load_dotenv()
+
+llm = ChatGoogleGenerativeAI(
+  model="gemini-2.5-flash",
+  temperature=0
+)
+
+class CheckGeneration(BaseModel):
+
+    grounded: bool = Field(description="Is the answer grounded in the documents? 'yes' or 'no'")
+    binary_score: str = Field(description="Does the answer address the question 'yes' or 'no'")
+
+structured_llm_grader = llm.with_structured_output(CheckGeneration)
+
+system = """Evaluate a generated answer on two independent criteria.
+
+1. grounded - Is the answer grounded in the source documents?
+Grade 'yes' if: All claims can be traced to the documents (direct quotes, paraphrasing, or reasonable inference).
+Grade 'no' if: Any part contains unsupported information, hallucinations, or contradicts the documents.
+Be strict - any unverifiable claim = 'no'. Reasonable inference OK, speculation not OK.
+
+2. binary_score - Does the answer address the question?
+Grade 'yes': Answer attempts to address the question (directly, partially, or with relevant info).
+Grade 'no': Answer completely ignores question, off-topic, or unhelpful.
+Be lenient - partial/imperfect answers that are relevant = 'yes'."""
+
+human = """Question: {question}
+
+Documents: {documents}
+
+Answer: {generation}
+
+Is the answer fully supported by the documents, and does it address the question?"""
+
+generation_checker_prompt = ChatPromptTemplate.from_messages(
+    [
+        ("system", system),
+        ("human", human),
+    ]
+)
+
+# Single call returning both verdicts
+generation_checker = generation_checker_prompt | structured_llm_grader
+
+# Both graders run concurrently on the same inputs
+parallel_generation_checker = RunnableParallel(
+    hallucination=hallucination_checker,
+    answer=answer_checker,
+)
@@ -1,19 +1,38 @@
 from dotenv import load_dotenv
 from langgraph.graph import END,StateGraph
-from app.graph.rag_graph.chain import hallucination_checker,answer_checker, question_router, RouteQuery
-from app.graph.rag_graph.node import retrieve,document_check,web_search,generate_answer
+from typing import Tuple
+from app.graph.rag_graph.chain import (
+    hallucination_checker,
+    answer_checker,
+    generation_checker,
+    parallel_generation_checker,
+    question_router,
+    RouteQuery,
+    CheckGeneration,
+)
+from app.graph.rag_graph.node import retrieve,document_check,web_search,generate_answer,best_effort_answer
 from app.graph.rag_graph.state import GraphState
+from app.settings import settings
 load_dotenv()
 
 RETRIEVE = "retrieve"
 GENERATE_ANSWER = "generate_answer"
 DOCUMENT_CHECK = "document_check"
 WEB_SEARCH = "web_search"
+BEST_EFFORT = "best_effort"
+
+
+def can_regenerate(state: GraphState) -> bool:
+    """The first generation is free; retries are capped by MAX_REGENERATIONS."""
+    return state.get("generation_count", 0) <= settings.MAX_REGENERATIONS
 
+def can_search_web(state: GraphState) -> bool:
+    """Web search needs the user's opt-in and a remaining tool call budget."""
+    return state.get("allow_web_search", False) and state.get("tool_call_count", 0) < settings.MAX_TOOL_CALLS
 
 def decide_web_search(state: GraphState) -> str:
     print("--Decide Web Search---")
-    if state["web_search"]:
+    if state["web_search"] and can_search_web(state):
         return WEB_SEARCH
     else:
         return GENERATE_ANSWER
@@ -23,7 +42,34 @@ def route_after_retrieve(state: GraphState) -> str:
         return DOCUMENT_CHECK
     else:
         return GENERATE_ANSWER
-def check_hallucination_and_answer(state: GraphState) -> str:
+async def grade_generation(question: str, generation: str, documents) -> Tuple[bool, bool]:
+    """
+    Grade the generation for groundedness and relevance using GRADING_STRATEGY:
+    'sequential' checks relevance only once grounded, 'parallel' runs both graders
+    concurrently and 'combined' asks a single grader for both verdicts.
+    Returns (grounded, relevant).
+    """
+    inputs = {"question": question, "generation": generation, "documents": documents}
+    strategy = settings.GRADING_STRATEGY
+
+    if strategy == "combined":
+        score: CheckGeneration = await generation_checker.ainvoke(inputs)
+        return score.grounded, score.binary_score.lower() == "yes"
+
+    if strategy == "parallel":
+        scores = await parallel_generation_checker.ainvoke(inputs)
+        return scores["hallucination"].binary_score, scores["answer"].binary_score.lower() == "yes"
+
+    score = await hallucination_checker.ainvoke(inputs)
+    if not score.binary_score:
+        return False, False
+    answer_score = await answer_checker.ainvoke(
+        {"question": question, "generation": generation}
+    )
+    return True, answer_score.binary_score.lower() == "yes"
+
+
+async def check_hallucination_and_answer(state: GraphState) -> str:
     print("--Check Hallucination---")
     question = state["question"]
     generation = state["generation"]
@@ -33,27 +79,27 @@ def check_hallucination_and_answer(state: GraphState) -> str:
         print("ℹ Answer not found in source material")
         return "not_found"
     
-    score = hallucination_checker.invoke(
-        {"question": question, "generation": generation, "documents": documents}
-    )
-    if score.binary_score:
+    grounded, relevant = await grade_generation(question, generation, documents)
+    if grounded:
         print("✓ Answer is grounded in documents")
         print("--Check Answer Relevance---")
-        answer_score = answer_checker.invoke(
-            {"question": question, "generation": generation}
-        )
-        if answer_score.binary_score.lower() == "yes":
+        if relevant:
             print("✓ Answer addresses the question")
             return "relevant"
-        else:
-            print("✗ Answer does not address the question")
+        print("✗ Answer does not address the question")
+        if can_regenerate(state):
             return "not_relevant"
+        print("⚠️ Regeneration budget exhausted")
+        return "budget_exhausted"
     else:
         print("✗ Answer contains hallucinations")
-        return "not_grounded"
+        if can_search_web(state):
+            return "not_grounded"
+        print("⚠️ Web search disabled or tool call budget exhausted")
+        return "budget_exhausted"
 
 
-def route_question(state: GraphState) -> str:
+async def route_question(state: GraphState) -> str:
     print("--Router---")
     
     if not state.get("crag", True):
@@ -62,8 +108,8 @@ def route_question(state: GraphState) -> str:
     
     question = state["question"]
     subject = state.get("subject", "general learning")
-    source: RouteQuery = question_router.invoke({"question": question, "subject": subject})
-    if source.datasource == "web_search":
+    source: RouteQuery = await question_router.ainvoke({"question": question, "subject": subject})
+    if source.datasource == "web_search" and can_search_web(state):
         print("--Routing to Web Search---")
         return WEB_SEARCH
     else:
@@ -76,6 +122,7 @@ workflow.add_node(RETRIEVE, retrieve)
 workflow.add_node(WEB_SEARCH, web_search)
 workflow.add_node(GENERATE_ANSWER, generate_answer)
 workflow.add_node(DOCUMENT_CHECK, document_check)
+workflow.add_node(BEST_EFFORT, best_effort_answer)
 
 workflow.set_conditional_entry_point(
   route_question,
@@ -111,7 +158,10 @@ workflow.add_conditional_edges(
       "not_relevant": GENERATE_ANSWER,
       "not_grounded": WEB_SEARCH,
       "not_found": END,
+      "budget_exhausted": BEST_EFFORT,
   }
 )
 
+workflow.add_edge(BEST_EFFORT, END)
+
 rag_graph = workflow.compile()
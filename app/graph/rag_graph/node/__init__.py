@@ -1,9 +1,11 @@
+from .best_effort import best_effort_answer
 from .document_check import document_check
 from .generation import generate_answer
 from .retrieve import retrieve
 from .web_search import web_search
 
 __all__ = [
+    "best_effort_answer",
     "document_check",
     "generate_answer",
     "retrieve",
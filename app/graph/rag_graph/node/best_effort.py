@@ -0,0 +1,13 @@
+from typing import Any, Dict
+from app.graph.rag_graph.state import GraphState
+
+
+def best_effort_answer(state: GraphState) -> Dict[str, Any]:
+    """
+    Reached when the loop budget runs out before the answer passes grading.
+    Keeps the last generation as a best-effort answer and flags the exhausted budget.
+    """
+    print("--Loop Budget Exhausted---")
+    print(f"⚠️ Returning best-effort answer after {state.get('generation_count', 0)} generations "
+          f"and {state.get('tool_call_count', 0)} tool calls")
+    return {"budget_exhausted": True}
@@ -1,27 +1,72 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
 from app.graph.rag_graph.state import GraphState
-from typing import Dict, Any
-from app.graph.rag_graph.chain.document_checker import document_checker, CheckDocuments
+from typing import Dict, Any, List, Optional
+from app.graph.rag_graph.chain.document_checker import (
+    document_checker,
+    batch_document_checker,
+    CheckDocuments,
+    CheckDocumentsBatch,
+)
+from app.settings import settings
 
 
-def document_check(state: GraphState) -> Dict[str, Any]:
+def get_document_text(doc) -> str:
+    return doc.page_content if hasattr(doc, "page_content") else str(doc)
+
+
+async def grade_documents(question: str, documents: List) -> List[str]:
+    """
+    Grade every retrieved document and return one 'yes'/'no' grade per document, in order.
+    In batch mode all documents are graded in a single structured-output call as long as
+    they fit in the prompt budget; anything left ungraded falls back to concurrent
+    per-document grading.
+    """
+    grades: List[Optional[str]] = [None] * len(documents)
+    contents = [get_document_text(doc) for doc in documents]
+
+    if settings.CRAG_GRADING_MODE == "batch" and len(documents) > 1:
+        total_chars = sum(len(content) for content in contents)
+        if total_chars <= settings.CRAG_BATCH_MAX_CHARS:
+            formatted = "\n\n".join(
+                f"Document {i + 1}:\n{content}" for i, content in enumerate(contents)
+            )
+            try:
+                result: CheckDocumentsBatch = await batch_document_checker.ainvoke(
+                    {"question": question, "documents": formatted}
+                )
+                for grade in result.grades:
+                    if 1 <= grade.index <= len(documents):
+                        grades[grade.index - 1] = grade.binary_score
+            except Exception as e:
+                print(f"⚠️ Batch grading failed, falling back to per-document grading: {e}")
+        else:
+            print(f"📏 {total_chars} chars exceeds batch budget ({settings.CRAG_BATCH_MAX_CHARS}), grading per document")
+
+    pending = [i for i, grade in enumerate(grades) if grade is None]
+    if pending:
+        scores: List[CheckDocuments] = await document_checker.abatch(
+            [{"question": question, "document": documents[i]} for i in pending],
+            config={"max_concurrency": settings.CRAG_MAX_CONCURRENCY},
+        )
+        for i, score in zip(pending, scores):
+            grades[i] = score.binary_score
+
+    return grades
+
+
+async def document_check(state: GraphState) -> Dict[str, Any]:
     print("--Grade Document---")
     question = state["question"]
     documents = state["documents"]
     filtered_doc = []
-    
+
     # Respect the user's web_search setting
     # Only enable web search if user explicitly enabled it
     web_search_enabled = state.get("web_search", False)
     needs_web_search = False
-    
-    for doc in documents:
-        score: CheckDocuments = document_checker.invoke(
-            {"question": question, "document": doc}
-        )
-        grade = score.binary_score
+
+    grades = await grade_documents(question, documents)
+
+    for doc, grade in zip(documents, grades):
         if grade.lower() == "yes":
             print("✓ Document relevant to the question.")
             filtered_doc.append(doc)
@@ -29,16 +74,16 @@ def document_check(state: GraphState) -> Dict[str, Any]:
             print("✗ Document not relevant to the question.")
             needs_web_search = True
             continue
-    
+
     # Only enable web search if:
     # 1. User explicitly enabled it AND
     # 2. Documents are not relevant
     # If web_search is disabled, we won't trigger it even if docs are irrelevant
     web_search = web_search_enabled and needs_web_search
-    
+
     if needs_web_search and not web_search_enabled:
         print("⚠️ Documents not relevant but web_search is disabled by user")
-    
+
     print(f"🔍 Web search status: {web_search} (user enabled: {web_search_enabled}, needs: {needs_web_search})")
 
     return {"documents": filtered_doc, "question": question, "web_search": web_search}
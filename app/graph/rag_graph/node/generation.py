@@ -7,13 +7,19 @@ from app.graph.rag_graph.state import GraphState
 from app.graph.rag_graph.chain.generation import generation_chain
 
 
-def generate_answer(state: GraphState) -> Dict[str, Any]:
+async def generate_answer(state: GraphState) -> Dict[str, Any]:
     print("--Generate Answer---")
     question = state["question"]
     documents = state["documents"]
 
-    generation = generation_chain.invoke({"question": question, "context": documents})
+    generation = await generation_chain.ainvoke({"question": question, "context": documents})
     
     answer_found = "information not available" not in generation.lower()
     
-    return {"documents": documents, "question": question, "generation": generation, "answer_found": answer_found}
+    return {
+        "documents": documents,
+        "question": question,
+        "generation": generation,
+        "answer_found": answer_found,
+        "generation_count": state.get("generation_count", 0) + 1,
+    }
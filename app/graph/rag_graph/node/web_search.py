@@ -9,12 +9,12 @@ load_dotenv()
 web_search_tool = TavilySearch(max_results=3)
 
 
-def web_search(state: GraphState) -> Dict[str, Any]:
+async def web_search(state: GraphState) -> Dict[str, Any]:
     print("--Web Search---")
     question = state["question"]
     documents = state["documents"]
     
-    result = web_search_tool.invoke({"query": question})
+    result = await web_search_tool.ainvoke({"query": question})
     joined_res = "\n".join(
       [res["content"] for res in result["results"]]
     )
@@ -23,4 +23,8 @@ def web_search(state: GraphState) -> Dict[str, Any]:
         documents.append(search_res)
     else:
         documents = [search_res]
-    return {"documents": documents, "question": question}
+    return {
+        "documents": documents,
+        "question": question,
+        "tool_call_count": state.get("tool_call_count", 0) + 1,
+    }
@@ -10,3 +10,7 @@ class GraphState(TypedDict):
     answer_found: bool
     subject: str
     workspace_id: str
+    allow_web_search: bool  # User's web search setting; web_search is narrowed by document_check
+    generation_count: int  # Generations produced this turn, including retries
+    tool_call_count: int  # Web search calls made this turn
+    budget_exhausted: bool  # Loop budget ran out and the last generation was returned as-is
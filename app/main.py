@@ -1,15 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app import __app_name__, __version__
-from app.database import Base, engine
+from app.database import Base, engine, get_pool_metrics, upgrade_schema
 from app.router.auth import router as auth_router
 from app.router.workspace import router as workspace_router
 from app.router.chat import router as chat_router
 from app.router.document import router as document_router
-from app.graph.main_graph.graph import checkpointer
+from app.router.quiz import router as quiz_router
+from app.graph.main_graph.graph import async_checkpointer
+from app.services.redis_memory_service import run_checkpoint_compactor
+from app.services.ingestion_queue import get_ingestion_queue
+from app.settings import settings
+from app.worker import start_workers
 
 
 @asynccontextmanager
@@ -17,18 +23,32 @@ async def lifespan(app: FastAPI):
     """
     Lifespan event handler for startup and shutdown logic.
     
-    Startup: Create database tables
+    Startup: Create database tables and upgrade existing ones
     Shutdown: Clean up resources
     """
-    # Startup: Create all database tables
-    Base.metadata.create_all(bind=engine)
+    # Startup: Create all database tables, then add what newer models need to tables that already existed
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
     print("✅ Database tables created successfully")
     
+    # Startup: Prepare the async checkpointer used by the main graph
+    await async_checkpointer.asetup()
+    
+    # Startup: Prune old checkpoints of active threads in the background
+    compactor_task = asyncio.create_task(run_checkpoint_compactor())
+    
+    # Startup: The in-memory job queue is only visible to this process, so it runs the ingestion workers too
+    worker_tasks = start_workers() if settings.INGESTION_QUEUE_BACKEND == "local" else []
 
     yield  # Application runs and serves requests
     
     # Shutdown: Cleanup logic (if needed)
     print("🔄 Application shutting down...")
+    compactor_task.cancel()
+    for task in worker_tasks:
+        task.cancel()
+    await engine.dispose()
 
 
 # Create FastAPI app with lifespan
@@ -53,6 +73,7 @@ app.include_router(auth_router)
 app.include_router(workspace_router)
 app.include_router(chat_router)
 app.include_router(document_router)
+app.include_router(quiz_router)
 
 
 @app.get("/")
@@ -71,4 +92,16 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected"
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Connection pool usage: checked-out and overflow connections, and checkout wait times."""
+    return get_pool_metrics()
+
+
+@app.get("/health/ingestion")
+async def ingestion_health():
+    """Ingestion queue depth and totals: documents, pages per parse strategy, chunks and parse time."""
+    return await get_ingestion_queue().get_metrics()
@@ -2,4 +2,5 @@ from app.model.user import User
 from app.model.workspace import Workspace
 from app.model.chat_message import ChatMessage
 from app.model.document import Document
-__all__ = ["User", "Workspace", "ChatMessage", "Document"]
+from app.model.quiz_attempt import QuizAttempt
+__all__ = ["User", "Workspace", "ChatMessage", "Document", "QuizAttempt"]
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    # Backs keyset pagination and "last N messages" reads within a workspace
+    __table_args__ = (Index("ix_chat_messages_workspace_id_id", "workspace_id", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
@@ -12,3 +14,4 @@ class ChatMessage(Base):
     content = Column(Text, nullable=False)
 
     workspace = relationship("Workspace", back_populates="chat_messages", lazy="select")
+    quiz_attempts = relationship("QuizAttempt", back_populates="message", lazy="select", cascade="all, delete-orphan", passive_deletes=True)
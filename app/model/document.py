@@ -10,5 +10,7 @@ class Document(Base):
     file_name = Column(String(255), nullable=False)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
     status = Column(String(50), default="PENDING")
+    # fast, hi_res or mixed, chosen page by page at ingestion
+    parse_strategy = Column(String(20), nullable=True)
     
     workspace = relationship("Workspace", back_populates="documents", lazy="select")
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class QuizAttempt(Base):
+    __tablename__ = "quiz_attempts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
+    message_id = Column(Integer, ForeignKey("chat_messages.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    correct_count = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    answers = Column(Text, nullable=False)
+
+    workspace = relationship("Workspace", back_populates="quiz_attempts", lazy="select")
+    message = relationship("ChatMessage", back_populates="quiz_attempts", lazy="select")
@@ -14,3 +14,4 @@ class Workspace(Base):
     user = relationship("User", back_populates="workspaces", lazy="select")
     chat_messages = relationship("ChatMessage", back_populates="workspace", lazy="select", cascade="all, delete-orphan")
     documents = relationship("Document", back_populates="workspace", lazy="select", cascade="all, delete-orphan")
+    quiz_attempts = relationship("QuizAttempt", back_populates="workspace", lazy="select", cascade="all, delete-orphan")
@@ -2,7 +2,7 @@ from datetime import timedelta
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.schema.auth import UserSignup, UserLogin, Token, UserResponse
 from app.services.dependencies import get_db, get_current_active_user
@@ -19,8 +19,8 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
-    existing_user = get_user_by_email(db, email=user_data.email)
+async def signup(user_data: UserSignup, db: AsyncSession = Depends(get_db)):
+    existing_user = await get_user_by_email(db, email=user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -28,7 +28,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
         )
     
     try:
-        new_user = create_user(
+        new_user = await create_user(
             db=db,
             email=user_data.email,
             password=user_data.password,
@@ -38,13 +38,13 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
         return new_user
     
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
@@ -52,8 +52,8 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, email=user_data.email, password=user_data.password)
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, email=user_data.email, password=user_data.password)
     
     if not user:
         raise HTTPException(
@@ -80,10 +80,10 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
    
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await authenticate_user(db, email=form_data.username, password=form_data.password)
     
     if not user:
         raise HTTPException(
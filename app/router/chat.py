@@ -1,20 +1,23 @@
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from langgraph.graph.state import CompiledStateGraph
 from app.schema.chat import (
     ChatRequest,
     ChatResponse,
     ChatHistoryResponse,
     ChatMessageResponse
 )
-from app.services.dependencies import get_db, get_current_active_user
+from app.services.dependencies import get_db, get_current_active_user, get_current_workspace, get_main_graph, load_workspace
 from app.services.chat_service import (
     process_chat_message,
+    stream_chat_message,
     get_chat_history,
     clear_chat_history
 )
-from app.services.workspace_service import check_workspace_exists
 from app.model.user import User
+from app.model.workspace import Workspace
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -29,26 +32,22 @@ router = APIRouter(prefix="/chat", tags=["Chat"])
 async def send_chat_message(
     chat_request: ChatRequest,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    graph: Annotated[CompiledStateGraph, Depends(get_main_graph)],
+    db: AsyncSession = Depends(get_db)
 ):
-    if not check_workspace_exists(db, chat_request.workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {chat_request.workspace_id} not found"
-        )
+    workspace = await load_workspace(db, chat_request.workspace_id, current_user.id)
+    subject = workspace.subject
     try:
-        user_msg, ai_msg, response_type, questions_data = process_chat_message(
+        user_msg, ai_msg, response_type, questions_data, loop_budget = await process_chat_message(
             db=db,
-            workspace_id=chat_request.workspace_id,
-            user_id=current_user.id,
+            workspace=workspace,
+            graph=graph,
             user_message=chat_request.message,
             web_search=chat_request.web_search,
-            crag=chat_request.crag
+            crag=chat_request.crag,
+            mode=chat_request.mode
         )
         
-        from app.services.workspace_service import get_workspace_by_id
-        workspace = get_workspace_by_id(db, chat_request.workspace_id, current_user.id)
-        
         return ChatResponse(
             workspace_id=chat_request.workspace_id,
             user_message=ChatMessageResponse(
@@ -63,9 +62,10 @@ async def send_chat_message(
                 role=ai_msg.role,
                 content=ai_msg.content
             ),
-            subject=workspace.subject if workspace else None,
+            subject=subject,
             response_type=response_type,
-            questions=questions_data
+            questions=questions_data,
+            loop_budget=loop_budget
         )
     
     except ValueError as e:
@@ -74,36 +74,60 @@ async def send_chat_message(
             detail=str(e)
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing chat message: {str(e)}"
         )
 
 
+@router.post(
+    "/stream",
+    summary="Stream a chat message",
+    description="Send a message to the AI agent and receive routing decisions, node progress and answer tokens as server-sent events. Both messages are stored in the workspace when the stream completes."
+)
+async def stream_chat(
+    chat_request: ChatRequest,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    graph: Annotated[CompiledStateGraph, Depends(get_main_graph)],
+    db: AsyncSession = Depends(get_db)
+):
+    workspace = await load_workspace(db, chat_request.workspace_id, current_user.id)
+    return StreamingResponse(
+        stream_chat_message(
+            db=db,
+            workspace=workspace,
+            graph=graph,
+            user_message=chat_request.message,
+            web_search=chat_request.web_search,
+            crag=chat_request.crag,
+            mode=chat_request.mode
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/history/{workspace_id}",
     response_model=ChatHistoryResponse,
     summary="Get chat history",
-    description="Retrieve chat history for a specific workspace."
+    description="Retrieve chat history for a specific workspace, newest first. Use before_id/after_id to page from a message."
 )
 async def get_workspace_chat_history(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
-    limit: Optional[int] = Query(150, ge=1, le=500, description="Maximum number of messages to return")
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db),
+    limit: Optional[int] = Query(150, ge=1, le=500, description="Maximum number of messages to return"),
+    before_id: Optional[int] = Query(None, description="Return messages older than this message ID"),
+    after_id: Optional[int] = Query(None, description="Return messages newer than this message ID")
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
     try:
-        messages = get_chat_history(
+        messages = await get_chat_history(
             db=db,
-            workspace_id=workspace_id,
-            user_id=current_user.id,
-            limit=limit
+            workspace=workspace,
+            limit=limit,
+            before_id=before_id,
+            after_id=after_id
         )
         
         return ChatHistoryResponse(
@@ -117,7 +141,8 @@ async def get_workspace_chat_history(
                 for msg in messages
             ],
             total=len(messages),
-            workspace_id=workspace_id
+            workspace_id=workspace.id,
+            next_before_id=messages[-1].id if messages and len(messages) == limit else None
         )
     
     except Exception as e:
@@ -134,28 +159,15 @@ async def get_workspace_chat_history(
     description="Delete all chat messages for a workspace."
 )
 async def clear_workspace_chat_history(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        success = clear_chat_history(
-            db=db,
-            workspace_id=workspace_id,
-            user_id=current_user.id
-        )
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Workspace with ID {workspace_id} not found"
-            )
-        
+        await clear_chat_history(db=db, workspace=workspace)
         return None
     
-    except HTTPException:
-        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error clearing chat history: {str(e)}"
@@ -1,22 +1,21 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schema.document import (
     DocumentResponse,
     DocumentList,
     DocumentUploadResponse,
 )
-from app.services.dependencies import get_db, get_current_active_user
-from app.services.workspace_service import check_workspace_exists
+from app.services.dependencies import get_db, get_current_workspace
 from app.services.document_service import (
     create_document,
     get_documents_by_workspace,
     get_document_by_id,
     delete_document,
-    process_and_store_document,
+    enqueue_document_ingestion,
 )
-from app.model.user import User
+from app.model.workspace import Workspace
 
 router = APIRouter(prefix="/workspaces/{workspace_id}/documents", tags=["Documents"])
 
@@ -24,21 +23,15 @@ router = APIRouter(prefix="/workspaces/{workspace_id}/documents", tags=["Documen
 @router.post(
     "/upload",
     response_model=DocumentUploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Upload a document",
-    description="Upload a PDF, DOC, or DOCX file. The document will be stored, chunked, embedded, and ingested to Pinecone."
+    description="Upload a PDF, DOC, or DOCX file. The document is stored and queued; a worker chunks, embeds and ingests it to Pinecone. Poll the document until its status is COMPLETED or FAILED."
 )
 async def upload_document(
-    workspace_id: int,
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
     file: UploadFile = File(..., description="Document file (PDF, DOC, or DOCX)"),
-    current_user: Annotated[User, Depends(get_current_active_user)] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
     if not file.filename:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,24 +46,23 @@ async def upload_document(
         )
     
     try:
-        document = create_document(
+        document = await create_document(
             db=db,
             file_name=file.filename,
-            workspace_id=workspace_id
+            workspace_id=workspace.id
         )
         
-        chunks_created, file_path = await process_and_store_document(
-            file=file,
-            workspace_id=workspace_id,
-            document_id=document.id,
-            db=db
-        )
+        try:
+            job = await enqueue_document_ingestion(file=file, document=document)
+        except Exception:
+            document.status = "FAILED"
+            await db.commit()
+            raise
         
         return DocumentUploadResponse(
             document=document,
-            message=f"Document uploaded, chunked, embedded, and ingested to Pinecone successfully",
-            chunks_created=chunks_created,
-            file_path=file_path
+            message="Document uploaded and queued for ingestion",
+            file_path=job.file_path
         )
         
     except ValueError as e:
@@ -79,7 +71,7 @@ async def upload_document(
             detail=str(e)
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing document: {str(e)}"
@@ -93,21 +85,14 @@ async def upload_document(
     description="Get all documents in a workspace."
 )
 async def list_documents(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
-    documents, total = get_documents_by_workspace(
+    documents, total = await get_documents_by_workspace(
         db=db,
-        workspace_id=workspace_id,
-        user_id=current_user.id,
+        workspace=workspace,
         skip=skip,
         limit=limit
     )
@@ -127,21 +112,19 @@ async def list_documents(
     description="Get a specific document by its ID."
 )
 async def get_document(
-    workspace_id: int,
     document_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
-    document = get_document_by_id(
+    document = await get_document_by_id(
         db=db,
         document_id=document_id,
-        workspace_id=workspace_id,
-        user_id=current_user.id
+        workspace=workspace
     )
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in workspace {workspace_id}"
+            detail=f"Document with ID {document_id} not found in workspace {workspace.id}"
         )
     
     return document
@@ -154,29 +137,27 @@ async def get_document(
     description="Delete a document and its embeddings from Pinecone."
 )
 async def delete_document_endpoint(
-    workspace_id: int,
     document_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        success = delete_document(
+        success = await delete_document(
             db=db,
             document_id=document_id,
-            workspace_id=workspace_id,
-            user_id=current_user.id
+            workspace=workspace
         )
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document with ID {document_id} not found in workspace {workspace_id}"
+                detail=f"Document with ID {document_id} not found in workspace {workspace.id}"
             )
         
         return None
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting document: {str(e)}"
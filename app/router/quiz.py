@@ -0,0 +1,62 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schema.quiz import QuizGradeRequest, QuizGradeResponse, QuizItemResult
+from app.services.dependencies import get_db, get_current_workspace
+from app.services.quiz_service import grade_quiz
+from app.model.workspace import Workspace
+
+router = APIRouter(prefix="/workspaces/{workspace_id}/quizzes", tags=["Quizzes"])
+
+
+@router.post(
+    "/{message_id}/grade",
+    response_model=QuizGradeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Grade a multiple-choice quiz",
+    description="Score the selected options against the quiz stored in an assistant message and record the attempt."
+)
+async def grade_quiz_endpoint(
+    message_id: int,
+    grade_request: QuizGradeRequest,
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
+):
+    workspace_id, user_id = workspace.id, workspace.user_id
+    try:
+        graded = await grade_quiz(
+            db=db,
+            workspace_id=workspace_id,
+            user_id=user_id,
+            message_id=message_id,
+            answers=grade_request.answers
+        )
+        if not graded:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Message with ID {message_id} not found in workspace {workspace_id}"
+            )
+        attempt, results = graded
+        
+        return QuizGradeResponse(
+            attempt_id=attempt.id,
+            workspace_id=workspace_id,
+            message_id=message_id,
+            correct=attempt.correct_count,
+            total=attempt.total,
+            score=attempt.score,
+            results=[QuizItemResult(**result) for result in results]
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error grading quiz: {str(e)}"
+        )
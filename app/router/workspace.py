@@ -1,6 +1,6 @@
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.schema.workspace import (
     WorkspaceCreate,
@@ -9,9 +9,8 @@ from app.schema.workspace import (
     WorkspaceDetails,
     WorkspaceList
 )
-from app.services.dependencies import get_db, get_current_active_user
+from app.services.dependencies import get_db, get_current_active_user, get_current_workspace
 from app.services.workspace_service import (
-    get_workspace_by_id,
     get_workspaces_by_user,
     get_workspace_details,
     create_workspace,
@@ -19,8 +18,13 @@ from app.services.workspace_service import (
     delete_workspace,
     check_workspace_exists
 )
-from app.services.redis_memory_service import get_conversation_metadata, clear_conversation_memory
+from app.services.redis_memory_service import (
+    get_conversation_metadata,
+    clear_conversation_memory,
+    list_conversation_checkpoints
+)
 from app.model.user import User
+from app.model.workspace import Workspace
 
 router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
 
@@ -35,10 +39,10 @@ router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
 async def create_new_workspace(
     workspace_data: WorkspaceCreate,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        workspace = create_workspace(
+        workspace = await create_workspace(
             db=db,
             name=workspace_data.name,
             user_id=current_user.id,
@@ -46,7 +50,7 @@ async def create_new_workspace(
         )
         return workspace
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Workspace with this name already exists"
@@ -57,7 +61,7 @@ async def create_new_workspace(
             detail=f"Invalid request data. This endpoint expects JSON with 'name' and optional 'subject' fields. For file uploads, use POST /workspaces/{{workspace_id}}/documents/upload"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating workspace: {str(e)}"
@@ -71,12 +75,12 @@ async def create_new_workspace(
 )
 async def list_user_workspaces(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
     search: Optional[str] = Query(None, description="Search term for workspace name")
 ):
-    workspaces, total = get_workspaces_by_user(
+    workspaces, total = await get_workspaces_by_user(
         db=db,
         user_id=current_user.id,
         skip=skip,
@@ -98,21 +102,8 @@ async def list_user_workspaces(
     description="Get a specific workspace by its ID."
 )
 async def get_workspace(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)]
 ):
-    workspace = get_workspace_by_id(
-        db=db,
-        workspace_id=workspace_id,
-        user_id=current_user.id
-    )
-    if not workspace:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
-    
     return workspace
 
 
@@ -123,22 +114,10 @@ async def get_workspace(
     description="Get workspace with message and document counts."
 )
 async def get_workspace_with_stats(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
-    workspace = get_workspace_details(
-        db=db,
-        workspace_id=workspace_id,
-        user_id=current_user.id
-    )
-    if not workspace:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
-    
-    return workspace
+    return await get_workspace_details(db=db, workspace=workspace)
 
 
 @router.patch(
@@ -148,40 +127,25 @@ async def get_workspace_with_stats(
     description="Update workspace properties (currently only name)."
 )
 async def update_workspace_endpoint(
-    workspace_id: int,
     workspace_data: WorkspaceUpdate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
     try:
-        workspace = update_workspace(
+        return await update_workspace(
             db=db,
-            workspace_id=workspace_id,
-            user_id=current_user.id,
+            workspace=workspace,
             name=workspace_data.name,
             subject=workspace_data.subject
         )
-        
-        if not workspace:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Workspace with ID {workspace_id} not found"
-            )
-        
-        return workspace
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Workspace with this name already exists"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating workspace: {str(e)}"
@@ -195,27 +159,14 @@ async def update_workspace_endpoint(
     description="Delete a workspace and all associated data (messages, documents)."
 )
 async def delete_workspace_endpoint(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        success = delete_workspace(
-            db=db,
-            workspace_id=workspace_id,
-            user_id=current_user.id
-        )
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Workspace with ID {workspace_id} not found"
-            )
-        
+        await delete_workspace(db=db, workspace=workspace)
         return None
-    except HTTPException:
-        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting workspace: {str(e)}"
@@ -230,9 +181,9 @@ async def delete_workspace_endpoint(
 async def check_workspace(
     workspace_id: int,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    exists = check_workspace_exists(
+    exists = await check_workspace_exists(
         db=db,
         workspace_id=workspace_id,
         user_id=current_user.id
@@ -249,17 +200,10 @@ async def check_workspace(
     description="Get information about the Redis checkpoint memory for this workspace."
 )
 async def get_workspace_memory_status(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)]
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
     try:
-        metadata = get_conversation_metadata(workspace_id, current_user.id)
+        metadata = await get_conversation_metadata(workspace.id, workspace.user_id)
         return metadata or {"error": "Could not retrieve memory metadata"}
     except Exception as e:
         raise HTTPException(
@@ -268,6 +212,25 @@ async def get_workspace_memory_status(
         )
 
 
+@router.get(
+    "/{workspace_id}/memory/checkpoints",
+    summary="List Redis checkpoints",
+    description="List the checkpoints stored for this workspace's conversation, newest first. Pass next_before as before to get the next page."
+)
+async def list_workspace_checkpoints(
+    workspace: Annotated[Workspace, Depends(get_current_workspace)],
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of checkpoints to return"),
+    before: Optional[str] = Query(None, description="Return checkpoints older than this checkpoint ID")
+):
+    try:
+        return await list_conversation_checkpoints(workspace.id, workspace.user_id, limit=limit, before=before)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing checkpoints: {str(e)}"
+        )
+
+
 @router.delete(
     "/{workspace_id}/memory",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -275,17 +238,10 @@ async def get_workspace_memory_status(
     description="Clear the Redis checkpoint memory for this workspace without deleting chat history."
 )
 async def clear_workspace_memory(
-    workspace_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    workspace: Annotated[Workspace, Depends(get_current_workspace)]
 ):
-    if not check_workspace_exists(db, workspace_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Workspace with ID {workspace_id} not found"
-        )
     try:
-        success = clear_conversation_memory(workspace_id, current_user.id)
+        success = await clear_conversation_memory(workspace.id, workspace.user_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
 class ChatMessageBase(BaseModel):
@@ -16,11 +16,21 @@ class ChatMessageResponse(ChatMessageBase):
         from_attributes = True
 
 
+ChatMode = Literal["rag", "chat", "quiz", "flashcard", "open_questions", "evaluate"]
+
 class ChatRequest(BaseModel):
     workspace_id: int = Field(..., description="Workspace ID for the chat")
     message: str = Field(..., min_length=1, description="User message")
     web_search: bool = Field(default=False, description="Enable web search for all operations")
     crag: bool = Field(default=False, description="Enable corrective RAG (document quality checking)")
+    mode: Optional[ChatMode] = Field(default=None, description="Explicit intent chosen in the UI; skips intent routing when set")
+
+class LoopBudget(BaseModel):
+    generations: int = Field(..., description="Generations produced this turn, including retries")
+    max_regenerations: int
+    tool_calls: int = Field(..., description="Web search calls made this turn")
+    max_tool_calls: int
+    exhausted: bool = Field(..., description="Budget ran out and a best-effort answer was returned")
 
 class ChatResponse(BaseModel):
     workspace_id: int
@@ -29,8 +39,10 @@ class ChatResponse(BaseModel):
     subject: Optional[str] = Field(None, description="Workspace subject")
     response_type: Optional[str] = Field(default="text", description="Response type: 'text', 'questions', or 'quiz'")
     questions: Optional[List[dict]] = Field(None, description="Parsed JSON questions if response_type is 'questions' or 'quiz'")
+    loop_budget: Optional[LoopBudget] = Field(None, description="Self-correction loop budget consumed by this turn")
 
 class ChatHistoryResponse(BaseModel):
-    messages: List[ChatMessageResponse]
+    messages: List[ChatMessageResponse] = Field(..., description="Messages, newest first")
     total: int
     workspace_id: int
+    next_before_id: Optional[int] = Field(None, description="Pass as before_id to get the next page of older messages")
@@ -16,6 +16,7 @@ class DocumentResponse(DocumentBase):
     id: int
     workspace_id: int
     status: str
+    parse_strategy: Optional[str] = None
     created_at: Optional[datetime] = None
     
     class Config:
@@ -32,5 +33,5 @@ class DocumentList(BaseModel):
 class DocumentUploadResponse(BaseModel):
     document: DocumentResponse
     message: str
-    chunks_created: int
+    chunks_created: Optional[int] = None
     file_path: str
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class QuizGradeRequest(BaseModel):
+    answers: List[Optional[str]] = Field(
+        ...,
+        description="Selected option per question, in order. Either the option text or its letter (A-D); null for a skipped question"
+    )
+
+
+class QuizItemResult(BaseModel):
+    index: int = Field(..., description="1-based position of the question in the quiz")
+    question: str
+    selected: Optional[str] = Field(None, description="Option the submitted answer resolved to")
+    correct_answer: str
+    is_correct: bool
+    explanation: Optional[str] = None
+
+
+class QuizGradeResponse(BaseModel):
+    attempt_id: int
+    workspace_id: int
+    message_id: int
+    correct: int
+    total: int
+    score: float = Field(..., description="Percentage of questions answered correctly (0-100)")
+    results: List[QuizItemResult]
@@ -1,23 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.model.user import User
-from app.services.security import get_password_hash, verify_password
+from app.services.security import hash_password, verify_and_update_password
 
-def get_user_by_email(db: Session, email: str) -> User | None:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(select(User).where(User.email == email))
 
-def get_user_by_id(db: Session, user_id: int) -> User | None:
-    return db.query(User).filter(User.id == user_id).first()
+async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
+    return await db.scalar(select(User).where(User.id == user_id))
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash used a different cost factor; upgrade it now that we have the password
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
-def create_user(db: Session, email: str, password: str, full_name: str) -> User:
-    hashed_password = get_password_hash(password)
+async def create_user(db: AsyncSession, email: str, password: str, full_name: str) -> User:
+    hashed_password = await hash_password(password)
     db_user = User(
         email=email,
         hashed_password=hashed_password,
@@ -25,6 +31,6 @@ def create_user(db: Session, email: str, password: str, full_name: str) -> User:
         is_active=True
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
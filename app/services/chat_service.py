@@ -1,39 +1,80 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from langchain_core.messages import HumanMessage, AIMessage
+import json
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langgraph.graph.state import CompiledStateGraph
 from app.model.chat_message import ChatMessage
 from app.model.workspace import Workspace
-from app.graph.main_graph.graph import main_graph
+from app.model.quiz_attempt import QuizAttempt
+from app.schema.chat import ChatResponse, ChatMessageResponse
 from app.graph.main_graph.state import AgentState
-from app.services.redis_memory_service import get_conversation_config, clear_conversation_memory
+from app.services.redis_memory_service import get_conversation_config, clear_conversation_memory, mark_thread_active
 
+# Top-level nodes reported as routing decisions when streaming
+MAIN_GRAPH_NODES = {"rag_node", "chat_node", "question_generation_node", "evaluation_node"}
 
-def get_chat_history(
-    db: Session, 
-    workspace_id: int, 
-    user_id: int,
-    limit: Optional[int] = 150
+# Node paths, from the main graph node down, whose model output is the user-facing answer,
+# streamed token by token. Matching the whole path keeps out same-named nodes of nested runs,
+# such as the RAG generate_answer that builds reference answers during evaluation.
+# Quiz and flashcard generators emit JSON, which is only useful once complete.
+STREAMED_GENERATION_PATHS = {
+    ("chat_node",),
+    ("rag_node", "generate_answer"),
+    ("question_generation_node", "generate_questions"),
+}
+
+
+def get_node_path(metadata: dict) -> tuple:
+    """
+    Node names from the main graph down to the node an event came from, read from its checkpoint
+    namespace ("rag_node:<task>|generate_answer:<task>"). Batched runs add bare index segments, which are skipped.
+    """
+    namespace = metadata.get("langgraph_checkpoint_ns") or ""
+    return tuple(part.split(":", 1)[0] for part in namespace.split("|") if ":" in part)
+
+
+async def get_chat_history(
+    db: AsyncSession, 
+    workspace: Workspace, 
+    limit: Optional[int] = 150,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None
 ) -> List[ChatMessage]:
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id,
-        Workspace.user_id == user_id
-    ).first()
-    if not workspace:
-        return []
-    
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.workspace_id == workspace_id
-    ).order_by(ChatMessage.id.asc())
+    """
+    One page of messages, newest first. before_id pages back to older messages and
+    after_id forward to newer ones; both are keyset cursors on the (workspace_id, id) index.
+    """
+    messages = select(ChatMessage).where(
+        ChatMessage.workspace_id == workspace.id
+    )
+    if before_id is not None:
+        messages = messages.where(ChatMessage.id < before_id)
     
+    if after_id is not None:
+        # Take the messages right after the cursor, then return them newest first
+        messages = messages.where(ChatMessage.id > after_id).order_by(ChatMessage.id.asc())
+        if limit:
+            messages = messages.limit(limit)
+        return list((await db.scalars(messages)).all())[::-1]
+    
+    messages = messages.order_by(ChatMessage.id.desc())
     if limit:
         messages = messages.limit(limit)
     
-    return messages.all()
+    return list((await db.scalars(messages)).all())
+
 
+async def get_latest_messages(db: AsyncSession, workspace_id: int, limit: int = 150) -> List[ChatMessage]:
+    """The last N messages of a workspace in chronological order, for rebuilding graph context."""
+    messages = await db.scalars(select(ChatMessage).where(
+        ChatMessage.workspace_id == workspace_id
+    ).order_by(ChatMessage.id.desc()).limit(limit))
+    return list(messages.all())[::-1]
 
-def save_message(
-    db: Session,
+
+async def save_message(
+    db: AsyncSession,
     workspace_id: int,
     role: str,
     content: str
@@ -44,65 +85,92 @@ def save_message(
         content=content
     )
     db.add(message)
-    db.commit()
-    db.refresh(message)
+    await db.commit()
+    await db.refresh(message)
     return message
 
+def get_message_id(message: ChatMessage) -> str:
+    """Stable graph message id for a stored message, so a replayed history replaces rather than appends."""
+    return f"chat_message_{message.id}"
+
 def convert_to_langchain_messages(messages: List[ChatMessage]):
     langchain_messages = []
     for msg in messages:
         if msg.role == "user":
-            langchain_messages.append(HumanMessage(content=msg.content))
+            langchain_messages.append(HumanMessage(content=msg.content, id=get_message_id(msg)))
         elif msg.role == "assistant":
-            langchain_messages.append(AIMessage(content=msg.content))
+            langchain_messages.append(AIMessage(content=msg.content, id=get_message_id(msg)))
     return langchain_messages
 
-def process_chat_message(
-    db: Session,
-    workspace_id: int,
-    user_id: int,
+async def build_chat_state(
+    db: AsyncSession,
+    workspace: Workspace,
     user_message: str,
     web_search: bool = False,
-    crag: bool = False
-) -> tuple[ChatMessage, ChatMessage]:
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id,
-        Workspace.user_id == user_id
-    ).first()
-    if not workspace:
-        raise ValueError(f"Workspace {workspace_id} not found or access denied")
-    
+    crag: bool = False,
+    mode: Optional[str] = None,
+    include_history: bool = True
+) -> AgentState:
+    """
+    Build the graph input for a turn. The checkpointer holds the conversation, so
+    only the new message is sent unless include_history asks to rebuild it from the database.
+    """
     subject = workspace.subject or "general learning"
     
-    # Load previous chat history from database
-    previous_messages = get_chat_history(db, workspace_id, user_id, limit=150)
+    langchain_messages = []
+    if include_history:
+        # No checkpoint for this thread: rebuild the conversation from the database
+        previous_messages = await get_latest_messages(db, workspace.id, limit=150)
+        langchain_messages = convert_to_langchain_messages(previous_messages)
+        print(f"💬 Rebuilt checkpoint from {len(previous_messages)} previous messages in database")
     
-    # Convert to LangChain messages and add current message
-    langchain_messages = convert_to_langchain_messages(previous_messages)
     langchain_messages.append(HumanMessage(content=user_message))
     
-    print(f"💬 Loaded {len(previous_messages)} previous messages from database")
-    
-    state: AgentState = {
+    return {
         "messages": langchain_messages,
-        "workspace_id": str(workspace_id),
+        "workspace_id": str(workspace.id),
         "web_search": web_search,
         "crag": crag,
-        "subject": subject
+        "subject": subject,
+        "mode": mode
     }
+
+
+async def prepare_chat_state(
+    db: AsyncSession,
+    workspace: Workspace,
+    graph: CompiledStateGraph,
+    user_message: str,
+    web_search: bool = False,
+    crag: bool = False,
+    mode: Optional[str] = None
+) -> AgentState:
+    """Send only the new message when the thread's checkpoint already holds the conversation."""
+    config = get_conversation_config(workspace.id, workspace.user_id)
+    snapshot = await graph.aget_state(config)
+    if snapshot.values.get("messages"):
+        return await build_chat_state(db, workspace, user_message, web_search, crag, mode, include_history=False)
     
-    config = get_conversation_config(workspace_id, user_id)
-    
-    result = main_graph.invoke(state, config)
-    
-    ai_message = result["messages"][-1]
+    return await build_chat_state(db, workspace, user_message, web_search, crag, mode)
+
+
+async def save_chat_turn(
+    db: AsyncSession,
+    workspace_id: int,
+    user_message: str,
+    ai_message: BaseMessage
+) -> tuple[ChatMessage, ChatMessage, str, Optional[List[dict]], Optional[dict]]:
+    """
+    Persist the user message and the graph's final AI message.
+    Returns the saved messages plus the response type, parsed questions and loop budget.
+    """
     ai_response = ai_message.content
     
-    # Extract response type from message metadata
+    # Extract response type and loop budget from message metadata
     response_type = ai_message.additional_kwargs.get("response_type", "text") if hasattr(ai_message, "additional_kwargs") else "text"
+    loop_budget = ai_message.additional_kwargs.get("loop_budget") if hasattr(ai_message, "additional_kwargs") else None
     
     # Parse JSON questions/evaluation if applicable
-    import json
     questions_data = None
     
     # For evaluation responses, keep the JSON content as-is for frontend
@@ -118,7 +186,7 @@ def process_chat_message(
             response_type = "text"
     
     print(f"💾 Saving user message to database...")
-    user_msg = save_message(
+    user_msg = await save_message(
         db=db,
         workspace_id=workspace_id,
         role="user",
@@ -127,7 +195,7 @@ def process_chat_message(
     print(f"✅ User message saved with ID: {user_msg.id}")
     
     print(f"💾 Saving AI message to database (type: {response_type})...")
-    ai_msg = save_message(
+    ai_msg = await save_message(
         db=db,
         workspace_id=workspace_id,
         role="assistant",
@@ -135,26 +203,107 @@ def process_chat_message(
     )
     print(f"✅ AI message saved with ID: {ai_msg.id}")
     
-    return user_msg, ai_msg, response_type, questions_data
+    return user_msg, ai_msg, response_type, questions_data, loop_budget
 
 
-def clear_chat_history(
-    db: Session,
-    workspace_id: int,
-    user_id: int
-) -> bool:
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id,
-        Workspace.user_id == user_id
-    ).first()
-    if not workspace:
-        return False
-    
-    db.query(ChatMessage).filter(
-        ChatMessage.workspace_id == workspace_id
-    ).delete()
-    db.commit()
+async def process_chat_message(
+    db: AsyncSession,
+    workspace: Workspace,
+    graph: CompiledStateGraph,
+    user_message: str,
+    web_search: bool = False,
+    crag: bool = False,
+    mode: Optional[str] = None
+) -> tuple[ChatMessage, ChatMessage, str, Optional[List[dict]], Optional[dict]]:
+    state = await prepare_chat_state(db, workspace, graph, user_message, web_search, crag, mode)
+    # End the read transaction so the pooled connection is free while the graph awaits the LLMs
+    await db.commit()
+    
+    config = get_conversation_config(workspace.id, workspace.user_id)
     
-    clear_conversation_memory(workspace_id, user_id)
+    result = await graph.ainvoke(state, config)
+    await mark_thread_active(workspace.id, workspace.user_id)
+    
+    return await save_chat_turn(db, workspace.id, user_message, result["messages"][-1])
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_chat_message(
+    db: AsyncSession,
+    workspace: Workspace,
+    graph: CompiledStateGraph,
+    user_message: str,
+    web_search: bool = False,
+    crag: bool = False,
+    mode: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Run the main graph with astream_events and yield server-sent events:
+    - route: the main graph node chosen for this turn
+    - progress: a sub-graph node started (a new generate_* start means a retry, clients should reset tokens)
+    - token: a content chunk from the final answer's model call
+    - done: the persisted turn, same shape as ChatResponse
+    - error: the turn failed and nothing was persisted
+    """
+    workspace_id, user_id, subject = workspace.id, workspace.user_id, workspace.subject
+    try:
+        state = await prepare_chat_state(db, workspace, graph, user_message, web_search, crag, mode)
+        # End the read transaction so the pooled connection is free while the graph awaits the LLMs
+        await db.commit()
+        config = get_conversation_config(workspace_id, user_id)
+        
+        async for event in graph.astream_events(state, config, version="v2"):
+            kind = event["event"]
+            name = event.get("name")
+            node = event.get("metadata", {}).get("langgraph_node")
+            
+            if kind == "on_chain_start" and name in MAIN_GRAPH_NODES and name == node:
+                yield format_sse("route", {"node": name})
+            elif kind == "on_chain_start" and name == node and name not in MAIN_GRAPH_NODES:
+                yield format_sse("progress", {"node": name})
+            elif kind == "on_chat_model_stream" and get_node_path(event.get("metadata", {})) in STREAMED_GENERATION_PATHS:
+                content = event["data"]["chunk"].content
+                if isinstance(content, str) and content:
+                    yield format_sse("token", {"node": node, "content": content})
+        
+        snapshot = await graph.aget_state(config)
+        await mark_thread_active(workspace_id, user_id)
+        user_msg, ai_msg, response_type, questions_data, loop_budget = await save_chat_turn(
+            db, workspace_id, user_message, snapshot.values["messages"][-1]
+        )
+        
+        response = ChatResponse(
+            workspace_id=workspace_id,
+            user_message=ChatMessageResponse.model_validate(user_msg),
+            ai_message=ChatMessageResponse.model_validate(ai_msg),
+            subject=subject,
+            response_type=response_type,
+            questions=questions_data,
+            loop_budget=loop_budget
+        )
+        yield format_sse("done", response.model_dump())
+    
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ Error streaming chat message: {e}")
+        yield format_sse("error", {"detail": f"Error processing chat message: {str(e)}"})
+
+
+async def clear_chat_history(
+    db: AsyncSession,
+    workspace: Workspace
+) -> None:
+    workspace_id, user_id = workspace.id, workspace.user_id
+    
+    await db.execute(delete(QuizAttempt).where(
+        QuizAttempt.workspace_id == workspace_id
+    ))
+    await db.execute(delete(ChatMessage).where(
+        ChatMessage.workspace_id == workspace_id
+    ))
+    await db.commit()
     
-    return True
+    await clear_conversation_memory(workspace_id, user_id)
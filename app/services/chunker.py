@@ -0,0 +1,174 @@
+import math
+import re
+from typing import Iterator, List, Optional
+from app.settings import settings
+
+# Page furniture that only adds noise to embeddings
+SKIPPED_ELEMENT_TYPES = {"Header", "Footer", "PageNumber", "PageBreak", "Image"}
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+")
+WORD_BOUNDARY = re.compile(r"\s+")
+ROW_BOUNDARY = re.compile(r"\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count, about four characters per token for the Gemini models."""
+    return math.ceil(len(text) / 4)
+
+
+def split_to_token_limit(
+    text: str,
+    max_tokens: int,
+    separator: re.Pattern = SENTENCE_BOUNDARY,
+    joiner: str = " "
+) -> List[str]:
+    """Split text at separator (sentence boundaries by default), then at words, into pieces of at most max_tokens."""
+    pieces: List[str] = []
+    current = ""
+    for part in separator.split(text):
+        if estimate_tokens(part) > max_tokens:
+            if current:
+                pieces.append(current)
+                current = ""
+            if separator is not WORD_BOUNDARY:
+                pieces.extend(split_to_token_limit(part, max_tokens, WORD_BOUNDARY))
+            else:
+                # A single "word" past the limit, e.g. a long URL or formula: cut it
+                size = max_tokens * 4
+                pieces.extend(part[i:i + size] for i in range(0, len(part), size))
+            continue
+        candidate = f"{current}{joiner}{part}" if current else part
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = part
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def get_overlap(text: str, max_tokens: int) -> str:
+    """The trailing sentences of a chunk that fit in max_tokens, carried into the next chunk."""
+    if max_tokens <= 0:
+        return ""
+    overlap = ""
+    for sentence in reversed(SENTENCE_BOUNDARY.split(text)):
+        candidate = f"{sentence} {overlap}" if overlap else sentence
+        if estimate_tokens(candidate) > max_tokens:
+            break
+        overlap = candidate
+    return overlap
+
+
+class StructuredChunker:
+    """
+    Groups Unstructured elements into token-sized chunks along the document structure.
+    - a Title closes the running chunk and starts a new section
+    - a Table becomes one chunk of its own, split by rows only past the embedding input limit
+    - other elements fill the running chunk up to max_tokens, with a small sentence overlap
+      only when a section has to be split by size
+    Elements are fed one at a time and finished chunks are returned straight away,
+    so a document is never held in memory as a whole.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        max_table_tokens: Optional[int] = None
+    ):
+        self.max_tokens = max_tokens or settings.CHUNK_MAX_TOKENS
+        self.overlap_tokens = settings.CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+        self.max_table_tokens = max_table_tokens or settings.CHUNK_MAX_TABLE_TOKENS
+        self.section: Optional[str] = None
+        # Headings waiting for the body text they introduce
+        self.headings: List[str] = []
+        # Tail of the previous chunk, prepended if the section continues
+        self.overlap = ""
+        self.parts: List[str] = []
+        self.tokens = 0
+        self.page_start: Optional[int] = None
+        self.page_end: Optional[int] = None
+
+    def make_chunk(self, text: str, chunk_type: str, page_start: Optional[int], page_end: Optional[int]) -> dict:
+        metadata = {"chunk_type": chunk_type, "token_count": estimate_tokens(text)}
+        if self.section:
+            metadata["section"] = self.section
+        if page_start is not None:
+            metadata["page"] = page_start
+            metadata["page_end"] = page_end if page_end is not None else page_start
+        return {"text": text, "metadata": metadata}
+
+    def append(self, text: str, page: Optional[int]) -> None:
+        if not self.parts:
+            lead = ([self.overlap] if self.overlap else []) + self.headings
+            self.parts.extend(lead)
+            self.tokens += sum(estimate_tokens(part) + 1 for part in lead)
+            self.overlap, self.headings = "", []
+        self.parts.append(text)
+        self.tokens += estimate_tokens(text) + 1
+        if page is not None:
+            self.page_start = page if self.page_start is None else self.page_start
+            self.page_end = page
+
+    def flush(self, overlap: bool = False) -> List[dict]:
+        """Close the running chunk; with overlap, its last sentences lead into the next one."""
+        if not self.parts:
+            return []
+        text = "\n\n".join(self.parts)
+        chunk = self.make_chunk(text, "text", self.page_start, self.page_end)
+        self.overlap = get_overlap(self.parts[-1], self.overlap_tokens) if overlap else ""
+        self.parts, self.tokens, self.page_start, self.page_end = [], 0, None, None
+        return [chunk]
+
+    def add(self, element: dict) -> List[dict]:
+        """Feed one element dict; returns the chunks it completed."""
+        element_type = element.get("type")
+        text = (element.get("text") or "").strip()
+        if not text or element_type in SKIPPED_ELEMENT_TYPES:
+            return []
+        page = (element.get("metadata") or {}).get("page_number")
+
+        if element_type == "Title":
+            chunks = self.flush()
+            self.overlap = ""
+            # Consecutive headings all lead into the next chunk; the latest one names the section
+            self.headings.append(text)
+            self.section = text[:200]
+            return chunks
+
+        if element_type == "Table":
+            chunks = self.flush()
+            self.overlap = ""
+            if estimate_tokens(text) <= self.max_table_tokens:
+                row_groups = [text]
+            else:
+                row_groups = split_to_token_limit(text, self.max_table_tokens, ROW_BOUNDARY, "\n")
+            for row_group in row_groups:
+                chunks.append(self.make_chunk(row_group, "table", page, page))
+            return chunks
+
+        chunks: List[dict] = []
+        pieces = [text] if estimate_tokens(text) <= self.max_tokens else split_to_token_limit(text, self.max_tokens)
+        for piece in pieces:
+            if self.parts and self.tokens + estimate_tokens(piece) > self.max_tokens:
+                chunks.extend(self.flush(overlap=True))
+            self.append(piece, page)
+        return chunks
+
+    def finish(self) -> List[dict]:
+        chunks = self.flush()
+        if self.headings:
+            # A trailing heading with no body still gets indexed
+            chunks.append(self.make_chunk("\n\n".join(self.headings), "text", None, None))
+            self.headings = []
+        return chunks
+
+
+def chunk_elements(elements, **kwargs) -> Iterator[dict]:
+    """Chunk an iterable of element dicts with a fresh StructuredChunker."""
+    chunker = StructuredChunker(**kwargs)
+    for element in elements:
+        yield from chunker.add(element)
+    yield from chunker.finish()
@@ -1,24 +1,22 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from langgraph.graph.state import CompiledStateGraph
+from app.database import get_db
+from app.graph.main_graph.graph import main_graph
 from app.services.security import verify_token
-from app.services.auth_service import get_user_by_email
+from app.services.auth_service import get_user_by_id
+from app.services.user_cache import get_cached_user, cache_user
+from app.services.workspace_service import get_workspace_by_id
 from app.model.user import User
+from app.model.workspace import Workspace
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,9 +33,13 @@ async def get_current_user(
     if email is None or user_id is None:
         raise credentials_exception
     
-    user = get_user_by_email(db, email=email)
-    if user is None:
-        raise credentials_exception
+    # Served from the user cache when possible; a changed email invalidates the token
+    user = await get_cached_user(user_id)
+    if user is None or user.email != email:
+        user = await get_user_by_id(db, user_id)
+        if user is None or user.email != email:
+            raise credentials_exception
+        await cache_user(user)
     
     if not user.is_active:
         raise HTTPException(
@@ -57,3 +59,31 @@ async def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+
+async def load_workspace(db: AsyncSession, workspace_id: int, user_id: int) -> Workspace:
+    """Load a workspace owned by the user or raise 404. For routes that take the ID from the body."""
+    workspace = await get_workspace_by_id(db, workspace_id, user_id)
+    if workspace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workspace with ID {workspace_id} not found"
+        )
+    return workspace
+
+
+async def get_current_workspace(
+    workspace_id: int,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db)
+) -> Workspace:
+    """
+    Resolve and authorise the workspace in the path once per request.
+    Services receive the loaded object instead of re-querying ownership.
+    """
+    return await load_workspace(db, workspace_id, current_user.id)
+
+
+def get_main_graph() -> CompiledStateGraph:
+    """The compiled main graph the chat routes run; overridable like any other dependency."""
+    return main_graph
@@ -1,15 +1,21 @@
+import asyncio
 import os
 import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional
 from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from langchain_core.documents import Document as LangchainDocument
-from langchain_unstructured import UnstructuredLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.database import SessionLocal
 from app.model.document import Document
+from app.model.workspace import Workspace
+from app.services.chunker import StructuredChunker
+from app.services.embedding_pipeline import EmbeddingPipeline, PineconeIndex
+from app.services.ingestion_queue import IngestionJob, get_ingestion_queue
+from app.services.parse_pool import iter_parsed_elements
 from app.settings import settings
 from dotenv import load_dotenv
 load_dotenv()
@@ -17,6 +23,8 @@ load_dotenv()
 STORAGE_DIR = Path("storage/documents")
 STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
+_pinecone_index = None
+
 
 def get_embeddings():
     return GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
@@ -31,6 +39,12 @@ def get_vector_store(workspace_id: int):
     )
 
 
+async def delete_document_vectors(workspace_id: int, document_id: int) -> None:
+    """Delete every chunk vector of a document; the Pinecone client is synchronous, so it runs in a thread."""
+    vector_store = get_vector_store(workspace_id)
+    await asyncio.to_thread(vector_store.delete, filter={"document_id": document_id})
+
+
 def clean_metadata_for_pinecone(metadata: dict) -> dict:
     """
     Clean metadata to only include types supported by Pinecone:
@@ -69,54 +83,58 @@ def clean_metadata_for_pinecone(metadata: dict) -> dict:
     return cleaned
 
 
-def load_and_chunk_document(
+async def iter_document_chunks(
     file_path: str,
     workspace_id: int,
     document_id: int,
-    file_name: str
-) -> List[LangchainDocument]:
+    file_name: str,
+    parse_stats: dict
+) -> AsyncIterator[LangchainDocument]:
     """
-    Load and chunk documents - parses all text into continuous content.
-    Uses single mode to extract all text as one document.
+    Parse and chunk a document as a stream: elements arrive from the parse pool range by range
+    and the structured chunker yields section-aligned chunks as soon as they are complete,
+    so memory does not grow with the document.
+    Parse stats are filled into parse_stats.
     """
-    loader = UnstructuredLoader(
-        file_path=file_path,
-        mode="single",  # Parse all text into one continuous content
-        strategy="hi_res",  # Better extraction with GPU acceleration
-        extract_images_in_pdf=False,
-        infer_table_structure=True,
-    )
-    documents = loader.load()
+    metadata = clean_metadata_for_pinecone({
+        "filename": os.path.basename(file_path),
+        "workspace_id": workspace_id,
+        "document_id": document_id,
+        "file_name": file_name,
+        "source": file_name,
+    })
     
-    # Clean metadata and add custom fields
-    for doc in documents:
-        # Clean the existing metadata from unstructured
-        cleaned_metadata = clean_metadata_for_pinecone(doc.metadata)
-        
-        # Add our required fields
-        cleaned_metadata.update({
-            "workspace_id": workspace_id,
-            "document_id": document_id,
-            "file_name": file_name,
-            "source": file_name,
-        })
-        
-        # Replace metadata with cleaned version
-        doc.metadata = cleaned_metadata
+    chunker = StructuredChunker()
+    chunk_index = 0
     
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=3000,
-        chunk_overlap=500,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""],
-    )
+    def to_documents(chunks: List[dict]) -> Iterator[LangchainDocument]:
+        nonlocal chunk_index
+        for chunk in chunks:
+            chunk_metadata = {**metadata, **clean_metadata_for_pinecone(chunk["metadata"]), "chunk_index": chunk_index}
+            chunk_index += 1
+            yield LangchainDocument(page_content=chunk["text"], metadata=chunk_metadata)
     
-    chunked_documents = text_splitter.split_documents(documents)
-    
-    for i, doc in enumerate(chunked_documents):
-        doc.metadata["chunk_index"] = i
+    async for element in iter_parsed_elements(file_path, parse_stats):
+        for document in to_documents(chunker.add(element)):
+            yield document
+    for document in to_documents(chunker.finish()):
+        yield document
+
+
+def get_embedding_pipeline() -> EmbeddingPipeline:
+    global _pinecone_index
+    if _pinecone_index is None:
+        _pinecone_index = PineconeIndex(settings.PINECONE_INDEX_NAME)
+    return EmbeddingPipeline(get_embeddings(), _pinecone_index)
+
+
+async def upsert_chunks(chunks: AsyncIterator[LangchainDocument], workspace_id: int, document_id: int) -> dict:
+    """Embed and upsert chunks through the embedding pipeline as they stream in; returns its stats."""
+    async def with_ids():
+        async for chunk in chunks:
+            yield f"doc_{document_id}_chunk_{chunk.metadata['chunk_index']}", chunk
     
-    return chunked_documents
+    return await get_embedding_pipeline().run(with_ids(), namespace=f"workspace_{workspace_id}")
 
 
 async def save_uploaded_file(
@@ -135,56 +153,90 @@ async def save_uploaded_file(
     return str(file_path)
 
 
-async def process_and_store_document(
+async def enqueue_document_ingestion(
     file: UploadFile,
-    workspace_id: int,
-    document_id: int,
-    db: Session
-) -> tuple[int, str]:
+    document: Document
+) -> IngestionJob:
+    """Save the upload and queue it for a worker; the request returns before any parsing."""
     file_extension = os.path.splitext(file.filename)[1].lower()
     if file_extension not in [".pdf", ".doc", ".docx"]:
         raise ValueError(f"Unsupported file type: {file_extension}. Supported types: PDF, DOC, DOCX")
     
-    file_path = None
-    
-    try:
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if document:
-            document.status = "PROCESSING"
-            db.commit()
-        
-        file_path = await save_uploaded_file(file, workspace_id, document_id)
-        
-        chunked_documents = load_and_chunk_document(
-            file_path=file_path,
-            workspace_id=workspace_id,
-            document_id=document_id,
-            file_name=file.filename
-        )
-        
-        vector_store = get_vector_store(workspace_id)
-        vector_store.add_documents(chunked_documents)
-        
-        if document:
-            document.status = "COMPLETED"
-            db.commit()
-        
-        return len(chunked_documents), file_path
+    file_path = await save_uploaded_file(file, document.workspace_id, document.id)
+    job = IngestionJob(
+        document_id=document.id,
+        workspace_id=document.workspace_id,
+        file_path=file_path,
+        file_name=file.filename
+    )
+    await get_ingestion_queue().enqueue(job)
+    print(f"📥 Queued ingestion of document {document.id} ({file.filename})")
+    return job
+
+
+async def set_document_status(db: AsyncSession, document: Document, status: str) -> None:
+    document.status = status
+    await db.commit()
+
+
+async def ingest_document(job: IngestionJob) -> None:
+    """
+    Parse, chunk, embed and upsert one queued document, run by the ingestion worker.
+    Failures are retried with exponential backoff up to INGESTION_MAX_RETRIES, after which
+    any partially upserted vectors are deleted and the document is marked FAILED. Chunk IDs are stable, so a retry overwrites partial upserts.
+    """
+    async with SessionLocal() as db:
+        document = await db.get(Document, job.document_id)
+        if document is None:
+            # Deleted while queued
+            print(f"⚠️ Document {job.document_id} no longer exists, skipping ingestion")
+            return
         
-    except Exception as e:
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if document:
-            document.status = "FAILED"
-            db.commit()
+        try:
+            await set_document_status(db, document, "PROCESSING")
+            
+            parse_stats: dict = {}
+            chunks = iter_document_chunks(
+                file_path=job.file_path,
+                workspace_id=job.workspace_id,
+                document_id=job.document_id,
+                file_name=job.file_name,
+                parse_stats=parse_stats
+            )
+            embedding_stats = await upsert_chunks(chunks, job.workspace_id, job.document_id)
+            chunk_count = embedding_stats["chunks"]
+            
+            document.parse_strategy = parse_stats["strategy"]
+            await set_document_status(db, document, "COMPLETED")
+            await get_ingestion_queue().record_metrics("completed", parse_stats, chunk_count, embedding_stats)
+            print(
+                f"✅ Ingested document {job.document_id}: {chunk_count} chunks, parsed {parse_stats['pages']} in {parse_stats['parse_seconds']}s, "
+                f"embedded at {embedding_stats['chunks_per_second']} chunks/s"
+            )
         
-        if file_path and os.path.exists(file_path):
-            os.unlink(file_path)
-        
-        raise e
+        except Exception as e:
+            await db.rollback()
+            if job.attempt < settings.INGESTION_MAX_RETRIES:
+                delay = settings.INGESTION_RETRY_BACKOFF_SECONDS * 2 ** job.attempt
+                print(f"⚠️ Ingestion of document {job.document_id} failed (attempt {job.attempt + 1}), retrying in {delay}s: {e}")
+                await set_document_status(db, document, "PENDING")
+                await get_ingestion_queue().enqueue(job.model_copy(update={"attempt": job.attempt + 1}), delay=delay)
+                return
+            
+            print(f"❌ Ingestion of document {job.document_id} failed after {job.attempt + 1} attempts: {e}")
+            # Earlier attempts may have upserted part of the document; don't leave it searchable
+            try:
+                await delete_document_vectors(job.workspace_id, job.document_id)
+            except Exception as cleanup_error:
+                print(f"⚠️ Could not delete partial vectors for document {job.document_id}: {cleanup_error}")
+            await set_document_status(db, document, "FAILED")
+            await get_ingestion_queue().record_metrics("failed")
+            if os.path.exists(job.file_path):
+                os.unlink(job.file_path)
 
 
-def create_document(
-    db: Session,
+async def create_document(
+    db: AsyncSession,
     file_name: str,
     workspace_id: int
 ) -> Document:
@@ -194,68 +246,48 @@ def create_document(
         status="PENDING"
     )
     db.add(document)
-    db.commit()
-    db.refresh(document)
+    await db.commit()
+    await db.refresh(document)
     return document
 
-def get_documents_by_workspace(
-    db: Session,
-    workspace_id: int,
-    user_id: int,
+async def get_documents_by_workspace(
+    db: AsyncSession,
+    workspace: Workspace,
     skip: int = 0,
     limit: int = 100
 ) -> tuple[List[Document], int]:
-    from app.model.workspace import Workspace
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id,
-        Workspace.user_id == user_id
-    ).first()
-    
-    if not workspace:
-        return [], 0
+    total = await db.scalar(select(func.count(Document.id)).where(
+        Document.workspace_id == workspace.id
+    ))
     
-    total = db.query(Document).filter(
-        Document.workspace_id == workspace_id
-    ).count()
+    documents = await db.scalars(select(Document).where(
+        Document.workspace_id == workspace.id
+    ).offset(skip).limit(limit))
     
-    documents = db.query(Document).filter(
-        Document.workspace_id == workspace_id
-    ).offset(skip).limit(limit).all()
-    
-    return documents, total
+    return list(documents), total
 
 
-def get_document_by_id(
-    db: Session,
+async def get_document_by_id(
+    db: AsyncSession,
     document_id: int,
-    workspace_id: int,
-    user_id: int
+    workspace: Workspace
 ) -> Optional[Document]:
-    from app.model.workspace import Workspace
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id,
-        Workspace.user_id == user_id
-    ).first()
-    
-    if not workspace:
-        return None
-    
-    return db.query(Document).filter(
+    return await db.scalar(select(Document).where(
         Document.id == document_id,
-        Document.workspace_id == workspace_id
-    ).first()
+        Document.workspace_id == workspace.id
+    ))
 
 
-def delete_document(
-    db: Session,
+async def delete_document(
+    db: AsyncSession,
     document_id: int,
-    workspace_id: int,
-    user_id: int
+    workspace: Workspace
 ) -> bool:
-    document = get_document_by_id(db, document_id, workspace_id, user_id)
+    document = await get_document_by_id(db, document_id, workspace)
     if not document:
         return False
     
+    workspace_id = workspace.id
     try:
         workspace_dir = STORAGE_DIR / f"workspace_{workspace_id}"
         file_extension = os.path.splitext(document.file_name)[1]
@@ -263,13 +295,12 @@ def delete_document(
         if file_path.exists():
             os.unlink(file_path)
         
-        vector_store = get_vector_store(workspace_id)
-        vector_store.delete(filter={"document_id": document_id})
+        await delete_document_vectors(workspace_id, document_id)
         
-        db.delete(document)
-        db.commit()
+        await db.delete(document)
+        await db.commit()
         
         return True
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise e
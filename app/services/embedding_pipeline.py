@@ -0,0 +1,159 @@
+"""
+Embedding and upsert stage of document ingestion.
+
+Chunks are embedded in batches by a bounded number of concurrent calls, and each embedded
+batch is handed to uploader tasks, so batch N+1 embeds while batch N uploads. Rate-limit
+responses from either service pause all calls with exponential backoff.
+"""
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Iterable, List, Optional, Protocol, Tuple
+from langchain_core.documents import Document as LangchainDocument
+from app.settings import settings
+
+# (id, values, metadata) as accepted by Pinecone's upsert
+Vector = Tuple[str, List[float], dict]
+
+
+class Embedder(Protocol):
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class VectorIndex(Protocol):
+    async def upsert(self, vectors: List[Vector], namespace: str) -> None: ...
+
+
+class PineconeIndex:
+    """Upserts straight to the Pinecone index, in the layout PineconeVectorStore reads back."""
+
+    def __init__(self, index_name: str):
+        from pinecone import Pinecone
+        self.index = Pinecone(api_key=settings.PINECONE_API_KEY).Index(index_name)
+
+    async def upsert(self, vectors: List[Vector], namespace: str) -> None:
+        await asyncio.to_thread(self.index.upsert, vectors=vectors, namespace=namespace)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(error, "status", None) or getattr(error, "code", None)
+    if status == 429:
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message or "rate limit" in message.lower()
+
+
+def batched(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class EmbeddingPipeline:
+    def __init__(
+        self,
+        embedder: Embedder,
+        index: VectorIndex,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None,
+        upsert_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None
+    ):
+        self.embedder = embedder
+        self.index = index
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.concurrency = concurrency or settings.EMBEDDING_CONCURRENCY
+        self.upsert_batch_size = upsert_batch_size or settings.INGESTION_UPSERT_BATCH_SIZE
+        self.upsert_concurrency = upsert_concurrency or settings.INGESTION_UPSERT_CONCURRENCY
+        self.max_retries = settings.EMBEDDING_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = backoff_seconds or settings.EMBEDDING_BACKOFF_SECONDS
+        # Set on a 429 so every in-flight call waits, not only the one that was limited
+        self.resume_at = 0.0
+        self.stats = {"chunks": 0, "batches": 0, "rate_limit_retries": 0, "embed_seconds": 0.0, "upsert_seconds": 0.0}
+
+    async def call_with_backoff(self, call):
+        for attempt in range(self.max_retries + 1):
+            wait = self.resume_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                delay = min(self.backoff_seconds * 2 ** attempt, 60) * (0.5 + random.random() / 2)
+                self.resume_at = max(self.resume_at, time.monotonic() + delay)
+                self.stats["rate_limit_retries"] += 1
+                print(f"⏳ Rate limited, backing off {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+
+    async def embed_batch(self, batch: List[Tuple[str, LangchainDocument]], uploads: asyncio.Queue) -> None:
+        started = time.perf_counter()
+        values = await self.call_with_backoff(
+            lambda: self.embedder.aembed_documents([document.page_content for _, document in batch])
+        )
+        self.stats["embed_seconds"] += time.perf_counter() - started
+        vectors = [
+            (vector_id, vector, {**document.metadata, "text": document.page_content})
+            for (vector_id, document), vector in zip(batch, values)
+        ]
+        for group in batched(vectors, self.upsert_batch_size):
+            await uploads.put(group)
+
+    async def upload(self, uploads: asyncio.Queue, namespace: str) -> None:
+        while True:
+            vectors = await uploads.get()
+            if vectors is None:
+                return
+            started = time.perf_counter()
+            await self.call_with_backoff(lambda: self.index.upsert(vectors, namespace))
+            self.stats["upsert_seconds"] += time.perf_counter() - started
+            self.stats["chunks"] += len(vectors)
+
+    async def run(self, chunks: AsyncIterator[Tuple[str, LangchainDocument]], namespace: str) -> dict:
+        """
+        Embed and upsert (id, document) pairs as they stream in. At most `concurrency` embedding
+        calls run at once, and the upload queue is bounded, so a slow index throttles embedding
+        instead of piling up vectors in memory. Returns throughput stats.
+        """
+        started = time.perf_counter()
+        uploads: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        slots = asyncio.Semaphore(self.concurrency)
+        embedders = []
+
+        async def embed(batch):
+            try:
+                await self.embed_batch(batch, uploads)
+            finally:
+                slots.release()
+
+        async def start_embedding(batch) -> None:
+            await slots.acquire()
+            embedders.append(group.create_task(embed(batch)))
+            self.stats["batches"] += 1
+
+        try:
+            # A failure in any stage cancels the others instead of leaving them blocked on the queue
+            async with asyncio.TaskGroup() as group:
+                uploaders = [group.create_task(self.upload(uploads, namespace)) for _ in range(self.upsert_concurrency)]
+                batch: List[Tuple[str, LangchainDocument]] = []
+                async for item in chunks:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        await start_embedding(batch)
+                        batch = []
+                if batch:
+                    await start_embedding(batch)
+
+                await asyncio.gather(*embedders)
+                for _ in uploaders:
+                    await uploads.put(None)
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+
+        elapsed = time.perf_counter() - started
+        self.stats["elapsed_seconds"] = round(elapsed, 3)
+        self.stats["chunks_per_second"] = round(self.stats["chunks"] / elapsed, 2) if elapsed else 0.0
+        self.stats["embed_seconds"] = round(self.stats["embed_seconds"], 3)
+        self.stats["upsert_seconds"] = round(self.stats["upsert_seconds"], 3)
+        return self.stats
@@ -0,0 +1,195 @@
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from typing import Optional
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+from app.settings import settings
+
+# Ready jobs, LPUSHed by the API and moved to the processing list by a worker
+QUEUE_KEY = "ingestion:queue"
+# Jobs a worker has taken but not finished
+PROCESSING_KEY = "ingestion:processing"
+# Lease deadline per processing job; jobs of crashed workers are requeued once it passes
+LEASES_KEY = "ingestion:leases"
+# Jobs waiting for their retry backoff, scored by the time they become ready
+DELAYED_KEY = "ingestion:delayed"
+# Running ingestion counters, shared by all workers
+METRICS_KEY = "ingestion:metrics"
+
+
+def get_metric_increments(
+    outcome: str,
+    parse_stats: Optional[dict],
+    chunks: int,
+    embedding_stats: Optional[dict] = None
+) -> dict:
+    increments = {f"documents_{outcome}": 1}
+    if parse_stats:
+        increments[f"documents_parsed_{parse_stats['strategy']}"] = 1
+        for strategy, pages in parse_stats["pages"].items():
+            increments[f"pages_{strategy}"] = pages
+        increments["table_pages"] = parse_stats["table_pages"]
+        increments["parse_seconds"] = parse_stats["parse_seconds"]
+        increments["chunks"] = chunks
+    if embedding_stats:
+        # chunks / embedding_seconds gives the overall embedding throughput
+        increments["embedding_seconds"] = embedding_stats["elapsed_seconds"]
+        increments["rate_limit_retries"] = embedding_stats["rate_limit_retries"]
+    return increments
+
+
+class IngestionJob(BaseModel):
+    job_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    document_id: int
+    workspace_id: int
+    file_path: str
+    file_name: str
+    attempt: int = 0
+
+
+class RedisJobQueue:
+    """
+    Reliable Redis list queue shared by the API and any number of worker processes.
+    Taking a job moves it to a processing list under a lease, so a job whose worker
+    dies is put back on the queue instead of being lost.
+    """
+
+    def __init__(self, url: str, lease_seconds: int):
+        self.redis = Redis.from_url(url, decode_responses=True)
+        self.lease_seconds = lease_seconds
+
+    async def enqueue(self, job: IngestionJob, delay: float = 0) -> None:
+        if delay > 0:
+            await self.redis.zadd(DELAYED_KEY, {job.model_dump_json(): time.time() + delay})
+        else:
+            await self.redis.lpush(QUEUE_KEY, job.model_dump_json())
+
+    async def dequeue(self, timeout: float = 5) -> Optional[IngestionJob]:
+        raw = await self.redis.blmove(QUEUE_KEY, PROCESSING_KEY, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        await self.redis.zadd(LEASES_KEY, {raw: time.time() + self.lease_seconds})
+        return IngestionJob.model_validate_json(raw)
+
+    async def ack(self, job: IngestionJob) -> None:
+        raw = job.model_dump_json()
+        await self.redis.lrem(PROCESSING_KEY, 1, raw)
+        await self.redis.zrem(LEASES_KEY, raw)
+
+    async def promote_due(self) -> int:
+        """Move delayed retries whose backoff has passed and expired leases back to the queue."""
+        now = time.time()
+        moved = 0
+        for raw in await self.redis.zrangebyscore(DELAYED_KEY, "-inf", now):
+            # ZREM succeeds for exactly one worker, which then owns the requeue
+            if await self.redis.zrem(DELAYED_KEY, raw):
+                await self.redis.lpush(QUEUE_KEY, raw)
+                moved += 1
+        for raw in await self.redis.zrangebyscore(LEASES_KEY, "-inf", now):
+            if await self.redis.zrem(LEASES_KEY, raw):
+                await self.redis.lrem(PROCESSING_KEY, 1, raw)
+                await self.redis.lpush(QUEUE_KEY, raw)
+                print(f"⚠️ Ingestion job lease expired, requeued: {raw}")
+                moved += 1
+        return moved
+
+    async def record_metrics(
+        self,
+        outcome: str,
+        parse_stats: Optional[dict] = None,
+        chunks: int = 0,
+        embedding_stats: Optional[dict] = None
+    ) -> None:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for field, value in get_metric_increments(outcome, parse_stats, chunks, embedding_stats).items():
+                    pipe.hincrbyfloat(METRICS_KEY, field, value)
+                await pipe.execute()
+        except Exception as e:
+            print(f"⚠️ Could not record ingestion metrics: {e}")
+
+    async def get_metrics(self) -> dict:
+        metrics = {field: float(value) for field, value in (await self.redis.hgetall(METRICS_KEY)).items()}
+        return {
+            "queued": await self.redis.llen(QUEUE_KEY),
+            "processing": await self.redis.llen(PROCESSING_KEY),
+            "delayed": await self.redis.zcard(DELAYED_KEY),
+            "totals": metrics,
+        }
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class LocalJobQueue:
+    """
+    In-process stand-in for RedisJobQueue, for tests and single-process development.
+    Jobs live in memory, so the API process has to run the workers itself.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.delayed: list[tuple[float, IngestionJob]] = []
+        self.metrics: defaultdict = defaultdict(float)
+        self.processing = 0
+
+    async def enqueue(self, job: IngestionJob, delay: float = 0) -> None:
+        if delay > 0:
+            self.delayed.append((time.time() + delay, job))
+        else:
+            await self.queue.put(job)
+
+    async def dequeue(self, timeout: float = 5) -> Optional[IngestionJob]:
+        try:
+            job = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.processing += 1
+        return job
+
+    async def ack(self, job: IngestionJob) -> None:
+        self.processing -= 1
+
+    async def promote_due(self) -> int:
+        now = time.time()
+        due = [job for ready_at, job in self.delayed if ready_at <= now]
+        self.delayed = [(ready_at, job) for ready_at, job in self.delayed if ready_at > now]
+        for job in due:
+            await self.queue.put(job)
+        return len(due)
+
+    async def record_metrics(
+        self,
+        outcome: str,
+        parse_stats: Optional[dict] = None,
+        chunks: int = 0,
+        embedding_stats: Optional[dict] = None
+    ) -> None:
+        for field, value in get_metric_increments(outcome, parse_stats, chunks, embedding_stats).items():
+            self.metrics[field] += value
+
+    async def get_metrics(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "processing": self.processing,
+            "delayed": len(self.delayed),
+            "totals": dict(self.metrics),
+        }
+
+    async def close(self) -> None:
+        pass
+
+
+_queue = None
+
+
+def get_ingestion_queue():
+    global _queue
+    if _queue is None:
+        if settings.INGESTION_QUEUE_BACKEND == "local":
+            _queue = LocalJobQueue()
+        else:
+            _queue = RedisJobQueue(settings.REDIS_URL, settings.INGESTION_JOB_LEASE_SECONDS)
+    return _queue
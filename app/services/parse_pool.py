@@ -0,0 +1,264 @@
+import asyncio
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from pypdf import PdfReader, PdfWriter
+from unstructured.partition.auto import partition
+from app.settings import settings
+
+# Table rows in layout-mode text: cells separated by runs of 3+ spaces
+TABLE_COLUMN_GAP = re.compile(r"\S {3,}(?=\S)")
+TABLE_MIN_ROWS = 3
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def init_parse_worker() -> None:
+    """
+    Runs once in each pool process: load the layout-detection and table models up front
+    so every parse in this process reuses them instead of reloading per document.
+    """
+    try:
+        # Only present with the hi_res extras, so imported here rather than at module level
+        from unstructured_inference.models.base import get_model
+        from unstructured_inference.models.tables import load_agent
+        get_model()
+        if settings.PARSE_INFER_TABLES:
+            load_agent()
+        print(f"🧠 Parse worker {os.getpid()} loaded layout models")
+    except Exception as e:
+        # Models then load lazily on the first parse, as before
+        print(f"⚠️ Parse worker {os.getpid()} could not preload models: {e}")
+
+
+def count_page_images(page) -> int:
+    """Image XObjects drawn on the page, read from its resources without decoding them."""
+    resources = page.get("/Resources")
+    if resources is None:
+        return 0
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return 0
+    return sum(1 for xobject in xobjects.get_object().values() if xobject.get_object().get("/Subtype") == "/Image")
+
+
+def looks_like_table(layout_text: str) -> bool:
+    """Several consecutive lines split into aligned columns by wide gaps."""
+    run = 0
+    for line in layout_text.splitlines():
+        if len(TABLE_COLUMN_GAP.findall(line.strip())) >= 2:
+            run += 1
+            if run >= TABLE_MIN_ROWS:
+                return True
+        else:
+            run = 0
+    return False
+
+
+def select_page_strategy(page) -> Tuple[str, bool]:
+    """
+    Pick (strategy, infer_tables) for one page from its text layer:
+    - fast text extraction when the page has a usable text layer
+    - hi_res (OCR and layout) for scanned, garbled or image-heavy pages
+    - table structure inference where the text is laid out in columns, and on every page
+      without a text layer, since a scanned table can't be detected before OCR
+    """
+    try:
+        layout_text = page.extract_text(extraction_mode="layout") or ""
+    except Exception:
+        layout_text = ""
+    text = "".join(layout_text.split())
+
+    if len(text) < settings.PARSE_MIN_TEXT_CHARS:
+        return "hi_res", settings.PARSE_INFER_TABLES
+    has_table = settings.PARSE_INFER_TABLES and looks_like_table(layout_text)
+    readable = sum(1 for char in text if char.isalnum())
+    if readable / len(text) < 0.5:
+        # Broken font encodings extract as symbol soup
+        return "hi_res", has_table
+    if count_page_images(page) >= settings.PARSE_IMAGE_HEAVY_COUNT:
+        return "hi_res", has_table
+    if has_table:
+        return "hi_res", True
+    return "fast", False
+
+
+def plan_pdf_parse(file_path: str) -> List[Tuple[Tuple[int, int], str, bool]]:
+    """
+    Split a PDF into page ranges that share a strategy, at most PARSE_PAGES_PER_TASK pages each.
+    Returns ((start, end), strategy, infer_tables) per range, in page order.
+    """
+    pages = PdfReader(file_path).pages
+    if settings.PARSE_STRATEGY == "auto":
+        decisions = [select_page_strategy(page) for page in pages]
+    else:
+        decisions = [(settings.PARSE_STRATEGY, settings.PARSE_INFER_TABLES)] * len(pages)
+
+    plan = []
+    for index, decision in enumerate(decisions):
+        if plan and plan[-1][1:] == decision and index - plan[-1][0][0] < settings.PARSE_PAGES_PER_TASK:
+            plan[-1] = ((plan[-1][0][0], index + 1),) + decision
+        else:
+            plan.append(((index, index + 1),) + decision)
+    return plan
+
+
+def run_partition(file_path: str, strategy: str, infer_tables: bool) -> list:
+    return partition(
+        filename=file_path,
+        strategy=strategy,
+        extract_images_in_pdf=False,
+        infer_table_structure=infer_tables,
+    )
+
+
+def partition_file(
+    file_path: str,
+    page_range: Optional[Tuple[int, int]] = None,
+    strategy: str = "hi_res",
+    infer_tables: bool = False
+) -> List[dict]:
+    """
+    Partition a file, or pages [start, end) of a PDF, into element dicts.
+    Page numbers are kept relative to the whole document.
+    """
+    if page_range is None:
+        return [element.to_dict() for element in run_partition(file_path, strategy, infer_tables)]
+
+    start, end = page_range
+    reader = PdfReader(file_path)
+    writer = PdfWriter()
+    for page in reader.pages[start:end]:
+        writer.add_page(page)
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        writer.write(f)
+        part_path = f.name
+    try:
+        elements = run_partition(part_path, strategy, infer_tables)
+    finally:
+        os.unlink(part_path)
+
+    results = []
+    for element in elements:
+        data = element.to_dict()
+        metadata = data.setdefault("metadata", {})
+        metadata["page_number"] = (metadata.get("page_number") or 1) + start
+        metadata["filename"] = os.path.basename(file_path)
+        results.append(data)
+    return results
+
+
+def get_parse_pool_size() -> int:
+    return settings.PARSE_POOL_WORKERS or os.cpu_count() or 1
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Long-lived process pool, created on first use in the ingestion worker."""
+    global _pool
+    if _pool is None:
+        workers = get_parse_pool_size()
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            # spawn, so children don't inherit the worker's event loop and open connections
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parse_worker,
+        )
+        # Processes start on demand; one trivial task each brings them all up and loads their models
+        for _ in range(workers):
+            _pool.submit(os.getpid)
+        print(f"🧩 Parse pool started with {workers} processes")
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool whose process died, unless a concurrent caller already replaced it."""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_parse_pool(func: Callable, *args):
+    """
+    Run func(*args) in the parse pool. A worker killed mid-parse (e.g. by the OOM killer)
+    breaks the whole pool, so it is replaced and the call retried once in a fresh pool.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        print(f"⚠️ Parse pool broke during {func.__name__}, restarting it and retrying once")
+        discard_broken_pool(pool)
+        return await loop.run_in_executor(get_parse_pool(), func, *args)
+
+
+async def iter_parsed_elements(file_path: str, stats: dict) -> AsyncIterator[dict]:
+    """
+    Parse a document in the parse pool and yield its elements in document order.
+    PDFs are planned page by page and their page ranges parsed in parallel, with at most
+    one range per pool process in flight, so only those ranges' elements are held at once.
+    Parse stats are written into stats as soon as they are known.
+    """
+    started = time.perf_counter()
+
+    if not file_path.lower().endswith(".pdf"):
+        # Word documents are read structurally; strategy only applies to PDFs and images
+        stats.update({"strategy": "fast", "pages": {}, "table_pages": 0})
+        elements = await run_in_parse_pool(partition_file, file_path, None, "fast", False)
+        stats["parse_seconds"] = round(time.perf_counter() - started, 3)
+        for element in elements:
+            yield element
+        return
+
+    plan = await run_in_parse_pool(plan_pdf_parse, file_path)
+    page_count = plan[-1][0][1] if plan else 0
+    pages: Dict[str, int] = defaultdict(int)
+    table_pages = 0
+    for (start, end), strategy, infer_tables in plan:
+        pages[strategy] += end - start
+        table_pages += end - start if infer_tables else 0
+    stats.update({
+        "strategy": next(iter(pages)) if len(pages) == 1 else "mixed",
+        "pages": dict(pages),
+        "table_pages": table_pages,
+    })
+    print(f"📄 Parsing {file_path}: {page_count} pages in {len(plan)} ranges")
+
+    def submit(page_range, strategy, infer_tables):
+        return asyncio.ensure_future(run_in_parse_pool(
+            partition_file, file_path,
+            None if page_range == (0, page_count) else page_range,
+            strategy, infer_tables
+        ))
+
+    remaining = iter(plan)
+    in_flight = deque(submit(*step) for step in islice(remaining, get_parse_pool_size()))
+    try:
+        while in_flight:
+            part = await in_flight.popleft()
+            next_step = next(remaining, None)
+            if next_step is not None:
+                in_flight.append(submit(*next_step))
+            for element in part:
+                yield element
+            del part
+    finally:
+        for future in in_flight:
+            future.cancel()
+    stats["parse_seconds"] = round(time.perf_counter() - started, 3)
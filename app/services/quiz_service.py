@@ -0,0 +1,113 @@
+import json
+import re
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.model.chat_message import ChatMessage
+from app.model.quiz_attempt import QuizAttempt
+
+OPTION_LETTERS = "ABCDEFGH"
+
+# Leading option labels the model sometimes puts in the option text, e.g. "A) ", "b. ", "(C) "
+OPTION_LABEL_PATTERN = re.compile(r"^\(?[a-h][\).:]\s+", re.IGNORECASE)
+
+
+def normalize_option(text: str) -> str:
+    text = OPTION_LABEL_PATTERN.sub("", text.strip())
+    return " ".join(text.split()).casefold()
+
+
+def parse_quiz(content: str) -> List[dict]:
+    """Parse a stored assistant message into its quiz items. Raises ValueError if it is not a quiz."""
+    try:
+        items = json.loads(content)
+    except json.JSONDecodeError:
+        raise ValueError("Message is not a quiz")
+    
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list) or not items:
+        raise ValueError("Message is not a quiz")
+    
+    for item in items:
+        if not isinstance(item, dict) or item.get("type") != "quiz" or not item.get("options") or not item.get("correctAnswer"):
+            raise ValueError("Message is not a multiple-choice quiz")
+    
+    return items
+
+
+def resolve_selection(selected: Optional[str], options: List[str]) -> Optional[str]:
+    """Map a submitted answer (option text or letter) onto one of the quiz options."""
+    if selected is None or not selected.strip():
+        return None
+    
+    normalized = normalize_option(selected)
+    for option in options:
+        if normalize_option(option) == normalized:
+            return option
+    
+    letter = selected.strip().rstrip(").:").lstrip("(").upper()
+    if len(letter) == 1 and letter in OPTION_LETTERS[:len(options)]:
+        return options[OPTION_LETTERS.index(letter)]
+    
+    return selected
+
+
+async def get_quiz_message(db: AsyncSession, workspace_id: int, message_id: int) -> Optional[ChatMessage]:
+    return await db.scalar(select(ChatMessage).where(
+        ChatMessage.id == message_id,
+        ChatMessage.workspace_id == workspace_id,
+        ChatMessage.role == "assistant"
+    ))
+
+
+async def grade_quiz(
+    db: AsyncSession,
+    workspace_id: int,
+    user_id: int,
+    message_id: int,
+    answers: List[Optional[str]]
+) -> Optional[tuple[QuizAttempt, List[dict]]]:
+    """
+    Score submitted choices against the stored quiz and persist the attempt.
+    Grading is a local comparison against each item's correctAnswer, no model calls.
+    Returns None if the message does not exist in the workspace.
+    """
+    message = await get_quiz_message(db, workspace_id, message_id)
+    if not message:
+        return None
+    
+    items = parse_quiz(message.content)
+    if len(answers) != len(items):
+        raise ValueError(f"Expected {len(items)} answers, got {len(answers)}")
+    
+    results = []
+    for idx, (item, submitted) in enumerate(zip(items, answers), 1):
+        selected = resolve_selection(submitted, item["options"])
+        correct_answer = resolve_selection(item["correctAnswer"], item["options"])
+        is_correct = selected is not None and normalize_option(selected) == normalize_option(correct_answer)
+        results.append({
+            "index": idx,
+            "question": item.get("question", ""),
+            "selected": selected,
+            "correct_answer": correct_answer,
+            "is_correct": is_correct,
+            "explanation": item.get("explanation")
+        })
+    
+    correct = sum(1 for result in results if result["is_correct"])
+    attempt = QuizAttempt(
+        workspace_id=workspace_id,
+        message_id=message_id,
+        user_id=user_id,
+        correct_count=correct,
+        total=len(items),
+        score=round(correct / len(items) * 100, 2),
+        answers=json.dumps(answers, ensure_ascii=False)
+    )
+    db.add(attempt)
+    await db.commit()
+    await db.refresh(attempt)
+    print(f"📝 Graded quiz {message_id}: {correct}/{len(items)}")
+    
+    return attempt, results
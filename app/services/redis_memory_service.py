@@ -1,6 +1,16 @@
-from typing import Optional, List, Dict, Any
-from langgraph.checkpoint.base import CheckpointTuple, empty_checkpoint
-from app.graph.main_graph.graph import checkpointer
+import asyncio
+import time
+from typing import Optional, Dict, Any
+from redis.asyncio import Redis
+from langgraph.checkpoint.base import CheckpointTuple
+from app.graph.main_graph.graph import async_checkpointer
+from app.settings import settings
+
+# Threads with a turn since the last compaction, scored by last activity time
+ACTIVE_THREADS_KEY = "checkpoint_active_threads"
+
+redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
 
 def get_thread_id(workspace_id: int, user_id: int) -> str:
     """Generate a unique thread ID for a workspace and user combination."""
@@ -17,59 +27,73 @@ def get_conversation_config(workspace_id: int, user_id: int) -> dict:
         }
     }
 
-def clear_conversation_memory(workspace_id: int, user_id: int) -> bool:
+async def clear_conversation_memory(workspace_id: int, user_id: int) -> bool:
     """
     Clear all conversation memory for a specific workspace and user.
-    This removes all checkpoints from Redis for the given thread.
+    The saver deletes every checkpoint and pending write of the thread with its bookkeeping keys.
     """
     try:
-        config = get_conversation_config(workspace_id, user_id)
-        if checkpointer:
-            # Put an empty checkpoint to clear the conversation history
-            checkpointer.put(config, empty_checkpoint(), {}, {})
-            return True
-        return False
+        thread_id = get_thread_id(workspace_id, user_id)
+        await async_checkpointer.adelete_thread(thread_id)
+        await redis_client.zrem(ACTIVE_THREADS_KEY, thread_id)
+        return True
     except Exception as e:
         print(f"❌ Error clearing conversation memory: {e}")
         return False
 
 
-def get_conversation_state(workspace_id: int, user_id: int) -> Optional[CheckpointTuple]:
+async def get_conversation_state(workspace_id: int, user_id: int) -> Optional[CheckpointTuple]:
     """
     Retrieve the current conversation state from Redis.
     Returns the latest checkpoint for the conversation thread.
     """
     try:
         config = get_conversation_config(workspace_id, user_id)
-        if checkpointer:
-            return checkpointer.get_tuple(config)
-        return None
+        return await async_checkpointer.aget_tuple(config)
     except Exception as e:
         print(f"❌ Error getting conversation state: {e}")
         return None
 
 
-def list_conversation_checkpoints(workspace_id: int, user_id: int) -> List[CheckpointTuple]:
+async def list_conversation_checkpoints(
+    workspace_id: int,
+    user_id: int,
+    limit: int = 20,
+    before: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    List all checkpoints for a conversation thread.
-    Useful for debugging and viewing conversation history.
+    List one page of checkpoints for a conversation thread, newest first.
+    Pass the returned next_before as before to get the following page.
     """
     try:
         config = get_conversation_config(workspace_id, user_id)
-        if checkpointer:
-            return list(checkpointer.list(config))
-        return []
+        before_config = {"configurable": {"checkpoint_id": before}} if before else None
+        checkpoints = []
+        async for checkpoint_tuple in async_checkpointer.alist(config, before=before_config, limit=limit):
+            metadata = checkpoint_tuple.metadata or {}
+            checkpoints.append({
+                "checkpoint_id": checkpoint_tuple.checkpoint.get("id"),
+                "ts": checkpoint_tuple.checkpoint.get("ts"),
+                "step": metadata.get("step"),
+                "source": metadata.get("source"),
+                "message_count": len(checkpoint_tuple.checkpoint.get("channel_values", {}).get("messages", []))
+            })
+        return {
+            "thread_id": get_thread_id(workspace_id, user_id),
+            "checkpoints": checkpoints,
+            "next_before": checkpoints[-1]["checkpoint_id"] if len(checkpoints) == limit else None
+        }
     except Exception as e:
         print(f"❌ Error listing conversation checkpoints: {e}")
-        return []
+        return {"thread_id": get_thread_id(workspace_id, user_id), "checkpoints": [], "next_before": None}
 
 
-def get_conversation_metadata(workspace_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+async def get_conversation_metadata(workspace_id: int, user_id: int) -> Optional[Dict[str, Any]]:
     """
     Get metadata about the conversation state including thread ID and checkpoint info.
     """
     try:
-        checkpoint_tuple = get_conversation_state(workspace_id, user_id)
+        checkpoint_tuple = await get_conversation_state(workspace_id, user_id)
         if checkpoint_tuple and checkpoint_tuple.checkpoint:
             return {
                 "thread_id": get_thread_id(workspace_id, user_id),
@@ -84,3 +108,49 @@ def get_conversation_metadata(workspace_id: int, user_id: int) -> Optional[Dict[
     except Exception as e:
         print(f"❌ Error getting conversation metadata: {e}")
         return None
+
+
+async def mark_thread_active(workspace_id: int, user_id: int) -> None:
+    """Queue the thread for the next compaction pass."""
+    try:
+        await redis_client.zadd(ACTIVE_THREADS_KEY, {get_thread_id(workspace_id, user_id): time.time()})
+    except Exception as e:
+        print(f"⚠️ Could not mark thread active: {e}")
+
+
+async def compact_active_threads(since: float) -> int:
+    """
+    Prune threads that had turns since the given time down to their newest CHECKPOINT_KEEP_LAST
+    checkpoints per namespace, and forget threads idle past the TTL.
+    The saver finds each thread's checkpoints through its search index and deletes them together
+    with their writes, key registry entries and latest pointers. Returns the number of threads pruned.
+    """
+    thread_ids = await redis_client.zrangebyscore(ACTIVE_THREADS_KEY, since, "+inf")
+    pruned = 0
+    for thread_id in thread_ids:
+        try:
+            await async_checkpointer.aprune([thread_id], keep_last=settings.CHECKPOINT_KEEP_LAST)
+            pruned += 1
+        except Exception as e:
+            print(f"⚠️ Could not compact checkpoints for {thread_id}: {e}")
+
+    # Idle threads' keys expire through the checkpointer TTL; drop them from the active set too
+    if settings.CHECKPOINT_TTL_MINUTES:
+        await redis_client.zremrangebyscore(ACTIVE_THREADS_KEY, "-inf", time.time() - settings.CHECKPOINT_TTL_MINUTES * 60)
+
+    if thread_ids:
+        print(f"🧹 Compacted checkpoints of {pruned}/{len(thread_ids)} active threads")
+    return pruned
+
+
+async def run_checkpoint_compactor() -> None:
+    """Background task started in the app lifespan; compacts recently active threads on an interval."""
+    last_run = 0.0
+    while True:
+        await asyncio.sleep(settings.CHECKPOINT_COMPACT_INTERVAL_SECONDS)
+        started = time.time()
+        try:
+            await compact_active_threads(last_run)
+            last_run = started
+        except Exception as e:
+            print(f"❌ Checkpoint compaction failed: {e}")
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import uuid
+from typing import Any, Dict, List, Optional
+from redis.asyncio import Redis
+from app.graph.question_generation_graph.chain.reference_answer import reference_answer_chain, ReferenceAnswers
+from app.settings import settings
+
+REFERENCE_KEY_PREFIX = "reference_answers"
+
+redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Keep references to running tasks so they are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_reference_key(reference_id: str) -> str:
+    return f"{REFERENCE_KEY_PREFIX}:{reference_id}"
+
+
+def get_document_texts(documents: List) -> List[str]:
+    return [doc.page_content if hasattr(doc, "page_content") else str(doc) for doc in documents]
+
+
+async def compute_reference_answers(
+    reference_id: str,
+    questions: str,
+    documents: List,
+    subject: str
+) -> None:
+    """
+    Generate reference answers for a set of open-ended questions and store them,
+    together with the chunks they were generated from, under the reference id.
+    """
+    try:
+        document_texts = get_document_texts(documents)
+        result: ReferenceAnswers = await reference_answer_chain.ainvoke({
+            "questions": questions,
+            "context": "\n\n".join(document_texts),
+            "subject": subject
+        })
+        payload = {
+            "answers": [answer.answer for answer in result.answers],
+            "documents": document_texts
+        }
+        await redis_client.set(
+            get_reference_key(reference_id),
+            json.dumps(payload, ensure_ascii=False),
+            ex=settings.REFERENCE_ANSWER_TTL_SECONDS
+        )
+        print(f"✅ Stored {len(result.answers)} reference answers ({reference_id})")
+    except Exception as e:
+        print(f"❌ Error computing reference answers ({reference_id}): {e}")
+
+
+def schedule_reference_answers(questions: str, documents: List, subject: str) -> str:
+    """
+    Start computing reference answers in the background and return the id they will be stored under.
+    The caller attaches the id to the AI message carrying the questions.
+    """
+    reference_id = uuid.uuid4().hex
+    task = asyncio.create_task(compute_reference_answers(reference_id, questions, documents, subject))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return reference_id
+
+
+async def get_reference_answers(reference_id: str) -> Optional[Dict[str, Any]]:
+    """Return the stored answers and supporting chunks, or None if missing or not ready yet."""
+    try:
+        raw = await redis_client.get(get_reference_key(reference_id))
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        print(f"❌ Error loading reference answers ({reference_id}): {e}")
+        return None
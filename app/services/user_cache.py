@@ -0,0 +1,108 @@
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy import event
+from app.model.user import User
+from app.settings import settings
+
+USER_CACHE_KEY_PREFIX = "user_cache"
+
+# Columns copied into the cache; enough to rebuild the detached User that routes read.
+# The password hash is deliberately left out.
+CACHED_USER_FIELDS = ("id", "email", "full_name", "is_active")
+
+redis_client = AsyncRedis.from_url(settings.REDIS_URL, decode_responses=True) if settings.USER_CACHE_REDIS else None
+
+# ORM events fire synchronously during flush, so invalidation uses a sync client
+sync_redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True) if settings.USER_CACHE_REDIS else None
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries expire after a fixed TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+local_cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+def get_user_cache_key(user_id: int) -> str:
+    return f"{USER_CACHE_KEY_PREFIX}:{user_id}"
+
+
+def to_cached_user(user: User) -> dict:
+    return {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+
+
+async def get_cached_user(user_id: int) -> Optional[User]:
+    """
+    Return a detached User for the id from the in-process cache, then Redis if enabled.
+    Other workers' in-process entries are only bounded by the TTL, so keep it short.
+    """
+    data = local_cache.get(user_id)
+    if data is None and redis_client is not None:
+        try:
+            raw = await redis_client.get(get_user_cache_key(user_id))
+            if raw:
+                data = json.loads(raw)
+                local_cache.set(user_id, data)
+        except Exception as e:
+            print(f"⚠️ User cache read failed: {e}")
+    return User(**data) if data else None
+
+
+async def cache_user(user: User) -> None:
+    data = to_cached_user(user)
+    local_cache.set(user.id, data)
+    if redis_client is not None:
+        try:
+            await redis_client.set(get_user_cache_key(user.id), json.dumps(data), ex=settings.USER_CACHE_TTL_SECONDS)
+        except Exception as e:
+            print(f"⚠️ User cache write failed: {e}")
+
+
+def invalidate_user(user_id: int) -> None:
+    local_cache.delete(user_id)
+    if sync_redis_client is not None:
+        try:
+            sync_redis_client.delete(get_user_cache_key(user_id))
+        except Exception as e:
+            print(f"⚠️ User cache invalidation failed: {e}")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_user_on_change(mapper, connection, target: User) -> None:
+    """Drop the cached copy whenever the ORM updates (e.g. deactivates) or deletes a user."""
+    invalidate_user(target.id)
@@ -1,44 +1,42 @@
 from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.model.workspace import Workspace
 from app.model.chat_message import ChatMessage
 from app.model.document import Document
 
-def get_workspace_by_id(db: Session, workspace_id: int, user_id: int) -> Optional[Workspace]:
-    return db.query(Workspace).filter(
+async def get_workspace_by_id(db: AsyncSession, workspace_id: int, user_id: int) -> Optional[Workspace]:
+    return await db.scalar(select(Workspace).where(
         Workspace.id == workspace_id,
         Workspace.user_id == user_id
-    ).first()
+    ))
 
-def get_workspaces_by_user(
-    db: Session, 
+async def get_workspaces_by_user(
+    db: AsyncSession, 
     user_id: int, 
     skip: int = 0, 
     limit: int = 100,
     search: Optional[str] = None
 ) -> tuple[list[Workspace], int]:
-    query = db.query(Workspace).filter(Workspace.user_id == user_id)
+    query = select(Workspace).where(Workspace.user_id == user_id)
     if search:
-        query = query.filter(Workspace.name.ilike(f"%{search}%"))
+        query = query.where(Workspace.name.ilike(f"%{search}%"))
     
-    total = query.count()
-    workspaces = query.offset(skip).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    workspaces = (await db.scalars(query.offset(skip).limit(limit))).all()
     
-    return workspaces, total
+    return list(workspaces), total
 
 
-def get_workspace_details(db: Session, workspace_id: int, user_id: int) -> Optional[dict]:
-    workspace = get_workspace_by_id(db, workspace_id, user_id)
-    if not workspace:
-        return None
-    message_count = db.query(func.count(ChatMessage.id)).filter(
+async def get_workspace_details(db: AsyncSession, workspace: Workspace) -> dict:
+    workspace_id = workspace.id
+    message_count = await db.scalar(select(func.count(ChatMessage.id)).where(
         ChatMessage.workspace_id == workspace_id
-    ).scalar() or 0
+    )) or 0
     
-    document_count = db.query(func.count(Document.id)).filter(
+    document_count = await db.scalar(select(func.count(Document.id)).where(
         Document.workspace_id == workspace_id
-    ).scalar() or 0
+    )) or 0
     
     return {
         "id": workspace.id,
@@ -49,55 +47,47 @@ def get_workspace_details(db: Session, workspace_id: int, user_id: int) -> Optio
     }
 
 
-def create_workspace(db: Session, name: str, user_id: int, subject: Optional[str] = None) -> Workspace:
+async def create_workspace(db: AsyncSession, name: str, user_id: int, subject: Optional[str] = None) -> Workspace:
     workspace = Workspace(
         name=name,
         subject=subject,
         user_id=user_id
     )
     db.add(workspace)
-    db.commit()
-    db.refresh(workspace)
+    await db.commit()
+    await db.refresh(workspace)
     return workspace
 
-def update_workspace(
-    db: Session, 
-    workspace_id: int, 
-    user_id: int, 
+async def update_workspace(
+    db: AsyncSession, 
+    workspace: Workspace, 
     name: Optional[str] = None,
     subject: Optional[str] = None
-) -> Optional[Workspace]:
-    workspace = get_workspace_by_id(db, workspace_id, user_id)
-    if not workspace:
-        return None
+) -> Workspace:
     if name is not None:
         workspace.name = name
     
     if subject is not None:
         workspace.subject = subject
     
-    db.commit()
-    db.refresh(workspace)
+    await db.commit()
+    await db.refresh(workspace)
     return workspace
 
 
-def delete_workspace(db: Session, workspace_id: int, user_id: int) -> bool:
-    workspace = get_workspace_by_id(db, workspace_id, user_id)
-    if not workspace:
-        return False
+async def delete_workspace(db: AsyncSession, workspace: Workspace) -> None:
     try:
         from app.services.redis_memory_service import clear_conversation_memory
-        clear_conversation_memory(workspace_id, user_id)
+        await clear_conversation_memory(workspace.id, workspace.user_id)
     except Exception as e:
-        print(f"Warning: Could not clear Redis memory for workspace {workspace_id}: {e}")
+        print(f"Warning: Could not clear Redis memory for workspace {workspace.id}: {e}")
     
-    db.delete(workspace)
-    db.commit()
-    return True
+    await db.delete(workspace)
+    await db.commit()
 
 
-def check_workspace_exists(db: Session, workspace_id: int, user_id: int) -> bool:
-    return db.query(Workspace).filter(
+async def check_workspace_exists(db: AsyncSession, workspace_id: int, user_id: int) -> bool:
+    return await db.scalar(select(func.count(Workspace.id)).where(
         Workspace.id == workspace_id,
         Workspace.user_id == user_id
-    ).count() > 0
+    )) > 0
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -11,11 +12,16 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
     
     REDIS_URL: str
     
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
     
     GOOGLE_API_KEY: str
     TAVILY_API_KEY: str | None = None
@@ -27,6 +33,60 @@ class Settings(BaseSettings):
     LANGSMITH_API_KEY: str | None = None
     LANGSMITH_PROJECT: str = "deep-learner-ai"
     
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_REDIS: bool = False
+    
+    CRAG_GRADING_MODE: Literal["batch", "per_document"] = "batch"
+    CRAG_BATCH_MAX_CHARS: int = 30000
+    CRAG_MAX_CONCURRENCY: int = 5
+    GRADING_STRATEGY: Literal["sequential", "parallel", "combined"] = "parallel"
+    
+    MAX_REGENERATIONS: int = 2
+    MAX_TOOL_CALLS: int = 1
+    
+    EVALUATION_MAX_CONCURRENCY: int = 3
+    REFERENCE_ANSWER_TTL_SECONDS: int = 86400
+    
+    CHECKPOINT_TTL_MINUTES: int | None = 10080
+    CHECKPOINT_KEEP_LAST: int = 5
+    CHECKPOINT_COMPACT_INTERVAL_SECONDS: int = 300
+    CHECKPOINT_COMPRESSION: bool = True
+    CHECKPOINT_COMPRESSION_MIN_BYTES: int = 1024
+    CHECKPOINT_COMPRESSION_LEVEL: int = 3
+    
+    MEMORY_KEEP_TURNS: int = 4
+    MEMORY_SUMMARY_TRIGGER_TOKENS: int = 4000
+    
+    ROUTER_LOCAL_ENABLED: bool = True
+    ROUTER_LOCAL_CONFIDENCE: float = 0.8
+    ROUTER_KNN_NEIGHBOURS: int = 5
+    ROUTER_KNN_MIN_SIMILARITY: float = 0.5
+    ROUTER_DECISION_LOG: str | None = "storage/router_decisions.jsonl"
+    
+    INGESTION_QUEUE_BACKEND: Literal["redis", "local"] = "redis"
+    INGESTION_WORKER_CONCURRENCY: int = 2
+    INGESTION_MAX_RETRIES: int = 3
+    INGESTION_RETRY_BACKOFF_SECONDS: int = 10
+    INGESTION_JOB_LEASE_SECONDS: int = 1800
+    INGESTION_UPSERT_BATCH_SIZE: int = 32
+    INGESTION_UPSERT_CONCURRENCY: int = 2
+    EMBEDDING_BATCH_SIZE: int = 100
+    EMBEDDING_CONCURRENCY: int = 4
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_BACKOFF_SECONDS: float = 2.0
+    
+    PARSE_POOL_WORKERS: int | None = None
+    PARSE_PAGES_PER_TASK: int = 20
+    PARSE_INFER_TABLES: bool = True
+    PARSE_STRATEGY: Literal["auto", "fast", "hi_res"] = "auto"
+    PARSE_MIN_TEXT_CHARS: int = 200
+    PARSE_IMAGE_HEAVY_COUNT: int = 3
+    
+    CHUNK_MAX_TOKENS: int = 512
+    CHUNK_OVERLAP_TOKENS: int = 32
+    CHUNK_MAX_TABLE_TOKENS: int = 2000
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -0,0 +1,67 @@
+"""
+Ingestion worker: consumes document ingestion jobs from the queue.
+
+Run with `python -m app.worker`; scale out by starting more worker processes.
+"""
+import asyncio
+from typing import Optional
+
+from app.services.document_service import ingest_document
+from app.services.ingestion_queue import get_ingestion_queue
+from app.services.parse_pool import get_parse_pool, shutdown_parse_pool
+from app.settings import settings
+
+# How often delayed retries and expired leases are moved back to the queue
+PROMOTE_INTERVAL_SECONDS = 5
+
+
+async def consume(worker_id: int) -> None:
+    queue = get_ingestion_queue()
+    while True:
+        job = await queue.dequeue(timeout=5)
+        if job is None:
+            continue
+        print(f"⚙️ Worker {worker_id} ingesting document {job.document_id} (attempt {job.attempt + 1})")
+        try:
+            await ingest_document(job)
+        except Exception as e:
+            # ingest_document handles its own retries; this only guards the loop
+            print(f"❌ Worker {worker_id} crashed on document {job.document_id}: {e}")
+        finally:
+            await queue.ack(job)
+
+
+async def promote_due_jobs() -> None:
+    queue = get_ingestion_queue()
+    while True:
+        try:
+            await queue.promote_due()
+        except Exception as e:
+            print(f"⚠️ Could not promote delayed ingestion jobs: {e}")
+        await asyncio.sleep(PROMOTE_INTERVAL_SECONDS)
+
+
+def start_workers(concurrency: Optional[int] = None) -> list[asyncio.Task]:
+    """Start the consumer tasks and the retry promoter on the running event loop."""
+    concurrency = concurrency or settings.INGESTION_WORKER_CONCURRENCY
+    tasks = [asyncio.create_task(consume(worker_id)) for worker_id in range(concurrency)]
+    tasks.append(asyncio.create_task(promote_due_jobs()))
+    return tasks
+
+
+async def run_worker() -> None:
+    print(f"🚀 Ingestion worker started ({settings.INGESTION_QUEUE_BACKEND} queue, concurrency {settings.INGESTION_WORKER_CONCURRENCY})")
+    # Start the parse processes now so their models are loaded before the first job arrives
+    get_parse_pool()
+    tasks = start_workers()
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await get_ingestion_queue().close()
+        shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -449,6 +449,10 @@ const QuizCard = ({ questions, workspaceId }: { questions: any[], workspaceId: s
   );
 };
 
+// Ingestion status polling after an upload: every 3s for up to 10 minutes
+const UPLOAD_POLL_INTERVAL_MS = 3000;
+const UPLOAD_POLL_MAX_ATTEMPTS = 200;
+
 interface ExtendedMessage extends ChatMessage {
   questions?: any[];
   response_type?: string;
@@ -463,6 +467,7 @@ export default function WorkspacePage({ params }: { params: Promise<{ id: string
   const [uploading, setUploading] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
+  const uploadPollRef = useRef<AbortController | null>(null);
   
   // Unwrap params Promise
   const { id } = use(params);
@@ -482,6 +487,11 @@ export default function WorkspacePage({ params }: { params: Promise<{ id: string
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   }, [messages]);
 
+  // Stop polling an upload's ingestion status when leaving the page
+  useEffect(() => {
+    return () => uploadPollRef.current?.abort();
+  }, []);
+
   const loadWorkspace = async () => {
     try {
       const workspaces = await api.getWorkspaces();
@@ -646,17 +656,43 @@ export default function WorkspacePage({ params }: { params: Promise<{ id: string
     const file = e.target.files?.[0];
     if (!file) return;
 
+    uploadPollRef.current?.abort();
+    const controller = new AbortController();
+    uploadPollRef.current = controller;
+
     setUploading(true);
     try {
-      await api.uploadDocument(parseInt(id), file);
+      const upload = await api.uploadDocument(parseInt(id), file);
+      // Ingestion runs in a background worker; poll until it finishes, gives up, or the page unmounts
+      let document = upload.document;
+      let attempts = 0;
+      while (document.status === 'PENDING' || document.status === 'PROCESSING') {
+        if (attempts >= UPLOAD_POLL_MAX_ATTEMPTS) {
+          alert('Document is still processing. It will appear in the documents list when ready.');
+          return;
+        }
+        await new Promise(resolve => setTimeout(resolve, UPLOAD_POLL_INTERVAL_MS));
+        if (controller.signal.aborted) return;
+        document = await api.getDocument(parseInt(id), document.id);
+        attempts++;
+      }
+      if (document.status === 'FAILED') {
+        throw new Error('Document ingestion failed');
+      }
       alert('Document uploaded successfully!');
     } catch (error) {
+      if (controller.signal.aborted) return;
       console.error('Failed to upload document:', error);
       alert('Failed to upload document');
     } finally {
-      setUploading(false);
-      if (fileInputRef.current) {
-        fileInputRef.current.value = '';
+      if (uploadPollRef.current === controller) {
+        uploadPollRef.current = null;
+      }
+      if (!controller.signal.aborted) {
+        setUploading(false);
+        if (fileInputRef.current) {
+          fileInputRef.current.value = '';
+        }
       }
     }
   };
@@ -33,6 +33,8 @@ interface Question {
   correctAnswer: string;
 }
 
+type ChatMode = 'rag' | 'chat' | 'quiz' | 'flashcard' | 'open_questions' | 'evaluate';
+
 interface ChatResponse {
   workspace_id: number;
   user_message: ChatMessage;
@@ -167,6 +169,10 @@ class ApiClient {
     return response.json();
   }
 
+  async getDocument(workspaceId: number, documentId: number): Promise<any> {
+    return this.request(`/workspaces/${workspaceId}/documents/${documentId}`);
+  }
+
   async getDocuments(workspaceId: number): Promise<any[]> {
     const response: any = await this.request(`/workspaces/${workspaceId}/documents`);
     return response.documents || [];
@@ -177,7 +183,8 @@ class ApiClient {
     workspaceId: number,
     message: string,
     webSearch: boolean = false,
-    crag: boolean = true
+    crag: boolean = true,
+    mode?: ChatMode
   ): Promise<ChatResponse> {
     return this.request('/chat/', {
       method: 'POST',
@@ -186,6 +193,7 @@ class ApiClient {
         message,
         web_search: webSearch,
         crag,
+        mode,
       }),
     });
   }
@@ -195,7 +203,8 @@ class ApiClient {
     const response: any = await this.request(`/chat/history/${workspaceId}?limit=${limit}`);
     console.log('API: Chat history response:', response);
     console.log('API: Extracted messages:', response.messages || []);
-    return response.messages || [];
+    // The API returns the latest messages newest first; the chat renders oldest first
+    return (response.messages || []).slice().reverse();
   }
 
   async clearChatHistory(workspaceId: number): Promise<void> {
@@ -206,4 +215,4 @@ class ApiClient {
 }
 
 export const api = new ApiClient();
-export type { User, Workspace, ChatMessage, ChatResponse, Question };
+export type { User, Workspace, ChatMessage, ChatResponse, ChatMode, Question };
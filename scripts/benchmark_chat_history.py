@@ -0,0 +1,111 @@
+"""
+Measure chat history latency on a large workspace and show the query plans.
+
+Seeds a throwaway workspace with 100k messages, then times the newest page, a keyset page deep
+in the history (before_id), a forward page (after_id) and the last-N context read. The same
+deep page fetched with OFFSET, as before keyset pagination, is timed for comparison. Each query's
+plan is printed (EXPLAIN ANALYZE on PostgreSQL), with a check that the (workspace_id, id) index
+serves it without a separate sort.
+
+    python -m scripts.benchmark_chat_history
+    python -m scripts.benchmark_chat_history --messages 20000 --repeat 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert, select, text
+from app.database import SessionLocal, engine
+from app.model.chat_message import ChatMessage
+from scripts.benchmark_data import create_tables, create_benchmark_user, create_benchmark_workspace, drop_benchmark_user
+from app.services.chat_service import get_chat_history, get_latest_messages
+
+INDEX_NAME = "ix_chat_messages_workspace_id_id"
+PAGE_SIZE = 150
+INSERT_BATCH_SIZE = 5000
+
+
+async def seed_messages(db, workspace_id: int, count: int) -> list:
+    for start in range(0, count, INSERT_BATCH_SIZE):
+        await db.execute(insert(ChatMessage), [
+            {"workspace_id": workspace_id, "role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i} " + "lorem ipsum " * 20}
+            for i in range(start, min(start + INSERT_BATCH_SIZE, count))
+        ])
+    await db.commit()
+    if engine.dialect.name == "postgresql":
+        await db.execute(text("ANALYZE chat_messages"))
+    return list((await db.scalars(select(ChatMessage.id).where(ChatMessage.workspace_id == workspace_id).order_by(ChatMessage.id))).all())
+
+
+async def time_query(name: str, run: Callable[[], Awaitable], repeat: int) -> None:
+    await run()  # warm up
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        latencies.append((time.perf_counter() - started) * 1000)
+    p95 = sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"{name:<32} mean {statistics.mean(latencies):7.2f} ms, p95 {p95:7.2f} ms")
+
+
+async def explain(db, name: str, statement) -> None:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "postgresql":
+        rows = (await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))).all()
+        plan = "\n".join(row[0] for row in rows)
+    else:
+        rows = (await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+        plan = "\n".join(str(row[-1]) for row in rows)
+    # SQLite's single-column index carries the rowid (id), so it serves the same order there
+    uses_index = INDEX_NAME in plan or (engine.dialect.name == "sqlite" and "USING INDEX" in plan)
+    sorts = "Sort" in plan or "TEMP B-TREE" in plan
+    print(f"\n--- {name}: {'index scan' if uses_index else 'NO INDEX'}, {'extra sort step' if sorts else 'no sort step'}\n{plan}")
+
+
+async def measure(message_count: int, repeat: int) -> None:
+    await create_tables()
+    async with SessionLocal() as db:
+        user = await create_benchmark_user(db)
+        try:
+            workspace = await create_benchmark_workspace(db, user)
+            started = time.perf_counter()
+            ids = await seed_messages(db, workspace.id, message_count)
+            print(f"📊 Seeded {len(ids)} messages in {time.perf_counter() - started:.1f}s")
+
+            deep_id = ids[PAGE_SIZE * 2]
+            early_id = ids[len(ids) // 2]
+            deep_offset = len(ids) - PAGE_SIZE * 3
+
+            await time_query("newest page", lambda: get_chat_history(db, workspace, limit=PAGE_SIZE), repeat)
+            await time_query("keyset page near the oldest", lambda: get_chat_history(db, workspace, limit=PAGE_SIZE, before_id=deep_id), repeat)
+            await time_query("after_id page mid-history", lambda: get_chat_history(db, workspace, limit=PAGE_SIZE, after_id=early_id), repeat)
+            await time_query("last-N context read", lambda: get_latest_messages(db, workspace.id, limit=PAGE_SIZE), repeat)
+
+            offset_page = (select(ChatMessage).where(ChatMessage.workspace_id == workspace.id)
+                           .order_by(ChatMessage.id.desc()).offset(deep_offset).limit(PAGE_SIZE))
+            await time_query("OFFSET page near the oldest", lambda: db.scalars(offset_page), repeat)
+
+            newest = select(ChatMessage).where(ChatMessage.workspace_id == workspace.id).order_by(ChatMessage.id.desc()).limit(PAGE_SIZE)
+            await explain(db, "newest page", newest)
+            await explain(db, "keyset page near the oldest", newest.where(ChatMessage.id < deep_id))
+            await explain(db, "after_id page", select(ChatMessage).where(
+                ChatMessage.workspace_id == workspace.id, ChatMessage.id > early_id
+            ).order_by(ChatMessage.id.asc()).limit(PAGE_SIZE))
+            await explain(db, "OFFSET page", offset_page)
+        finally:
+            await drop_benchmark_user(db, user)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chat history pagination on a large workspace")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(measure(args.messages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
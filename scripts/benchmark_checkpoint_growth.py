@@ -0,0 +1,143 @@
+"""
+Measure checkpoint size and turn latency over a long conversation.
+
+A stand-in graph with the main graph's state schema and a canned reply node is driven
+through N turns against the checkpointer, in two modes:
+- incremental: only the new HumanMessage per turn, as prepare_chat_state sends when a checkpoint exists
+- replay: the last 150 stored messages plus the new one every turn, as before incremental mode
+
+Input payload and turn latency should stay flat in incremental mode, while replay grows the
+checkpoint by the whole replayed history every turn.
+
+It then checks the rebuild fallback: when two turns both rebuild a missing checkpoint from the
+database, or a checkpoint has been pruned, no message may end up in the checkpoint twice.
+
+    python -m scripts.benchmark_checkpoint_growth              # Redis, 200 turns
+    python -m scripts.benchmark_checkpoint_growth --memory     # in-memory saver
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, END
+from app.graph.main_graph.state import AgentState
+from app.model.chat_message import ChatMessage
+from app.services.chat_service import convert_to_langchain_messages
+
+HISTORY_LIMIT = 150
+REPORT_EVERY = 50
+
+
+async def canned_reply(state: AgentState) -> dict:
+    return {"messages": [AIMessage(content=f"Answer to: {state['messages'][-1].content} " + "lorem ipsum " * 40)]}
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(AgentState)
+    builder.add_node("chat_node", canned_reply)
+    builder.set_entry_point("chat_node")
+    builder.add_edge("chat_node", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def make_state(messages: list) -> AgentState:
+    return {"messages": messages, "workspace_id": "0", "web_search": False, "crag": False, "subject": "benchmark", "mode": "chat"}
+
+
+def stored_history(turns: int) -> List[ChatMessage]:
+    """Rows as the chat_messages table would hold them after the given number of turns."""
+    rows = []
+    for turn in range(turns):
+        rows.append(ChatMessage(id=turn * 2 + 1, workspace_id=0, role="user", content=f"Question {turn}"))
+        rows.append(ChatMessage(id=turn * 2 + 2, workspace_id=0, role="assistant", content=f"Answer {turn}"))
+    return rows
+
+
+async def checkpoint_bytes(checkpointer, config: dict) -> int:
+    checkpoint_tuple = await checkpointer.aget_tuple(config)
+    return len(checkpointer.serde.dumps_typed(checkpoint_tuple.checkpoint)[1]) if checkpoint_tuple else 0
+
+
+async def run_conversation(graph, checkpointer, thread_id: str, turns: int, replay: bool) -> None:
+    config = {"configurable": {"thread_id": thread_id}}
+    latencies = []
+    for turn in range(turns):
+        question = HumanMessage(content=f"Question {turn}")
+        if replay:
+            # Stored rows carry no graph ids before incremental mode, so replayed messages were appended again
+            history = [HumanMessage(content=m.content) if m.role == "user" else AIMessage(content=m.content)
+                       for m in stored_history(turn)[-HISTORY_LIMIT:]]
+            messages = history + [question]
+        else:
+            messages = [question]
+        started = time.perf_counter()
+        await graph.ainvoke(make_state(messages), config)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        if (turn + 1) % REPORT_EVERY == 0 or turn == 0:
+            size = await checkpoint_bytes(checkpointer, config)
+            recent = latencies[-REPORT_EVERY:]
+            print(
+                f"  turn {turn + 1:>4}: input {len(messages):>3} messages, checkpoint {size / 1024:>9.1f} KiB, "
+                f"turn latency mean {statistics.mean(recent):.1f} ms"
+            )
+
+
+async def check_rebuild(graph, checkpointer, thread_id: str, history_turns: int) -> None:
+    config = {"configurable": {"thread_id": thread_id}}
+    history = stored_history(history_turns)
+
+    # Two turns both found no checkpoint, so the second replays the history onto the one the first wrote
+    for i in range(2):
+        await graph.ainvoke(make_state(convert_to_langchain_messages(history) + [HumanMessage(content=f"New question {i}")]), config)
+    messages = (await graph.aget_state(config)).values["messages"]
+    expected = len(history) + 4
+    print(f"Overlapping rebuilds: {len(messages)} messages, expected {expected} - {'OK' if len(messages) == expected else 'DUPLICATED'}")
+
+    # A pruned checkpoint still holds the latest state, so the next turn must not rebuild
+    try:
+        await checkpointer.aprune([thread_id], strategy="keep_latest")
+    except NotImplementedError:
+        print("Checkpointer has no pruning; checking the unpruned checkpoint")
+    snapshot = await graph.aget_state(config)
+    rebuilds = not snapshot.values.get("messages")
+    print(f"Latest checkpoint holds {len(snapshot.values.get('messages', []))} messages - {'rebuild (would duplicate)' if rebuilds else 'incremental, OK'}")
+
+
+async def measure(turns: int, use_memory: bool) -> None:
+    if use_memory:
+        from langgraph.checkpoint.memory import InMemorySaver
+        checkpointer = InMemorySaver()
+    else:
+        from langgraph.checkpoint.redis import AsyncRedisSaver
+        from app.settings import settings
+        checkpointer = AsyncRedisSaver(redis_url=settings.REDIS_URL)
+        await checkpointer.asetup()
+
+    graph = build_graph(checkpointer)
+    run_id = uuid.uuid4().hex[:8]
+    thread_ids = {name: f"benchmark_{run_id}_{name}" for name in ("incremental", "replay", "rebuild")}
+    try:
+        for mode in ("incremental", "replay"):
+            print(f"📊 {mode}: {turns} turns")
+            await run_conversation(graph, checkpointer, thread_ids[mode], turns, replay=mode == "replay")
+        await check_rebuild(graph, checkpointer, thread_ids["rebuild"], history_turns=20)
+    finally:
+        for thread_id in thread_ids.values():
+            await checkpointer.adelete_thread(thread_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint growth over a long conversation")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--memory", action="store_true", help="Use InMemorySaver instead of Redis")
+    args = parser.parse_args()
+    asyncio.run(measure(args.turns, args.memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Measure what quiz and flashcard payloads cost in a Redis checkpoint.
+
+Writes a conversation whose assistant turns carry multiple-choice quizzes through three savers:
+- default: AsyncRedisSaver with its default serializer and quiz JSON indented (indent=2), as before
+- compact: AsyncRedisSaver with compact quiz JSON, as generated now
+- compressed: CompressingRedisSaver with compact quiz JSON, as the main graph runs now
+and reports bytes stored in Redis and aput/aget_tuple latency. With --no-redis it reports the
+size of the checkpoint JSON document each saver would write and the time to build and load it.
+
+    python -m scripts.benchmark_checkpoint_payload
+    python -m scripts.benchmark_checkpoint_payload --turns 50 --repeat 20
+    python -m scripts.benchmark_checkpoint_payload --no-redis
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from langgraph.checkpoint.redis import AsyncRedisSaver
+from app.graph.main_graph.checkpointer import CompressingRedisSaver
+from app.settings import settings
+
+
+def make_quiz(turn: int, questions: int = 10) -> list:
+    return [
+        {
+            "type": "multiple_choice",
+            "question": f"Turn {turn}, question {i}: which statement about the reading is correct?",
+            "options": [f"Option {letter} describing one possible answer in a sentence" for letter in "ABCD"],
+            "correctAnswer": "A",
+            "explanation": "The reading states this directly in the section on the topic. " * 2,
+        }
+        for i in range(questions)
+    ]
+
+
+def make_messages(turns: int, indent) -> list:
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(content=f"quiz me on section {turn}"))
+        messages.append(AIMessage(
+            content=json.dumps(make_quiz(turn), indent=indent, ensure_ascii=False),
+            additional_kwargs={"response_type": "quiz"}
+        ))
+    return messages
+
+
+async def stored_bytes(saver: AsyncRedisSaver, thread_id: str) -> int:
+    """Redis memory used by the thread's checkpoint documents."""
+    total = 0
+    async for key in saver._redis.scan_iter(match=f"checkpoint:{thread_id}:*", count=1000):
+        total += await saver._redis.memory_usage(key) or 0
+    return total
+
+
+def make_checkpoint(turns: int, indent) -> dict:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": make_messages(turns, indent)}
+    checkpoint["channel_versions"] = {"messages": 1}
+    return checkpoint
+
+
+def report(name: str, size: int, put_latencies: list, get_latencies: list, put_name: str, get_name: str) -> None:
+    print(
+        f"{name:>10}: {size / 1024:8.1f} KiB per checkpoint, "
+        f"{put_name} mean {statistics.mean(put_latencies):.2f} ms, {get_name} mean {statistics.mean(get_latencies):.2f} ms"
+    )
+
+
+async def measure_layout(saver: AsyncRedisSaver, name: str, turns: int, indent, repeat: int) -> None:
+    thread_id = f"benchmark_{uuid.uuid4().hex[:8]}_{name}"
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint = make_checkpoint(turns, indent)
+
+    put_latencies, get_latencies = [], []
+    try:
+        for step in range(repeat):
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            started = time.perf_counter()
+            config = await saver.aput(config, checkpoint, {"source": "loop", "step": step}, {"messages": step + 1})
+            put_latencies.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            loaded = await saver.aget_tuple(config)
+            get_latencies.append((time.perf_counter() - started) * 1000)
+            assert loaded.checkpoint["channel_values"]["messages"] == checkpoint["channel_values"]["messages"]
+
+        report(name, await stored_bytes(saver, thread_id) / repeat, put_latencies, get_latencies, "aput", "aget_tuple")
+    finally:
+        await saver.adelete_thread(thread_id)
+
+
+def measure_document(saver: AsyncRedisSaver, name: str, turns: int, indent, repeat: int) -> None:
+    """The checkpoint JSON document the saver would write, built and loaded without Redis."""
+    checkpoint = make_checkpoint(turns, indent)
+    saver._dump_checkpoint(checkpoint)  # warm up the serializer
+    dump_latencies, load_latencies = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        document = json.dumps(saver._dump_checkpoint(checkpoint))
+        dump_latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        loaded = saver._recursive_deserialize(json.loads(document)["channel_values"])
+        load_latencies.append((time.perf_counter() - started) * 1000)
+        assert loaded["messages"] == checkpoint["channel_values"]["messages"]
+    report(name, len(document.encode("utf-8")), dump_latencies, load_latencies, "dump", "load")
+
+
+def create_savers() -> list:
+    return [
+        ("default", AsyncRedisSaver(redis_url=settings.REDIS_URL), 2),
+        ("compact", AsyncRedisSaver(redis_url=settings.REDIS_URL), None),
+        ("compressed", CompressingRedisSaver(
+            redis_url=settings.REDIS_URL,
+            min_bytes=settings.CHECKPOINT_COMPRESSION_MIN_BYTES,
+            level=settings.CHECKPOINT_COMPRESSION_LEVEL
+        ), None),
+    ]
+
+
+async def measure(turns: int, repeat: int, use_redis: bool) -> None:
+    print(f"📊 {turns} quiz turns, {repeat} checkpoints per saver{'' if use_redis else ', without Redis'}")
+    for name, saver, indent in create_savers():
+        if not use_redis:
+            measure_document(saver, name, turns, indent, repeat)
+            continue
+        await saver.asetup()
+        await measure_layout(saver, name, turns, indent, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint bytes and latency against the default saver")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--no-redis", action="store_true", help="Measure the checkpoint documents in memory only")
+    args = parser.parse_args()
+    asyncio.run(measure(args.turns, args.repeat, not args.no_redis))
+
+
+if __name__ == "__main__":
+    main()
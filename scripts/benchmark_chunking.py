@@ -0,0 +1,153 @@
+"""
+Compare StructuredChunker with the splitter it replaced on a small labelled fixture set.
+
+The fixtures in scripts/data/chunking are short documents written as markdown: "#" lines become
+Title elements, "|" lines Table elements, other paragraphs NarrativeText, and every page gets a
+Footer, the way Unstructured returns a PDF. They are chunked two ways:
+- baseline: all element text joined into one document (the loader's old mode="single") and split
+  by RecursiveCharacterTextSplitter(chunk_size=3000, chunk_overlap=500)
+- structured: the elements fed to StructuredChunker at the configured sizes, as ingestion does now
+
+queries.jsonl labels each query with the passage that answers it. A chunk is relevant when it
+contains the whole passage, so the same labels hold for both chunkings. The chunks of all fixtures
+are pooled, like one workspace namespace, and ranked with BM25 as a stand-in for the embedding
+search. Reports chunk count, total tokens, passages kept whole, hit-rate at 1, 3 and k, MRR and the
+tokens the top k chunks put into the answer prompt.
+
+    python -m scripts.benchmark_chunking
+    python -m scripts.benchmark_chunking --k 10 --max-tokens 256
+"""
+import argparse
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.services.chunker import StructuredChunker, estimate_tokens
+
+FIXTURE_DIR = Path(__file__).parent / "data" / "chunking"
+PAGE_BREAK = "--- page break ---"
+TERM = re.compile(r"\w+")
+
+
+def load_elements(path: Path) -> List[dict]:
+    """Element dicts of one fixture, as the parse pool would yield them."""
+    elements: List[dict] = []
+    title = path.stem.replace("_", " ").title()
+    for page, page_text in enumerate(path.read_text(encoding="utf-8").split(PAGE_BREAK), start=1):
+        metadata = {"page_number": page}
+        for block in page_text.strip().split("\n\n"):
+            block = block.strip()
+            if block.startswith("#"):
+                elements.append({"type": "Title", "text": block.lstrip("#").strip(), "metadata": metadata})
+            elif block.startswith("|"):
+                elements.append({"type": "Table", "text": block, "metadata": metadata})
+            elif block:
+                elements.append({"type": "NarrativeText", "text": block, "metadata": metadata})
+        elements.append({"type": "Footer", "text": f"{title} - page {page}", "metadata": metadata})
+    return elements
+
+
+def load_queries(path: Path = FIXTURE_DIR / "queries.jsonl") -> List[dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_chunks(elements: List[dict]) -> List[str]:
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=3000,
+        chunk_overlap=500,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""],
+    )
+    return splitter.split_text("\n\n".join(element["text"] for element in elements))
+
+
+def structured_chunks(elements: List[dict], max_tokens: int = None) -> List[str]:
+    chunker = StructuredChunker(max_tokens=max_tokens)
+    chunks = [chunk for element in elements for chunk in chunker.add(element)]
+    return [chunk["text"] for chunk in chunks + chunker.finish()]
+
+
+class BM25:
+    """Okapi BM25 over a fixed list of texts."""
+
+    def __init__(self, texts: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.term_counts = [Counter(TERM.findall(text.lower())) for text in texts]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = sum(self.lengths) / len(self.lengths)
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        total = len(texts)
+        self.idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    def rank(self, query: str) -> List[int]:
+        terms = TERM.findall(query.lower())
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length)
+            scores.append(sum(
+                self.idf.get(term, 0.0) * counts[term] * (self.k1 + 1) / (counts[term] + norm)
+                for term in terms if term in counts
+            ))
+        return sorted(range(len(scores)), key=lambda i: -scores[i])
+
+
+def evaluate(name: str, chunks: List[str], queries: List[dict], k: int) -> Dict[str, float]:
+    index = BM25(chunks)
+    cutoffs = sorted({1, 3, k})
+    hits = {cutoff: 0 for cutoff in cutoffs}
+    reciprocal_ranks, context_tokens = 0.0, 0
+    kept_whole = 0
+    for query in queries:
+        relevant = {i for i, chunk in enumerate(chunks) if query["passage"] in chunk}
+        kept_whole += bool(relevant)
+        ranking = index.rank(query["query"])
+        context_tokens += sum(estimate_tokens(chunks[i]) for i in ranking[:k])
+        rank = next((position for position, i in enumerate(ranking, start=1) if i in relevant), None)
+        if rank is not None:
+            reciprocal_ranks += 1 / rank
+            for cutoff in cutoffs:
+                hits[cutoff] += rank <= cutoff
+
+    total_tokens = sum(estimate_tokens(chunk) for chunk in chunks)
+    results = {
+        "chunks": len(chunks),
+        "total_tokens": total_tokens,
+        "kept_whole": kept_whole / len(queries),
+        **{f"hit@{cutoff}": hits[cutoff] / len(queries) for cutoff in cutoffs},
+        "mrr": reciprocal_ranks / len(queries),
+        "context_tokens": context_tokens / len(queries),
+    }
+    print(
+        f"{name:>10}: {len(chunks):4d} chunks, {total_tokens:6d} tokens ({total_tokens / len(chunks):5.0f} per chunk), "
+        f"passages whole {results['kept_whole']:.0%}, "
+        + ", ".join(f"hit@{cutoff} {results[f'hit@{cutoff}']:.0%}" for cutoff in cutoffs)
+        + f", MRR {results['mrr']:.2f}, {results['context_tokens']:.0f} prompt tokens at k={k}"
+    )
+    return results
+
+
+def compare(k: int = 5, max_tokens: int = None) -> Dict[str, Dict[str, float]]:
+    fixtures = {path.stem: load_elements(path) for path in sorted(FIXTURE_DIR.glob("*.md"))}
+    queries = load_queries()
+    print(f"📊 {len(fixtures)} documents, {len(queries)} labelled queries")
+    return {
+        "baseline": evaluate("baseline", [c for elements in fixtures.values() for c in baseline_chunks(elements)], queries, k),
+        "structured": evaluate("structured", [c for elements in fixtures.values() for c in structured_chunks(elements, max_tokens)], queries, k),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare StructuredChunker with the old character splitter on labelled queries")
+    parser.add_argument("--k", type=int, default=5, help="Chunks retrieved per query; the RAG graph uses 5")
+    parser.add_argument("--max-tokens", type=int, default=None, help="StructuredChunker max_tokens; defaults to CHUNK_MAX_TOKENS")
+    args = parser.parse_args()
+    compare(args.k, args.max_tokens)
+
+
+if __name__ == "__main__":
+    main()
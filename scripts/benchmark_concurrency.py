@@ -0,0 +1,91 @@
+"""
+Measure how simultaneous chat turns share the event loop.
+
+Runs N turns through main_graph one after another, then all at once. With the async pipeline
+the concurrent run should take about as long as the slowest turn, not the sum of all turns,
+and the event loop should stay responsive meanwhile (max loop lag is what /health would wait).
+
+    python -m scripts.benchmark_concurrency               # 5 chat turns
+    python -m scripts.benchmark_concurrency -n 10 --mode rag --workspace-id 1
+
+Turns call the configured models, so this needs the same environment as the API.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+from langchain_core.messages import HumanMessage
+from app.graph.main_graph.graph import main_graph, async_checkpointer
+
+LOOP_PROBE_INTERVAL_SECONDS = 0.01
+
+
+async def run_turn(thread_id: str, question: str, mode: str, workspace_id: str) -> float:
+    state = {
+        "messages": [HumanMessage(content=question)],
+        "workspace_id": workspace_id,
+        "web_search": False,
+        "crag": False,
+        "subject": "general learning",
+        "mode": mode,
+    }
+    started = time.perf_counter()
+    await main_graph.ainvoke(state, {"configurable": {"thread_id": thread_id}})
+    return time.perf_counter() - started
+
+
+async def probe_loop_lag(lags: List[float]) -> None:
+    """Record how late a short sleep wakes up; a blocked loop shows up as a large lag."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL_SECONDS)
+        lags.append(time.perf_counter() - started - LOOP_PROBE_INTERVAL_SECONDS)
+
+
+async def measure(turns: int, question: str, mode: str, workspace_id: str) -> None:
+    await async_checkpointer.asetup()
+    run_id = uuid.uuid4().hex[:8]
+    thread_ids = [f"benchmark_{run_id}_{i}" for i in range(turns * 2)]
+    lags: List[float] = []
+    probe = asyncio.create_task(probe_loop_lag(lags))
+    try:
+        started = time.perf_counter()
+        sequential = [await run_turn(thread_ids[i], question, mode, workspace_id) for i in range(turns)]
+        sequential_wall = time.perf_counter() - started
+        sequential_lag = max(lags, default=0.0)
+
+        lags.clear()
+        started = time.perf_counter()
+        concurrent = await asyncio.gather(*(
+            run_turn(thread_ids[turns + i], question, mode, workspace_id) for i in range(turns)
+        ))
+        concurrent_wall = time.perf_counter() - started
+        concurrent_lag = max(lags, default=0.0)
+    finally:
+        probe.cancel()
+        for thread_id in thread_ids:
+            await async_checkpointer.adelete_thread(thread_id)
+
+    print(f"📊 {turns} '{mode}' turns")
+    print(f"Sequential: {sequential_wall:.2f}s wall, slowest turn {max(sequential):.2f}s, max loop lag {sequential_lag * 1000:.1f} ms")
+    print(
+        f"Concurrent: {concurrent_wall:.2f}s wall vs {sum(concurrent):.2f}s summed turn time "
+        f"(slowest turn {max(concurrent):.2f}s), max loop lag {concurrent_lag * 1000:.1f} ms"
+    )
+    print(f"Concurrent wall / slowest turn: {concurrent_wall / max(concurrent):.2f} (1.0 = fully overlapped)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent chat turns through the main graph")
+    parser.add_argument("-n", "--turns", type=int, default=5)
+    parser.add_argument("--mode", default="chat", help="Explicit mode, so routing does not vary between runs")
+    parser.add_argument("--question", default="Explain the difference between mitosis and meiosis in two sentences.")
+    parser.add_argument("--workspace-id", default="0")
+    args = parser.parse_args()
+    asyncio.run(measure(args.turns, args.question, args.mode, args.workspace_id))
+
+
+if __name__ == "__main__":
+    main()
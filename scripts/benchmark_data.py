@@ -0,0 +1,41 @@
+"""Throwaway users and workspaces for the benchmark and check scripts, removed again afterwards."""
+import uuid
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Base, engine, upgrade_schema
+from app.model import User, Workspace, ChatMessage, Document, QuizAttempt
+
+
+async def create_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+
+
+async def create_benchmark_user(db: AsyncSession, hashed_password: str = "!") -> User:
+    user = User(
+        email=f"benchmark_{uuid.uuid4().hex[:12]}@example.com",
+        full_name="Benchmark User",
+        hashed_password=hashed_password,
+        is_active=True
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def create_benchmark_workspace(db: AsyncSession, user: User) -> Workspace:
+    workspace = Workspace(name=f"benchmark_{uuid.uuid4().hex[:12]}", subject="benchmark", user_id=user.id)
+    db.add(workspace)
+    await db.commit()
+    return workspace
+
+
+async def drop_benchmark_user(db: AsyncSession, user: User) -> None:
+    """Delete the user with every workspace, message, document and quiz attempt it owns."""
+    workspace_ids = list((await db.scalars(select(Workspace.id).where(Workspace.user_id == user.id))).all())
+    for model in (QuizAttempt, ChatMessage, Document):
+        await db.execute(delete(model).where(model.workspace_id.in_(workspace_ids)))
+    await db.execute(delete(Workspace).where(Workspace.user_id == user.id))
+    await db.execute(delete(User).where(User.id == user.id))
+    await db.commit()
@@ -0,0 +1,131 @@
+"""
+Measure login latency under a burst of concurrent logins, and what the burst does to other requests.
+
+Fires N simultaneous POST /auth/login requests through the ASGI app for a throwaway user while a
+probe keeps requesting GET /workspaces/{id} with an already-cached token. Reports login p50/p99,
+probe p50/p99 and the worst event-loop lag, twice:
+- inline: bcrypt verification on the event loop, as before
+- executor: verification in the bounded password executor, as now
+
+With the executor the probe should stay near its idle latency while logins queue on the pool.
+
+    python -m scripts.benchmark_login_burst
+    python -m scripts.benchmark_login_burst --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+from app.database import SessionLocal, engine
+from app.main import app
+from app.services import auth_service
+from scripts.benchmark_data import create_tables, create_benchmark_user, create_benchmark_workspace, drop_benchmark_user
+from app.services.security import create_access_token, get_password_hash, pwd_context
+from app.settings import settings
+
+PASSWORD = "benchmark-password"
+LOOP_PROBE_INTERVAL_SECONDS = 0.01
+
+
+async def verify_inline(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def probe_loop_lag(lags: List[float]) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL_SECONDS)
+        lags.append(time.perf_counter() - started - LOOP_PROBE_INTERVAL_SECONDS)
+
+
+async def probe_requests(client: httpx.AsyncClient, path: str, token: str, latencies: List[float]) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    while True:
+        started = time.perf_counter()
+        (await client.get(path, headers=headers)).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(LOOP_PROBE_INTERVAL_SECONDS)
+
+
+async def login(client: httpx.AsyncClient, email: str) -> float:
+    started = time.perf_counter()
+    (await client.post("/auth/login", json={"email": email, "password": PASSWORD})).raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_burst(client: httpx.AsyncClient, name: str, email: str, probe_path: str, token: str, logins: int) -> None:
+    lags: List[float] = []
+    probe_latencies: List[float] = []
+    tasks = [
+        asyncio.create_task(probe_loop_lag(lags)),
+        asyncio.create_task(probe_requests(client, probe_path, token, probe_latencies)),
+    ]
+    try:
+        await asyncio.sleep(0.2)
+        idle = list(probe_latencies)
+        probe_latencies.clear()
+        lags.clear()
+        started = time.perf_counter()
+        login_latencies = await asyncio.gather(*(login(client, email) for _ in range(logins)))
+        wall = time.perf_counter() - started
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(f"📊 {name}: {logins} logins in {wall:.2f}s")
+    print(f"   login   p50 {percentile(login_latencies, 0.5):8.1f} ms, p99 {percentile(login_latencies, 0.99):8.1f} ms")
+    if probe_latencies:
+        print(
+            f"   probe   p50 {percentile(probe_latencies, 0.5):8.1f} ms, p99 {percentile(probe_latencies, 0.99):8.1f} ms "
+            f"({len(probe_latencies)} requests, idle mean {statistics.mean(idle) if idle else 0:.1f} ms)"
+        )
+    else:
+        print("   probe   no request completed during the burst")
+    print(f"   max event loop lag {max(lags, default=0.0) * 1000:.1f} ms")
+
+
+async def measure(logins: int, rounds: int) -> None:
+    await create_tables()
+    pwd_context.update(bcrypt__rounds=rounds)
+    print(f"bcrypt rounds {rounds}, {settings.PASSWORD_HASH_WORKERS} password workers")
+    async with SessionLocal() as db:
+        user = await create_benchmark_user(db, hashed_password=get_password_hash(PASSWORD))
+        try:
+            workspace = await create_benchmark_workspace(db, user)
+            token = create_access_token({"sub": user.email, "user_id": user.id})
+            probe_path = f"/workspaces/{workspace.id}"
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+                (await client.get(probe_path, headers={"Authorization": f"Bearer {token}"})).raise_for_status()
+
+                executor_verify = auth_service.verify_and_update_password
+                auth_service.verify_and_update_password = verify_inline
+                try:
+                    await run_burst(client, "inline", user.email, probe_path, token, logins)
+                finally:
+                    auth_service.verify_and_update_password = executor_verify
+                await run_burst(client, "executor", user.email, probe_path, token, logins)
+        finally:
+            await drop_benchmark_user(db, user)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent login latency and its effect on other requests")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS, help="bcrypt cost factor for the throwaway user")
+    args = parser.parse_args()
+    asyncio.run(measure(args.logins, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare document parsing throughput: persistent parse pool vs per-call parsing.
+
+Parses the same file N times, one document after another, in two ways:
+- per-call: the whole file partitioned with hi_res in a thread of the calling process, as the
+  ingestion worker did before the parse pool (models load on the first call in that process)
+- pool: iter_parsed_elements through the persistent pool, with page ranges parsed in parallel
+  and the strategy picked per page when PARSE_STRATEGY is auto
+
+Reports the first document's latency (cold model load), the steady-state seconds per document,
+and pages/second over all documents.
+
+    python -m scripts.benchmark_parse_throughput --file sample.pdf
+    python -m scripts.benchmark_parse_throughput --file sample.pdf --docs 5 --skip-per-call
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from pypdf import PdfReader
+from app.services.parse_pool import get_parse_pool, get_parse_pool_size, iter_parsed_elements, run_partition, shutdown_parse_pool
+
+
+async def parse_per_call(file_path: str) -> int:
+    elements = await asyncio.to_thread(run_partition, file_path, "hi_res", True)
+    return len(elements)
+
+
+async def parse_in_pool(file_path: str) -> int:
+    count = 0
+    async for _ in iter_parsed_elements(file_path, {}):
+        count += 1
+    return count
+
+
+async def run_mode(name: str, parse: Callable[[str], Awaitable[int]], file_path: str, docs: int, pages: int) -> None:
+    latencies: List[float] = []
+    elements = 0
+    for _ in range(docs):
+        started = time.perf_counter()
+        elements = await parse(file_path)
+        latencies.append(time.perf_counter() - started)
+    steady = statistics.mean(latencies[1:]) if docs > 1 else latencies[0]
+    print(
+        f"{name:>8}: first {latencies[0]:7.2f}s, then {steady:7.2f}s per document, "
+        f"{pages * docs / sum(latencies):6.2f} pages/s ({elements} elements per document)"
+    )
+
+
+async def measure(file_path: str, docs: int, skip_per_call: bool) -> None:
+    pages = len(PdfReader(file_path).pages) if file_path.lower().endswith(".pdf") else 1
+    print(f"📊 {file_path}: {pages} pages, {docs} documents per mode, pool of {get_parse_pool_size()} processes")
+    if not skip_per_call:
+        await run_mode("per-call", parse_per_call, file_path, docs, pages)
+    started = time.perf_counter()
+    get_parse_pool()
+    try:
+        await run_mode("pool", parse_in_pool, file_path, docs, pages)
+    finally:
+        shutdown_parse_pool()
+    print(f"   pool total including start-up {time.perf_counter() - started:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse pool throughput against per-call parsing")
+    parser.add_argument("--file", required=True, help="Document to parse, ideally a long PDF")
+    parser.add_argument("--docs", type=int, default=3)
+    parser.add_argument("--skip-per-call", action="store_true", help="Only measure the parse pool")
+    args = parser.parse_args()
+    asyncio.run(measure(args.file, args.docs, args.skip_per_call))
+
+
+if __name__ == "__main__":
+    main()
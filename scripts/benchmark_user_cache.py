@@ -0,0 +1,106 @@
+"""
+Measure authenticated-endpoint throughput with and without the user cache.
+
+Concurrent clients poll a document's status (GET /workspaces/{id}/documents/{document_id}, what
+the frontend does while a document ingests) through the ASGI app for a fixed time, once with
+get_cached_user serving the user and once with the cache bypassed so every request loads the
+user from the database. Reports requests/s, p50/p99 latency and statements per request.
+
+    python -m scripts.benchmark_user_cache
+    python -m scripts.benchmark_user_cache --clients 50 --seconds 10
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.main import app
+from app.model import Document
+from app.services import dependencies
+from app.services.security import create_access_token
+from scripts.benchmark_data import create_tables, create_benchmark_user, create_benchmark_workspace, drop_benchmark_user
+
+
+async def no_cached_user(user_id: int):
+    return None
+
+
+async def skip_cache_user(user) -> None:
+    return None
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def poll(client: httpx.AsyncClient, path: str, deadline: float, latencies: List[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        (await client.get(path)).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_mode(client: httpx.AsyncClient, name: str, path: str, clients: int, seconds: float) -> None:
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        nonlocal statements
+        statements += 1
+
+    (await client.get(path)).raise_for_status()  # warm up, and fill the cache when enabled
+    latencies: List[float] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(poll(client, path, started + seconds, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    print(
+        f"{name:>9}: {len(latencies) / elapsed:8.1f} requests/s, p50 {percentile(latencies, 0.5):6.1f} ms, "
+        f"p99 {percentile(latencies, 0.99):6.1f} ms, {statements / len(latencies):.2f} statements per request"
+    )
+
+
+async def measure(clients: int, seconds: float) -> None:
+    await create_tables()
+    async with SessionLocal() as db:
+        user = await create_benchmark_user(db)
+        try:
+            workspace = await create_benchmark_workspace(db, user)
+            document = Document(file_name="notes.pdf", workspace_id=workspace.id, status="PROCESSING")
+            db.add(document)
+            await db.commit()
+
+            token = create_access_token({"sub": user.email, "user_id": user.id})
+            path = f"/workspaces/{workspace.id}/documents/{document.id}"
+            print(f"📊 {clients} clients polling {path} for {seconds:.0f}s per mode")
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers={"Authorization": f"Bearer {token}"}) as client:
+                await run_mode(client, "cached", path, clients, seconds)
+
+                cached_lookup, cache_write = dependencies.get_cached_user, dependencies.cache_user
+                dependencies.get_cached_user, dependencies.cache_user = no_cached_user, skip_cache_user
+                try:
+                    await run_mode(client, "bypassed", path, clients, seconds)
+                finally:
+                    dependencies.get_cached_user, dependencies.cache_user = cached_lookup, cache_write
+        finally:
+            await drop_benchmark_user(db, user)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark authenticated polling throughput with and without the user cache")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(measure(args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
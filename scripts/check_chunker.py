@@ -0,0 +1,124 @@
+"""
+Check StructuredChunker's chunk sizes and overlap.
+
+Chunks a document of synthetic pages plus edge cases (an over-long paragraph, an unbroken
+"word", an oversized table, stacked headings) and checks that:
+- text chunks stay within max_tokens, allowing for the carried overlap and leading headings
+- table chunks stay within max_table_tokens and are split only at row boundaries
+- a section split by size carries at most overlap_tokens of the previous chunk's tail,
+  and nothing is carried across a heading or a table
+- every sentence of the input ends up in some chunk
+Runs at the configured sizes and at small ones that force many splits. Exits non-zero on failure.
+
+    python -m scripts.check_chunker
+    python -m scripts.check_chunker --pages 200 --max-tokens 128 --overlap-tokens 24
+"""
+import argparse
+import asyncio
+import sys
+from typing import List
+
+from scripts.benchmark_ingestion_memory import synthetic_elements
+from app.services.chunker import SENTENCE_BOUNDARY, StructuredChunker, estimate_tokens, get_overlap
+from app.settings import settings
+
+
+def edge_case_elements(page: int) -> List[dict]:
+    metadata = {"page_number": page}
+    return [
+        {"type": "Title", "text": "Appendix", "metadata": metadata},
+        {"type": "Title", "text": "Appendix A: long material", "metadata": metadata},
+        {"type": "NarrativeText", "text": " ".join(f"Sentence {i} of a very long paragraph keeps going." for i in range(400)), "metadata": metadata},
+        {"type": "NarrativeText", "text": "x" * 20000, "metadata": metadata},
+        {"type": "Table", "text": "\n".join(f"row {row}   value {row * 3}   note {'n' * 40}" for row in range(800)), "metadata": metadata},
+        {"type": "NarrativeText", "text": "Text after the table starts fresh.", "metadata": metadata},
+    ]
+
+
+async def collect_elements(pages: int) -> List[dict]:
+    elements = [element async for element in synthetic_elements(pages)]
+    return elements + edge_case_elements(pages + 1)
+
+
+def report(name: str, failures: List[str], detail: str) -> bool:
+    print(f"{'✅' if not failures else '❌'} {name:<40} {detail}")
+    for failure in failures[:5]:
+        print(f"     {failure}")
+    return not failures
+
+
+def check_chunks(elements: List[dict], max_tokens: int, overlap_tokens: int, max_table_tokens: int) -> bool:
+    chunker = StructuredChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens, max_table_tokens=max_table_tokens)
+    # (chunk, type of the element whose add() closed it) in document order
+    closed = []
+    for element in elements:
+        closed.extend((chunk, element.get("type")) for chunk in chunker.add(element))
+    closed.extend((chunk, "finish") for chunk in chunker.finish())
+    chunks = [chunk for chunk, _ in closed]
+
+    overlap_failures = []
+    carried = 0
+    text_closed = [(chunk, closed_by) for chunk, closed_by in closed if chunk["metadata"]["chunk_type"] == "text"]
+    for (previous, closed_by), (chunk, _) in zip(text_closed, text_closed[1:]):
+        tail = get_overlap(previous["text"].split("\n\n")[-1], overlap_tokens)
+        if not tail:
+            continue
+        starts_with_tail = chunk["text"].startswith(tail)
+        if closed_by in ("Title", "Table", "finish"):
+            if starts_with_tail:
+                overlap_failures.append(f"carried across a {closed_by}: {tail[:60]!r}")
+        elif not starts_with_tail:
+            overlap_failures.append(f"split by size without carrying its tail: {tail[:60]!r}")
+        elif estimate_tokens(tail) > overlap_tokens:
+            overlap_failures.append(f"{estimate_tokens(tail)} tokens carried: {tail[:60]!r}")
+        else:
+            carried += 1
+
+    text_chunks = [chunk for chunk in chunks if chunk["metadata"]["chunk_type"] == "text"]
+    table_chunks = [chunk for chunk in chunks if chunk["metadata"]["chunk_type"] == "table"]
+    print(f"📊 max_tokens {max_tokens}, overlap {overlap_tokens}, max_table_tokens {max_table_tokens}: "
+          f"{len(text_chunks)} text and {len(table_chunks)} table chunks")
+
+    passed = True
+    # Headings (short here) and the carried overlap ride on top of the body budget
+    text_limit = max_tokens + overlap_tokens + 16
+    oversized = [f"{chunk['metadata']['token_count']} tokens: {chunk['text'][:60]!r}" for chunk in text_chunks
+                 if estimate_tokens(chunk["text"]) > text_limit]
+    sizes = [chunk["metadata"]["token_count"] for chunk in text_chunks]
+    passed &= report("text chunk size", oversized, f"max {max(sizes)} tokens, limit {text_limit}")
+
+    table_sizes = [estimate_tokens(chunk["text"]) for chunk in table_chunks]
+    broken_rows = [chunk["text"][-60:] for chunk in table_chunks if not chunk["text"].rstrip().endswith(tuple("0123456789n"))]
+    oversized = [f"{size} tokens" for size in table_sizes if size > max_table_tokens]
+    passed &= report("table chunk size", oversized + broken_rows, f"max {max(table_sizes)} tokens, limit {max_table_tokens}")
+
+    if overlap_tokens > 0 and carried == 0:
+        overlap_failures.append("no section split by size carried any overlap")
+    passed &= report("overlap", overlap_failures, f"{carried} chunks start with the previous chunk's tail")
+
+    chunk_text = "\n".join(chunk["text"] for chunk in chunks)
+    missing = [
+        sentence[:60] for element in elements
+        if element.get("type") not in ("Footer", "Table")
+        for sentence in SENTENCE_BOUNDARY.split(element.get("text") or "")
+        if sentence.strip() and len(sentence) <= max_tokens * 4 and sentence.strip() not in chunk_text
+    ]
+    passed &= report("no text lost", missing, f"{len(elements)} elements")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check chunk sizes and overlap of the structured chunker")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--max-tokens", type=int, default=64, help="Small size for the second run, to force splits")
+    parser.add_argument("--overlap-tokens", type=int, default=16)
+    args = parser.parse_args()
+
+    elements = asyncio.run(collect_elements(args.pages))
+    passed = check_chunks(elements, settings.CHUNK_MAX_TOKENS, settings.CHUNK_OVERLAP_TOKENS, settings.CHUNK_MAX_TABLE_TOKENS)
+    passed &= check_chunks(elements, args.max_tokens, args.overlap_tokens, args.max_tokens * 4)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
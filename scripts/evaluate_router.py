@@ -0,0 +1,103 @@
+"""
+Measure routing accuracy and latency on the labelled routing test set.
+Examples marked held_out are paraphrases that the keyword rules do not match; they are
+reported separately, since accuracy on rule-style phrasings says little about new wording.
+
+    python -m scripts.evaluate_router          # local stage only
+    python -m scripts.evaluate_router --llm    # also routing_chain and the two-tier router
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.graph.main_graph.chain.local_route import classify_locally
+
+TEST_SET_PATH = Path(__file__).parent / "data" / "routing_test_set.jsonl"
+
+
+def load_test_set(path: Path = TEST_SET_PATH) -> List[dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(name: str, latencies_ms: List[float], correct: int, total: int) -> None:
+    if not total:
+        print(f"{name}: no examples")
+        return
+    p95 = sorted(latencies_ms)[max(0, int(len(latencies_ms) * 0.95) - 1)]
+    print(
+        f"{name}: accuracy {correct}/{total} ({correct / total:.1%}), "
+        f"latency mean {statistics.mean(latencies_ms):.2f} ms, p95 {p95:.2f} ms"
+    )
+
+
+def split_indices(examples: List[dict]) -> List[Tuple[str, List[int]]]:
+    """Positions of the rule-style and held-out examples, for per-split reporting."""
+    held_out = [i for i, e in enumerate(examples) if e.get("held_out")]
+    rule_style = [i for i, e in enumerate(examples) if not e.get("held_out")]
+    return [("rule-style", rule_style), ("held-out paraphrases", held_out)]
+
+
+def evaluate_local(examples: List[dict]) -> List[Optional[str]]:
+    predictions, latencies = [], []
+    for example in examples:
+        start = time.perf_counter()
+        route = classify_locally(example["question"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(route.node if route else None)
+
+    for split, indices in split_indices(examples):
+        if not indices:
+            continue
+        covered = [(predictions[i], examples[i]["node"]) for i in indices if predictions[i] is not None]
+        print(f"Local stage, {split}: routed {len(covered)}/{len(indices)} ({len(covered) / len(indices):.1%}) without a model call")
+        summarize(f"Local stage, {split} (routed cases)", [latencies[i] for i in indices], sum(p == label for p, label in covered), len(covered))
+    return predictions
+
+
+async def evaluate_llm(examples: List[dict], local_predictions: List[Optional[str]], subject: str) -> None:
+    from app.graph.main_graph.chain.route import routing_chain
+
+    latencies, correct = [], []
+    two_tier_latencies, two_tier_correct = [], []
+    for example, local in zip(examples, local_predictions):
+        start = time.perf_counter()
+        route = await routing_chain.ainvoke({"question": example["question"], "subject": subject})
+        elapsed = (time.perf_counter() - start) * 1000
+        latencies.append(elapsed)
+        correct.append(route.node == example["node"])
+
+        # Two-tier: the model is only consulted when the local stage abstains
+        if local is not None:
+            two_tier_correct.append(local == example["node"])
+            two_tier_latencies.append(0.0)
+        else:
+            two_tier_correct.append(route.node == example["node"])
+            two_tier_latencies.append(elapsed)
+
+    for split, indices in split_indices(examples):
+        if not indices:
+            continue
+        summarize(f"routing_chain, {split}", [latencies[i] for i in indices], sum(correct[i] for i in indices), len(indices))
+        summarize(f"Two-tier router, {split}", [two_tier_latencies[i] for i in indices], sum(two_tier_correct[i] for i in indices), len(indices))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate the main graph router")
+    parser.add_argument("--llm", action="store_true", help="Also evaluate routing_chain (makes model calls)")
+    parser.add_argument("--subject", default="general learning")
+    args = parser.parse_args()
+
+    examples = load_test_set()
+    print(f"📊 {len(examples)} labelled routing examples")
+    local_predictions = evaluate_local(examples)
+    if args.llm:
+        asyncio.run(evaluate_llm(examples, local_predictions, args.subject))
+
+
+if __name__ == "__main__":
+    main()
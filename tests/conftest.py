@@ -0,0 +1,93 @@
+"""
+Shared fixtures. Tests run against a throwaway SQLite database unless TEST_DATABASE_URL is set,
+with dummy API keys, so no external service is called.
+"""
+import os
+import tempfile
+import uuid
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='deep_learner_tests_')}/test.db"
+)
+for name, value in {
+    "REDIS_URL": "redis://localhost:6379/15",
+    "GOOGLE_API_KEY": "test",
+    "TAVILY_API_KEY": "test",
+    "PINECONE_API_KEY": "test",
+    "PINECONE_INDEX_NAME": "test",
+    "ROUTER_DECISION_LOG": "",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+from sqlalchemy import delete, select
+from app.database import Base, SessionLocal, engine
+from app.graph.main_graph.state import AgentState
+from app.main import app
+from app.model import User, Workspace, ChatMessage, Document, QuizAttempt
+from app.services.dependencies import get_main_graph
+from app.services.security import create_access_token
+
+
+async def canned_reply(state: AgentState) -> dict:
+    return {"messages": [AIMessage(content=f"Answer to: {state['messages'][-1].content}")]}
+
+
+def build_stand_in_graph():
+    """The main graph's state schema with a single chat_node that answers without a model."""
+    builder = StateGraph(AgentState)
+    builder.add_node("chat_node", canned_reply)
+    builder.set_entry_point("chat_node")
+    builder.add_edge("chat_node", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def database():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db():
+    async with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def user(db):
+    user = User(email=f"test_{uuid.uuid4().hex[:12]}@example.com", full_name="Test User", hashed_password="!", is_active=True)
+    db.add(user)
+    await db.commit()
+    yield user
+    workspace_ids = list((await db.scalars(select(Workspace.id).where(Workspace.user_id == user.id))).all())
+    for model in (QuizAttempt, ChatMessage, Document):
+        await db.execute(delete(model).where(model.workspace_id.in_(workspace_ids)))
+    await db.execute(delete(Workspace).where(Workspace.user_id == user.id))
+    await db.execute(delete(User).where(User.id == user.id))
+    await db.commit()
+
+
+@pytest.fixture
+async def workspace(db, user):
+    workspace = Workspace(name=f"test_{uuid.uuid4().hex[:12]}", subject="testing", user_id=user.id)
+    db.add(workspace)
+    await db.commit()
+    return workspace
+
+
+@pytest.fixture
+async def client(user):
+    """ASGI client authenticated as user, with the main graph replaced by the stand-in."""
+    app.dependency_overrides[get_main_graph] = build_stand_in_graph
+    token = create_access_token({"sub": user.email, "user_id": user.id})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client
+    app.dependency_overrides.pop(get_main_graph, None)
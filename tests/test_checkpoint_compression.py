@@ -0,0 +1,52 @@
+"""CompressingRedisSaver's checkpoint documents, checked without a Redis server."""
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.redis import AsyncRedisSaver
+from app.graph.main_graph.checkpointer import COMPRESSED_KEY, CompressingRedisSaver
+from app.settings import settings
+
+QUIZ = json.dumps([
+    {
+        "type": "multiple_choice",
+        "question": f"Question {i}: which statement about the reading is correct?",
+        "options": [f"Option {letter} describing one possible answer" for letter in "ABCD"],
+        "correctAnswer": "A",
+        "explanation": "The reading states this directly in the section on the topic.",
+    }
+    for i in range(10)
+])
+
+
+@pytest.fixture
+def checkpoint():
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": [
+            HumanMessage(content="quiz me on chapter 2", id="1"),
+            AIMessage(content=QUIZ, additional_kwargs={"response_type": "quiz"}, id="2"),
+        ],
+        "subject": "biology",
+    }
+    checkpoint["channel_versions"] = {"messages": 1, "subject": 1}
+    return checkpoint
+
+
+def test_large_strings_are_stored_compressed_and_read_back(checkpoint):
+    saver = CompressingRedisSaver(redis_url=settings.REDIS_URL, min_bytes=1024)
+    dumped = saver._dump_checkpoint(checkpoint)
+
+    plain = json.dumps(AsyncRedisSaver(redis_url=settings.REDIS_URL)._dump_checkpoint(checkpoint))
+    assert COMPRESSED_KEY in json.dumps(dumped)
+    assert len(json.dumps(dumped)) < len(plain) / 2
+
+    loaded = saver._recursive_deserialize(dumped["channel_values"])
+    assert loaded == checkpoint["channel_values"]
+
+
+def test_uncompressed_checkpoints_load_unchanged(checkpoint):
+    dumped = AsyncRedisSaver(redis_url=settings.REDIS_URL)._dump_checkpoint(checkpoint)
+    saver = CompressingRedisSaver(redis_url=settings.REDIS_URL)
+    assert saver._recursive_deserialize(dumped["channel_values"]) == checkpoint["channel_values"]
@@ -0,0 +1,70 @@
+"""Database round trips per endpoint: each request loads its workspace exactly once."""
+import json
+from collections import Counter
+
+import pytest
+from sqlalchemy import event
+from app.database import engine
+from app.model import ChatMessage, Document
+
+QUIZ = [{"type": "quiz", "question": "2 + 2?", "options": ["3", "4"], "correctAnswer": "4"}]
+
+# (method, path, body, maximum statements): the workspace lookup plus what the endpoint itself needs
+ENDPOINTS = {
+    "send chat message": ("POST", "/chat/", {"workspace_id": "{workspace_id}", "message": "hello", "mode": "chat"}, 6),
+    "chat history": ("GET", "/chat/history/{workspace_id}", None, 2),
+    "workspace": ("GET", "/workspaces/{workspace_id}", None, 1),
+    "workspace details": ("GET", "/workspaces/{workspace_id}/details", None, 3),
+    "document list": ("GET", "/workspaces/{workspace_id}/documents/", None, 3),
+    "document status": ("GET", "/workspaces/{workspace_id}/documents/{document_id}", None, 2),
+    "grade quiz": ("POST", "/workspaces/{workspace_id}/quizzes/{message_id}/grade", {"answers": ["B"]}, 4),
+}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements: Counter = Counter()
+        self.workspace_queries = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements[statement.split(None, 1)[0].upper()] += 1
+        if statement.lstrip().upper().startswith("SELECT") and "FROM workspaces" in statement:
+            self.workspace_queries += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.statements.values())
+
+
+@pytest.fixture
+def statements():
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+async def ids(db, workspace):
+    document = Document(file_name="notes.pdf", workspace_id=workspace.id, status="COMPLETED")
+    quiz_message = ChatMessage(workspace_id=workspace.id, role="assistant", content=json.dumps(QUIZ))
+    db.add_all([document, quiz_message])
+    await db.commit()
+    return {"workspace_id": workspace.id, "document_id": document.id, "message_id": quiz_message.id}
+
+
+@pytest.mark.parametrize("name", ENDPOINTS)
+async def test_workspace_loaded_once_per_request(name, client, ids, statements):
+    method, path, body, budget = ENDPOINTS[name]
+    if body and body.get("workspace_id") == "{workspace_id}":
+        body = {**body, "workspace_id": ids["workspace_id"]}
+    # Warm the user cache so the count covers the endpoint, not the first authentication
+    (await client.get(f"/workspaces/{ids['workspace_id']}")).raise_for_status()
+    statements.statements.clear()
+    statements.workspace_queries = 0
+
+    response = await client.request(method, path.format(**ids), json=body)
+
+    assert response.is_success, response.text
+    assert statements.workspace_queries == 1, dict(statements.statements)
+    assert statements.total <= budget, dict(statements.statements)
@@ -0,0 +1,43 @@
+"""upgrade_schema brings tables created by older versions up to the current models."""
+from sqlalchemy import create_engine, inspect, text
+from app.database import upgrade_schema
+
+# documents as created before parse_strategy was added
+OLD_DOCUMENTS_TABLE = """
+CREATE TABLE documents (
+    id INTEGER PRIMARY KEY,
+    file_name VARCHAR(255) NOT NULL,
+    workspace_id INTEGER NOT NULL,
+    status VARCHAR(50)
+)
+"""
+
+# chat_messages as created before the (workspace_id, id) index was added
+OLD_CHAT_MESSAGES_TABLE = """
+CREATE TABLE chat_messages (
+    id INTEGER PRIMARY KEY,
+    workspace_id INTEGER NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL
+)
+"""
+
+
+def test_adds_missing_columns_and_indexes_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(OLD_DOCUMENTS_TABLE))
+        conn.execute(text(OLD_CHAT_MESSAGES_TABLE))
+        conn.execute(text("INSERT INTO documents (file_name, workspace_id, status) VALUES ('notes.pdf', 1, 'COMPLETED')"))
+
+    for _ in range(2):
+        with engine.begin() as conn:
+            upgrade_schema(conn)
+
+    with engine.connect() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("documents")}
+        indexes = {index["name"] for index in inspect(conn).get_indexes("chat_messages")}
+        row = conn.execute(text("SELECT file_name, parse_strategy FROM documents")).one()
+    assert "parse_strategy" in columns
+    assert "ix_chat_messages_workspace_id_id" in indexes
+    assert tuple(row) == ("notes.pdf", None)
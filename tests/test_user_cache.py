@@ -0,0 +1,74 @@
+"""The authenticated-user cache: hits, misses, TTL expiry, invalidation and the LRU bound."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.database import engine
+from app.services import user_cache
+from app.services.dependencies import get_current_user
+from app.services.security import create_access_token
+
+
+class UserQueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            self.count += 1
+
+
+@pytest.fixture
+def user_queries():
+    counter = UserQueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def token(user):
+    user_cache.invalidate_user(user.id)
+    yield create_access_token({"sub": user.email, "user_id": user.id})
+    user_cache.invalidate_user(user.id)
+
+
+async def test_first_request_misses_then_hits(db, token, user_queries):
+    await get_current_user(token, db)
+    assert user_queries.count == 1
+
+    for _ in range(5):
+        await get_current_user(token, db)
+    assert user_queries.count == 1
+
+
+async def test_entry_expires_after_ttl(db, token, user_queries, monkeypatch):
+    monkeypatch.setattr(user_cache.local_cache, "ttl_seconds", 0.2)
+    await get_current_user(token, db)
+    await asyncio.sleep(0.3)
+
+    await get_current_user(token, db)
+    assert user_queries.count == 2
+
+
+async def test_deactivation_invalidates(db, user, token):
+    await get_current_user(token, db)
+    assert user_cache.local_cache.get(user.id) is not None
+
+    user.is_active = False
+    await db.commit()
+
+    assert user_cache.local_cache.get(user.id) is None
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(token, db)
+    assert error.value.status_code == 403
+
+
+def test_lru_bound():
+    cache = user_cache.TTLCache(max_size=3, ttl_seconds=60)
+    for key in range(5):
+        cache.set(key, {"id": key})
+    cache.get(2)
+    cache.set(5, {"id": 5})
+    assert [key for key in range(6) if cache.get(key) is not None] == [2, 4, 5]